@@ -6,8 +6,12 @@ Orquestador del pipeline de Datos-al-Ecosistema.
 
 Funcionalidades:
 - Detecta si es la primera ejecución (no existe o está vacía la carpeta `data/`).
-- Si NO es la primera ejecución, crea un backup de `data/` en `history/AAAAMMDD_HHMMSS/`.
-- Descubre los scripts en la carpeta `scripts/` y los ejecuta en orden alfabético.
+- Si NO es la primera ejecución, crea un snapshot de `data/` en `history/AAAAMMDD_HHMMSS/`
+  (deduplicado: los archivos sin cambios son hardlinks a `history/objects/`).
+- Descubre los scripts en la carpeta `scripts/` y construye un grafo de dependencias
+  a partir de los bloques `Entrada:` / `Salida:` del docstring de cada script.
+- Ejecuta en paralelo (hasta `--workers` a la vez) los scripts independientes entre sí;
+  un script solo espera a los que producen los archivos que lee.
 - Pensado para ejecutarse bajo demanda o programado (cron, Task Scheduler).
 
 Fases del pipeline (por prefijo):
@@ -17,7 +21,7 @@ Fases del pipeline (por prefijo):
     03_  Gold - Integración y enriquecimiento de datos
     04_  Model - Generación de datasets para ML y dashboard
 
-Scripts ejecutados (en orden alfabético):
+Scripts del pipeline (en orden alfabético):
     00_setup.py                              # Configuración inicial
     01_extract_bronze.py                     # Extracción de datos bronze
     01_generate_polygon_santander.py         # Polígonos geográficos
@@ -25,10 +29,10 @@ Scripts ejecutados (en orden alfabético):
     02_datos_poblacion_santander.py          # Población DANE
     02_extract_metas.py                      # Metas del Plan de Desarrollo
     02_process_danegeo.py                    # Geografía DANE (Divipola)
-    02_process_policia_completo.py           # Policía consolidado
-    02_process_policia.py                    # Policía básico
+    02_process_policia.py                    # Policía (nacional particionado + Santander)
     02_process_socrata.py                    # Datos abiertos Socrata
     02_socrata_bucaramanga_to_parquet.py     # Socrata Bucaramanga
+    03_generate_dim_fecha.py                 # Dimensión calendario
     03_generate_gold.py                      # Capa Gold base
     03_process_silver_data.py                # Preparación Silver→Gold
     04_generate_analytics.py                 # Métricas analíticas
@@ -43,25 +47,181 @@ Uso básico:
 Opciones:
     python run_pipeline.py --dry-run        # Muestra qué haría, sin ejecutar scripts ni copiar datos
     python run_pipeline.py --no-backup      # Ejecuta el pipeline sin crear backup de data/
+    python run_pipeline.py --keep-snapshots 10  # Conserva solo los 10 snapshots más recientes
     python run_pipeline.py --scripts-dir scripts_alt  # Usar otra carpeta de scripts
+    python run_pipeline.py --workers 1      # Ejecución secuencial (un script a la vez)
+    python run_pipeline.py --incremental    # Omite scripts sin cambios en código ni entradas
+    python run_pipeline.py --incremental --force 02_process_policia  # Fuerza un script
+    python run_pipeline.py --in-process     # Workers persistentes en lugar de un subproceso por script
+    python run_pipeline.py --resume         # Continúa la corrida anterior tras un fallo
+    python run_pipeline.py --target gold/model/regression_monthly_dataset.parquet  # Solo lo necesario
+    python run_pipeline.py --layer silver   # Scripts 02_ y sus dependencias
+    python run_pipeline.py --report         # Perfil de la última corrida vs. las 5 anteriores
+
+Salida de los scripts:
+    La salida de cada script se escribe, sin buffer, en
+    `logs/stages/AAAAMMDD_HHMMSS/<script>.log` y se muestra en consola línea a línea
+    con el prefijo `[script]`. Si un script pasa un rato sin escribir nada se informa
+    que sigue en ejecución; si falla, se muestran sus últimas líneas.
+
+Grafo de dependencias:
+    Un script B depende de un script A si B lee algo que A escribe. Si dos scripts
+    escriben en las mismas rutas, se ejecutan en orden alfabético. Las rutas se comparan
+    como patrones glob (`data/bronze/socrata_api/*.json`) y las que terminan en `/`
+    cubren todo lo que cuelga de esa carpeta. Un script sin bloques `Entrada:`/`Salida:`
+    se trata como barrera: espera a todos los anteriores y todos los posteriores lo esperan.
+
+Snapshots de history/:
+    Cada archivo de `data/` se guarda una sola vez en `history/objects/<hash[:2]>/<hash>`
+    (con reflink si el sistema de archivos lo soporta) y cada snapshot es un árbol de
+    hardlinks a esos objetos. Con --keep-snapshots se borran los snapshots antiguos y,
+    en cada ejecución, se eliminan los objetos que ya no usa ningún snapshot.
+
+Workers persistentes (--in-process):
+    Se arrancan `--workers` procesos que importan una sola vez las librerías pesadas
+    (pandas, geopandas, shapely, pyproj, sklearn, holidays...). Cada script se carga
+    como un módulo nuevo dentro de un worker y se llama a la función de su bloque
+    `if __name__ == "__main__":` (`main()`, `make_gold()`, ...). Las excepciones y los
+    `sys.exit()` del script se convierten en un código de retorno; si un worker muere,
+    el pool se recrea para los scripts siguientes.
+
+Reanudar tras un fallo (--resume):
+    Cada corrida anota en `.pipeline/run_journal.json` los scripts que terminan bien,
+    junto con el hash de su código y de sus entradas. Con --resume se omiten los que
+    ya terminaron y siguen vigentes, de modo que se retoma desde el primero que falló
+    o quedó desactualizado (incluidos los que dependen de un script que se vuelve a
+    ejecutar y cambia sus salidas). No se crea un snapshot nuevo de `data/`.
+    Los hashes de archivos se guardan en el mismo índice que usan la caché de
+    compilación y los snapshots (`files` de `.pipeline/build_cache.json`), así que
+    cada archivo se lee una sola vez mientras no cambie.
+
+Reporte de ejecución:
+    Cada corrida guarda `logs/runs/run_AAAAMMDD_HHMMSS.json` con, por script: estado,
+    tiempo real (wall), tiempo de CPU, pico de memoria (RSS), tamaño de sus
+    entradas declaradas (`input_bytes`, no la E/S real del proceso), bytes
+    escritos en sus salidas declaradas y filas de cada parquet leído/escrito
+    (desde los metadatos del parquet). `--report` compara la última corrida
+    con la mediana de las N anteriores (`--report-runs N`).
+
+Modo incremental (--incremental):
+    Guarda en `.pipeline/build_cache.json` el hash del código de cada script (más los
+    módulos auxiliares `scripts/_*.py`) y de sus archivos de entrada. Un script se omite
+    si ambos hashes coinciden con la última ejecución exitosa y sus salidas existen.
+    Los scripts sin entradas en disco (extracción desde APIs o scraping) siempre se
+    ejecutan; si sus salidas no cambian, todo lo que depende de ellos se omite.
 """
 
 from __future__ import annotations
 
 import argparse
+import ast
+import contextlib
 import datetime as dt
+import hashlib
+import importlib
+import importlib.util
+import json
 import logging
+import multiprocessing
+import os
+import re
+import runpy
 import shutil
+import stat
 import subprocess
 import sys
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from fnmatch import fnmatchcase
 from pathlib import Path
-from typing import List
+from typing import Callable, List
+
+try:  # Solo disponible en sistemas tipo Unix (reflinks vía ioctl FICLONE)
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+try:  # Solo disponible en sistemas tipo Unix (tiempo de CPU y memoria de los scripts)
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
 
 # --- Configuración básica de rutas ---
 
 PROJECT_ROOT = Path(__file__).resolve().parent
 DATA_DIR = PROJECT_ROOT / "data"
 HISTORY_DIR = PROJECT_ROOT / "history"
+HISTORY_OBJECTS_DIR = HISTORY_DIR / "objects"
+
+# Nombre de las carpetas de snapshot: history/AAAAMMDD_HHMMSS/
+SNAPSHOT_NAME_RE = re.compile(r"\d{8}_\d{6}")
+# ioctl de Linux para clonar un archivo con copy-on-write (reflink)
+FICLONE = 0x40049409
+
+# Estado interno del orquestador (caché de ejecuciones, etc.)
+PIPELINE_STATE_DIR = PROJECT_ROOT / ".pipeline"
+BUILD_CACHE_FILE = PIPELINE_STATE_DIR / "build_cache.json"
+RUN_JOURNAL_FILE = PIPELINE_STATE_DIR / "run_journal.json"
+
+# Reportes de ejecución (uno por corrida del pipeline)
+LOGS_DIR = PROJECT_ROOT / "logs"
+RUN_REPORTS_DIR = LOGS_DIR / "runs"
+# Salida de cada script: logs/stages/<run_id>/<script>.log
+STAGE_LOGS_DIR = LOGS_DIR / "stages"
+
+# Cada cuántos segundos se revisa el log de un script en curso
+STAGE_LOG_POLL_SECONDS = 0.5
+# Segundos sin salida nueva tras los que se informa que un script sigue vivo
+HEARTBEAT_SECONDS = 60
+# Últimas líneas de salida que se muestran cuando un script falla
+STAGE_LOG_TAIL_LINES = 40
+
+# Corridas anteriores con las que se compara el reporte (--report)
+DEFAULT_REPORT_RUNS = 5
+# Aumento relativo (tiempo o memoria) a partir del cual se marca una regresión
+REGRESSION_THRESHOLD = 0.25
+
+# Número de scripts que pueden ejecutarse a la vez por defecto
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+# Librerías que los workers persistentes (--in-process) importan al arrancar
+WARM_IMPORTS = [
+    "numpy",
+    "pandas",
+    "pyarrow",
+    "geopandas",
+    "shapely",
+    "pyproj",
+    "sklearn",
+    "holidays",
+    "requests",
+    "bs4",
+    "unidecode",
+]
+
+# Capas del pipeline (--layer) y el prefijo de sus scripts
+LAYER_PREFIXES = {
+    "setup": "00_",
+    "bronze": "01_",
+    "silver": "02_",
+    "gold": "03_",
+    "model": "04_",
+}
+
+# Encabezados de sección en el docstring de cada script: "Entrada:", "Salida (Silver):", ...
+IO_SECTION_RE = re.compile(r"^(Entrada|Salida)\b[^:]*:(.*)$")
+# Rutas declaradas dentro de esas secciones (siempre relativas a la raíz del proyecto)
+DATA_PATH_RE = re.compile(r"data/[^\s,()]+")
 
 
 # --- Utilidades generales ---
@@ -81,9 +241,58 @@ def is_first_run() -> bool:
     return False
 
 
+def clone_file(src: Path, dst: Path) -> None:
+    """
+    Copia `src` en `dst`. Si el sistema de archivos soporta reflinks (btrfs, XFS,
+    APFS vía copy-on-write) la copia es instantánea y no ocupa espacio extra;
+    si no, se hace una copia normal.
+    """
+    if fcntl is not None:
+        try:
+            with src.open("rb") as fsrc, dst.open("wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+def store_object(path: Path, sha: str) -> tuple[Path, bool]:
+    """
+    Guarda el contenido de `path` en el almacén `history/objects/` bajo su hash.
+    Devuelve (ruta_del_objeto, es_nuevo). Los objetos quedan de solo lectura
+    para que nadie los modifique a través de un snapshot.
+    """
+    obj = HISTORY_OBJECTS_DIR / sha[:2] / sha
+    if obj.exists():
+        return obj, False
+
+    obj.parent.mkdir(parents=True, exist_ok=True)
+    tmp = obj.with_name(f"{sha}.tmp")
+    clone_file(path, tmp)
+    tmp.chmod(stat.S_IREAD | stat.S_IRGRP | stat.S_IROTH)
+    tmp.replace(obj)
+    return obj, True
+
+
+def link_object(obj: Path, dst: Path) -> None:
+    """Crea `dst` como hardlink al objeto (o copia, si el hardlink no es posible)."""
+    try:
+        os.link(obj, dst)
+    except OSError:
+        clone_file(obj, dst)
+
+
 def create_history_snapshot(dry_run: bool = False) -> Path | None:
     """
-    Crea una copia de la carpeta `data/` dentro de `history/AAAAMMDD_HHMMSS/`.
+    Crea un snapshot de la carpeta `data/` dentro de `history/AAAAMMDD_HHMMSS/`.
+
+    El snapshot replica la estructura de `data/`, pero cada archivo es un hardlink
+    a `history/objects/<hash>`: un contenido que ya estaba en un snapshot anterior
+    no se vuelve a copiar ni ocupa espacio. Los hashes se reutilizan desde la caché
+    de compilación mientras el tamaño y el mtime del archivo no cambien, así que el
+    tiempo y el disco crecen con lo que cambió, no con el tamaño de `data/`.
 
     - Si `data/` no existe o está vacía, no hace nada y devuelve None.
     - Si `dry_run` es True, solo loguea la acción sin ejecutarla.
@@ -102,22 +311,97 @@ def create_history_snapshot(dry_run: bool = False) -> Path | None:
     timestamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
     backup_dir = HISTORY_DIR / timestamp
 
-    logging.info("Creando backup de 'data/' en '%s' ...", backup_dir)
+    logging.info("Creando snapshot de 'data/' en '%s' ...", backup_dir)
 
     if dry_run:
-        logging.info("[DRY-RUN] Se copiaría '%s' → '%s'", DATA_DIR, backup_dir)
+        logging.info("[DRY-RUN] Se crearía el snapshot '%s' → '%s'", DATA_DIR, backup_dir)
         return backup_dir
 
     backup_dir.mkdir(parents=True, exist_ok=False)
 
-    # Copiamos el contenido de data/ dentro de history/timestamp/
-    # Esto replica la ESTRUCTURA de data/ directamente dentro de la carpeta con fecha.
-    shutil.copytree(DATA_DIR, backup_dir, dirs_exist_ok=True)
+    cache = load_build_cache()
+    n_files = 0
+    n_new = 0
+    new_bytes = 0
+
+    for path in sorted(DATA_DIR.rglob("*")):
+        dst = backup_dir / path.relative_to(DATA_DIR)
+        if path.is_dir():
+            dst.mkdir(parents=True, exist_ok=True)
+            continue
+
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        sha = hash_file(path, cache["files"])
+        obj, is_new = store_object(path, sha)
+        link_object(obj, dst)
 
-    logging.info("Backup creado correctamente en '%s'.", backup_dir)
+        n_files += 1
+        if is_new:
+            n_new += 1
+            new_bytes += obj.stat().st_size
+
+    save_build_cache(cache)
+
+    logging.info(
+        "Snapshot creado en '%s': %d archivos, %d nuevos (%.1f MB añadidos al almacén).",
+        backup_dir,
+        n_files,
+        n_new,
+        new_bytes / 1024 / 1024,
+    )
     return backup_dir
 
 
+def _remove_readonly(func, path, _exc_info) -> None:
+    """Permite a shutil.rmtree borrar archivos de solo lectura (Windows)."""
+    os.chmod(path, stat.S_IWRITE)
+    func(path)
+
+
+def prune_history(keep: int | None, dry_run: bool = False) -> None:
+    """
+    Política de retención de `history/`:
+
+    1. Si `keep` no es None, elimina los snapshots más antiguos y conserva solo
+       los `keep` más recientes.
+    2. Elimina del almacén los objetos que ya no están enlazados desde ningún
+       snapshot (contador de hardlinks igual a 1).
+    """
+    if not HISTORY_DIR.exists():
+        return
+
+    snapshots = sorted(
+        d for d in HISTORY_DIR.iterdir()
+        if d.is_dir() and SNAPSHOT_NAME_RE.fullmatch(d.name)
+    )
+
+    to_delete = [] if keep is None else snapshots[: max(len(snapshots) - keep, 0)]
+    for old in to_delete:
+        if dry_run:
+            logging.info("[DRY-RUN] Se eliminaría el snapshot antiguo: %s", old.name)
+            continue
+        logging.info("Eliminando snapshot antiguo: %s", old.name)
+        shutil.rmtree(old, onerror=_remove_readonly)
+
+    if dry_run or not HISTORY_OBJECTS_DIR.exists():
+        return
+
+    freed = 0
+    n_removed = 0
+    for obj in HISTORY_OBJECTS_DIR.glob("*/*"):
+        if obj.is_file() and obj.stat().st_nlink <= 1:
+            freed += obj.stat().st_size
+            _remove_readonly(os.unlink, obj, None)
+            n_removed += 1
+
+    if n_removed:
+        logging.info(
+            "Almacén de history: %d objetos sin referencias eliminados (%.1f MB liberados).",
+            n_removed,
+            freed / 1024 / 1024,
+        )
+
+
 def discover_scripts(scripts_dir: Path) -> List[Path]:
     """
     Descubre los scripts de pipeline en la carpeta indicada.
@@ -141,60 +425,1027 @@ def discover_scripts(scripts_dir: Path) -> List[Path]:
     if not scripts:
         logging.warning("No se encontraron scripts .py en '%s'.", scripts_dir)
     else:
-        logging.info("Scripts de pipeline encontrados (en orden de ejecución):")
+        logging.info("Scripts de pipeline encontrados (en orden alfabético):")
         for s in scripts:
             logging.info("  - %s", s.relative_to(PROJECT_ROOT))
 
     return scripts
 
 
-def run_script(script_path: Path, dry_run: bool = False) -> None:
+def run_script(
+    script_path: Path,
+    dry_run: bool = False,
+    in_process: bool = False,
+    log_dir: Path = STAGE_LOGS_DIR,
+) -> dict:
     """
     Ejecuta un script Python como subproceso: `python script_path`.
+    Con `in_process=True` lo ejecuta en uno de los workers persistentes
+    (ver `run_in_worker`).
+
+    La salida del script (stdout y stderr) se escribe directamente en
+    `log_dir/<script>.log` y se muestra en consola línea a línea mientras se
+    ejecuta (ver `follow_stage_log`); el orquestador no la acumula en memoria.
 
     Si `dry_run` es True, no ejecuta nada, solo informa.
     Lanza excepciones si hay errores en la ejecución.
+    Devuelve el consumo de recursos del script (`cpu_s`, `peak_rss_mb`) cuando
+    el sistema operativo permite medirlo.
     """
     rel = script_path.relative_to(PROJECT_ROOT)
 
     if dry_run:
-        logging.info("[DRY-RUN] Se ejecutaría: %s %s", sys.executable, rel)
-        return
+        if in_process:
+            logging.info("[DRY-RUN] Se ejecutaría en un worker: %s", rel)
+        else:
+            logging.info("[DRY-RUN] Se ejecutaría: %s %s", sys.executable, rel)
+        return {}
 
-    logging.info("Ejecutando script: %s", rel)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    log_path = log_dir / f"{script_path.stem}.log"
+    log_path.write_bytes(b"")
 
-    result = subprocess.run(
-        [sys.executable, str(script_path)],
-        check=False,
-        capture_output=True,
-        text=True,
-    )
+    logging.info("Ejecutando script: %s (salida en %s)", rel, log_path.relative_to(PROJECT_ROOT))
 
-    if result.returncode != 0:
-        logging.error("Error al ejecutar %s (returncode=%s)", rel, result.returncode)
-        if result.stdout:
-            logging.error("STDOUT:\n%s", result.stdout)
-        if result.stderr:
-            logging.error("STDERR:\n%s", result.stderr)
-        # Detenemos el pipeline en el primer error
-        raise RuntimeError(f"Fallo en el script {rel} (returncode={result.returncode})")
+    if in_process:
+        returncode, usage, tail = run_in_worker(script_path, log_path)
+    else:
+        returncode, usage, tail = run_subprocess([sys.executable, str(script_path)], log_path)
 
-    if result.stdout:
-        logging.debug("STDOUT (%s):\n%s", rel, result.stdout)
-    if result.stderr:
-        logging.debug("STDERR (%s):\n%s", rel, result.stderr)
+    if returncode != 0:
+        logging.error("Error al ejecutar %s (returncode=%s)", rel, returncode)
+        if tail:
+            logging.error(
+                "Últimas líneas de %s:\n%s",
+                log_path.relative_to(PROJECT_ROOT),
+                "\n".join(tail),
+            )
+        # Detenemos el pipeline en el primer error
+        raise RuntimeError(f"Fallo en el script {rel} (returncode={returncode})")
 
     logging.info("Script finalizado correctamente: %s", rel)
+    return usage
+
+
+def follow_stage_log(
+    log_path: Path,
+    is_running: Callable[[], bool],
+) -> deque[str]:
+    """
+    Sigue el log de un script mientras se ejecuta (como `tail -f`): reenvía cada
+    línea nueva al logging del pipeline con el prefijo `[script]` y, si el
+    script pasa HEARTBEAT_SECONDS sin escribir nada, informa que sigue en curso.
+
+    Devuelve las últimas STAGE_LOG_TAIL_LINES líneas, para mostrarlas si falla.
+    """
+    name = log_path.stem
+    tail: deque[str] = deque(maxlen=STAGE_LOG_TAIL_LINES)
+    start = last_activity = time.monotonic()
+    n_lines = 0
+    partial = ""
+
+    def emit(line: str) -> None:
+        nonlocal n_lines
+        line = line.rstrip("\r")
+        logging.info("[%s] %s", name, line)
+        tail.append(line)
+        n_lines += 1
+
+    with open(log_path, encoding="utf-8", errors="replace", newline="") as fh:
+        while True:
+            # Se consulta antes de leer: si ya terminó, esta lectura es la última
+            running = is_running()
+            chunk = fh.read(1 << 20)
+            if chunk:
+                last_activity = time.monotonic()
+                *lines, partial = (partial + chunk).split("\n")
+                for line in lines:
+                    emit(line)
+                continue
+
+            if not running:
+                break
+
+            now = time.monotonic()
+            if now - last_activity >= HEARTBEAT_SECONDS:
+                logging.info(
+                    "[%s] ... sigue en ejecución (%.0f s, %d líneas de salida; última: %s)",
+                    name,
+                    now - start,
+                    n_lines,
+                    tail[-1][:80] if tail else "-",
+                )
+                last_activity = now
+            time.sleep(STAGE_LOG_POLL_SECONDS)
+
+    if partial:
+        emit(partial)
+    return tail
+
+
+def maxrss_to_mb(maxrss: int) -> float:
+    """Convierte `ru_maxrss` a MB (Linux lo da en KB, macOS en bytes)."""
+    if sys.platform == "darwin":
+        return maxrss / 1024 / 1024
+    return maxrss / 1024
+
+
+def run_subprocess(cmd: List[str], log_path: Path) -> tuple[int, dict, deque[str]]:
+    """
+    Ejecuta `cmd` con stdout y stderr redirigidos a `log_path` y devuelve
+    (returncode, consumo, últimas líneas de salida).
+
+    El hijo corre sin buffer (`PYTHONUNBUFFERED`) para que cada `print()` llegue
+    al log en el momento. En sistemas Unix el proceso se recoge con `os.wait4`,
+    que entrega el tiempo de CPU y el pico de memoria (RSS) de ese proceso en
+    particular, aunque haya otros scripts corriendo en paralelo.
+    """
+    env = {**os.environ, "PYTHONUNBUFFERED": "1", "PYTHONIOENCODING": "utf-8"}
+    with open(log_path, "ab") as log_file:
+        proc = subprocess.Popen(cmd, stdout=log_file, stderr=subprocess.STDOUT, env=env)
+
+    usage: dict = {}
+
+    def reap() -> None:
+        if hasattr(os, "wait4"):
+            _, status, rusage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            usage.update(
+                cpu_s=rusage.ru_utime + rusage.ru_stime,
+                peak_rss_mb=maxrss_to_mb(rusage.ru_maxrss),
+            )
+        else:
+            proc.wait()
+
+    waiter = threading.Thread(target=reap)
+    waiter.start()
+    tail = follow_stage_log(log_path, waiter.is_alive)
+    waiter.join()
+
+    return proc.returncode, usage, tail
+
+
+def reset_peak_rss() -> None:
+    """Reinicia el pico de memoria (VmHWM) del proceso actual, si Linux lo permite."""
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass
+
+
+def read_peak_rss_mb() -> float | None:
+    """Pico de memoria del proceso actual en MB (VmHWM en Linux, ru_maxrss si no)."""
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is not None:
+        return maxrss_to_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    return None
+
+
+# --- Workers persistentes (modo --in-process) ---
+
+_WORKER_POOL: ProcessPoolExecutor | None = None
+_WORKER_POOL_SIZE = 1
+_WORKER_POOL_LOCK = threading.Lock()
+
+
+def warm_up_worker() -> None:
+    """
+    Inicializador de cada worker: importa una sola vez las librerías pesadas
+    que usan los scripts, para que cada script ya las encuentre en memoria.
+    """
+    for module_name in WARM_IMPORTS:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            pass
 
 
-def run_pipeline(scripts_dir: Path, *, do_backup: bool, dry_run: bool) -> None:
+def find_entry_point(script_path: Path) -> str | None:
+    """
+    Devuelve el nombre de la función que el script llama en su bloque
+    `if __name__ == "__main__":` (p.ej. `main`, `make_gold`), o None si no
+    hay una llamada simple sin argumentos.
+    """
+    tree = ast.parse(script_path.read_text(encoding="utf-8"))
+    for node in tree.body:
+        if not (
+            isinstance(node, ast.If)
+            and isinstance(node.test, ast.Compare)
+            and isinstance(node.test.left, ast.Name)
+            and node.test.left.id == "__name__"
+        ):
+            continue
+        for stmt in node.body:
+            if (
+                isinstance(stmt, ast.Expr)
+                and isinstance(stmt.value, ast.Call)
+                and isinstance(stmt.value.func, ast.Name)
+                and not stmt.value.args
+            ):
+                return stmt.value.func.id
+    return None
+
+
+def run_stage_entry_point(script: str, log: str) -> tuple[int, dict]:
+    """
+    Se ejecuta DENTRO de un worker. Carga el script como un módulo nuevo (sin
+    reutilizar el estado de ejecuciones anteriores) y llama a su función de
+    entrada, escribiendo stdout/stderr línea a línea en `log` y midiendo CPU y
+    pico de memoria.
+
+    Cualquier excepción o `sys.exit()` del script se convierte en un código de
+    retorno, igual que si se hubiera ejecutado como subproceso, de modo que un
+    script que falla no tumba al worker.
+    """
+    script_path = Path(script)
+    module_name = f"pipeline_stage_{script_path.stem}"
+    output = open(log, "a", encoding="utf-8", buffering=1)
+    returncode = 0
+
+    saved_argv, saved_path = sys.argv, list(sys.path)
+    sys.argv = [script]
+
+    reset_peak_rss()
+    cpu_start = time.process_time()
+    sys.path.insert(0, str(script_path.parent))
+
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            entry_point = find_entry_point(script_path)
+            if entry_point is None:
+                runpy.run_path(script, run_name="__main__")
+            else:
+                spec = importlib.util.spec_from_file_location(module_name, script_path)
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module
+                spec.loader.exec_module(module)
+                getattr(module, entry_point)()
+    except SystemExit as exc:
+        if isinstance(exc.code, int):
+            returncode = exc.code
+        elif exc.code is not None:
+            output.write(f"{exc.code}\n")
+            returncode = 1
+    except BaseException:  # noqa: BLE001
+        output.write(traceback.format_exc())
+        returncode = 1
+    finally:
+        output.close()
+        sys.modules.pop(module_name, None)
+        sys.argv, sys.path[:] = saved_argv, saved_path
+
+    usage = {"cpu_s": time.process_time() - cpu_start, "peak_rss_mb": read_peak_rss_mb()}
+    return returncode, usage
+
+
+def configure_worker_pool(size: int) -> None:
+    """Fija el número de workers persistentes que se crearán al primer uso."""
+    global _WORKER_POOL_SIZE
+    _WORKER_POOL_SIZE = max(1, size)
+
+
+def get_worker_pool() -> ProcessPoolExecutor:
+    """Devuelve el pool de workers persistentes, creándolo si hace falta."""
+    global _WORKER_POOL
+    with _WORKER_POOL_LOCK:
+        if _WORKER_POOL is None:
+            logging.info("Iniciando %d worker(s) persistentes...", _WORKER_POOL_SIZE)
+            _WORKER_POOL = ProcessPoolExecutor(
+                max_workers=_WORKER_POOL_SIZE,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=warm_up_worker,
+            )
+        return _WORKER_POOL
+
+
+def shutdown_worker_pool() -> None:
+    """Detiene los workers persistentes (si se llegaron a crear)."""
+    global _WORKER_POOL
+    with _WORKER_POOL_LOCK:
+        if _WORKER_POOL is not None:
+            _WORKER_POOL.shutdown(wait=True)
+            _WORKER_POOL = None
+
+
+def run_in_worker(script_path: Path, log_path: Path) -> tuple[int, dict, deque[str]]:
+    """
+    Ejecuta un script en un worker persistente y devuelve
+    (returncode, consumo, últimas líneas de salida). El worker escribe la
+    salida en `log_path` y aquí se sigue en vivo, igual que con un subproceso.
+
+    Si el proceso worker muere (p.ej. por falta de memoria), el pool se
+    descarta y se recrea para los scripts siguientes.
+    """
+    global _WORKER_POOL
+    pool = get_worker_pool()
+    future = pool.submit(run_stage_entry_point, str(script_path), str(log_path))
+    tail = follow_stage_log(log_path, lambda: not future.done())
+    try:
+        returncode, usage = future.result()
+    except BrokenProcessPool as exc:
+        with _WORKER_POOL_LOCK:
+            if _WORKER_POOL is pool:
+                _WORKER_POOL = None
+        pool.shutdown(wait=False)
+        message = f"El worker terminó de forma inesperada: {exc}"
+        with open(log_path, "a", encoding="utf-8") as fh:
+            fh.write(message + "\n")
+        tail.append(message)
+        return 1, {}, tail
+    return returncode, usage, tail
+
+
+# --- Grafo de dependencias entre scripts ---
+
+def parse_stage_io(script_path: Path) -> tuple[list[str], list[str]] | None:
+    """
+    Lee los bloques `Entrada:` y `Salida:` del docstring de un script.
+
+    Devuelve (entradas, salidas) como patrones relativos a la raíz del proyecto,
+    p.ej. 'data/bronze/socrata_api/*.json'. Los marcadores tipo `<nombre>` se
+    interpretan como comodín `*`.
+    Devuelve None si el script no declara ninguno de los dos bloques.
+    """
+    source = script_path.read_text(encoding="utf-8")
+    docstring = ast.get_docstring(ast.parse(source)) or ""
+
+    sections: dict[str, list[str]] = {"Entrada": [], "Salida": []}
+    current: str | None = None
+    found = False
+
+    for line in docstring.splitlines():
+        header = IO_SECTION_RE.match(line)
+        if header:
+            current = header.group(1)
+            found = True
+            text = header.group(2)
+        elif line and not line[0].isspace():
+            # Cualquier otra línea sin indentar abre una sección distinta
+            current = None
+            continue
+        else:
+            text = line
+
+        if current is None:
+            continue
+
+        text = re.sub(r"<[^>]*>", "*", text)
+        sections[current].extend(DATA_PATH_RE.findall(text))
+
+    if not found:
+        return None
+    return sections["Entrada"], sections["Salida"]
+
+
+def patterns_overlap(a: str, b: str) -> bool:
+    """
+    Indica si dos patrones de ruta pueden referirse al mismo archivo.
+    Un patrón que termina en '/' representa una carpeta completa.
+    """
+    if a.endswith("/") or b.endswith("/"):
+        return a.startswith(b) or b.startswith(a)
+    return a == b or fnmatchcase(a, b) or fnmatchcase(b, a)
+
+
+def any_overlap(left: List[str], right: List[str]) -> bool:
+    """Indica si algún patrón de `left` se solapa con alguno de `right`."""
+    return any(patterns_overlap(a, b) for a in left for b in right)
+
+
+def build_dependency_graph(scripts: List[Path]) -> dict[Path, set[Path]]:
+    """
+    Construye el grafo de dependencias entre scripts.
+
+    Devuelve, para cada script, el conjunto de scripts que deben terminar antes
+    de que pueda ejecutarse:
+    - B depende de A si B lee algo que A escribe (sin importar el orden alfabético).
+    - Si A y B escriben en las mismas rutas, se respeta el orden alfabético.
+    - Un script sin Entrada/Salida declaradas es una barrera en el orden alfabético.
+
+    Lanza RuntimeError si las declaraciones forman un ciclo.
+    """
+    stage_io = {script: parse_stage_io(script) for script in scripts}
+    deps: dict[Path, set[Path]] = {script: set() for script in scripts}
+
+    for i, first in enumerate(scripts):
+        for second in scripts[i + 1 :]:
+            first_io = stage_io[first]
+            second_io = stage_io[second]
+
+            if first_io is None or second_io is None:
+                deps[second].add(first)
+                continue
+
+            first_in, first_out = first_io
+            second_in, second_out = second_io
+
+            if any_overlap(first_out, second_in):
+                deps[second].add(first)
+            if any_overlap(second_out, first_in):
+                deps[first].add(second)
+            if any_overlap(first_out, second_out) and first not in deps[second]:
+                if second not in deps[first]:
+                    deps[second].add(first)
+
+    for script, io in stage_io.items():
+        if io is None:
+            logging.warning(
+                "%s no declara Entrada/Salida: se ejecutará como barrera.",
+                script.name,
+            )
+
+    topological_order(scripts, deps)  # valida que no haya ciclos
+    return deps
+
+
+def topological_order(scripts: List[Path], deps: dict[Path, set[Path]]) -> List[Path]:
+    """
+    Ordena los scripts de modo que cada uno aparezca después de sus dependencias.
+    Entre scripts independientes se conserva el orden alfabético.
+    """
+    ordered: List[Path] = []
+    placed: set[Path] = set()
+    remaining = list(scripts)
+
+    while remaining:
+        ready = next((s for s in remaining if deps[s] <= placed), None)
+        if ready is None:
+            raise RuntimeError(
+                "Las declaraciones Entrada/Salida forman un ciclo entre: "
+                + ", ".join(s.name for s in remaining)
+            )
+        remaining.remove(ready)
+        ordered.append(ready)
+        placed.add(ready)
+
+    return ordered
+
+
+def compute_waves(scripts: List[Path], deps: dict[Path, set[Path]]) -> list[list[Path]]:
+    """
+    Agrupa los scripts en "olas": cada ola solo depende de olas anteriores,
+    así que sus scripts pueden ejecutarse en paralelo.
+    """
+    level: dict[Path, int] = {}
+    for script in topological_order(scripts, deps):
+        level[script] = 1 + max((level[d] for d in deps[script]), default=-1)
+
+    waves: list[list[Path]] = [[] for _ in range(max(level.values(), default=-1) + 1)]
+    for script in scripts:
+        waves[level[script]].append(script)
+    return waves
+
+
+def normalize_target(target: str) -> str:
+    """
+    Convierte un --target en un patrón comparable con las Salidas declaradas:
+    las rutas se toman relativas a `data/` si no empiezan por `data/`, y las que
+    no tienen extensión se tratan como carpetas ('gold/dashboard' -> 'data/gold/dashboard/').
+    """
+    pattern = target.replace("\\", "/").lstrip("./")
+    if not pattern.startswith("data/"):
+        pattern = f"data/{pattern}"
+    if not pattern.endswith("/") and not Path(pattern).suffix:
+        pattern += "/"
+    return pattern
+
+
+def upstream_closure(selected: set[Path], deps: dict[Path, set[Path]]) -> set[Path]:
+    """Devuelve `selected` más todos los scripts de los que depende (directa o indirectamente)."""
+    closure: set[Path] = set()
+    stack = list(selected)
+    while stack:
+        script = stack.pop()
+        if script not in closure:
+            closure.add(script)
+            stack.extend(deps[script])
+    return closure
+
+
+def select_stages(
+    scripts: List[Path],
+    deps: dict[Path, set[Path]],
+    *,
+    targets: List[str] | None = None,
+    layers: List[str] | None = None,
+) -> tuple[List[Path], dict[Path, set[Path]]]:
+    """
+    Restringe el pipeline a lo necesario para producir `targets` y/o las capas `layers`.
+
+    Cada target puede ser el nombre de un script (con o sin '.py') o una ruta de
+    datos; en ese caso se eligen los scripts cuya Salida la produce. A eso se suma
+    el cierre de dependencias hacia arriba, de modo que se ejecuta el conjunto
+    mínimo de scripts, en paralelo cuando el grafo lo permite.
+
+    Lanza RuntimeError si un target no corresponde a ningún script.
+    """
+    if not targets and not layers:
+        return scripts, deps
+
+    chosen: set[Path] = set()
+
+    for layer in layers or []:
+        chosen.update(s for s in scripts if s.name.startswith(LAYER_PREFIXES[layer]))
+
+    for target in targets or []:
+        by_name = [s for s in scripts if target in (s.name, s.stem)]
+        if by_name:
+            chosen.update(by_name)
+            continue
+
+        pattern = normalize_target(target)
+        outputs = {s: (parse_stage_io(s) or ([], []))[1] for s in scripts}
+        producers = [s for s in scripts if any(patterns_overlap(pattern, out) for out in outputs[s])]
+        # Un script que solo declara carpetas completas (p.ej. 00_setup con 'data/gold/')
+        # no cuenta como productor si hay otro que declara el archivo en concreto
+        specific = [
+            s
+            for s in producers
+            if any(patterns_overlap(pattern, out) for out in outputs[s] if not out.endswith("/"))
+        ]
+        producers = specific or producers
+        if not producers:
+            raise RuntimeError(f"Ningún script produce el target '{target}' ({pattern}).")
+        chosen.update(producers)
+
+    selected = upstream_closure(chosen, deps)
+    subset = [s for s in scripts if s in selected]
+    logging.info(
+        "Selección (--target/--layer): %d de %d scripts.",
+        len(subset),
+        len(scripts),
+    )
+    return subset, {s: deps[s] & selected for s in subset}
+
+
+def log_execution_plan(scripts: List[Path], deps: dict[Path, set[Path]]) -> None:
+    """Muestra el plan de ejecución agrupado por olas y las dependencias directas."""
+    logging.info("Plan de ejecución (scripts de una misma ola pueden correr en paralelo):")
+    for i, wave in enumerate(compute_waves(scripts, deps)):
+        logging.info("  Ola %d: %s", i, ", ".join(s.name for s in wave))
+
+    for script in scripts:
+        if deps[script]:
+            logging.debug(
+                "  %s <- %s",
+                script.name,
+                ", ".join(sorted(d.name for d in deps[script])),
+            )
+
+
+# --- Caché de compilación (modo incremental) ---
+
+_BUILD_CACHE_LOCK = threading.Lock()
+
+
+def load_build_cache() -> dict:
+    """
+    Carga la caché de compilación desde `.pipeline/build_cache.json`.
+
+    Estructura:
+        {
+          "stages": {"<script>.py": {"code": sha256, "inputs": sha256}},
+          "files":  {"data/...": {"size": int, "mtime_ns": int, "sha256": str}}
+        }
+    """
+    if not BUILD_CACHE_FILE.exists():
+        return {"stages": {}, "files": {}}
+
+    try:
+        cache = json.loads(BUILD_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        logging.warning("Caché de compilación ilegible (%s). Se ignora.", exc)
+        return {"stages": {}, "files": {}}
+
+    cache.setdefault("stages", {})
+    cache.setdefault("files", {})
+    return cache
+
+
+def save_state_file(path: Path, state: dict) -> None:
+    """Guarda un archivo de estado de `.pipeline/` de forma atómica."""
+    PIPELINE_STATE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with _BUILD_CACHE_LOCK:
+        tmp_path.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+        tmp_path.replace(path)
+
+
+def save_build_cache(cache: dict) -> None:
+    """Guarda la caché de compilación de forma atómica."""
+    save_state_file(BUILD_CACHE_FILE, cache)
+
+
+def load_run_journal(resume: bool) -> dict:
+    """
+    Prepara el diario de la corrida (`.pipeline/run_journal.json`).
+
+    Estructura:
+        {
+          "run_id": "AAAAMMDD_HHMMSS",
+          "status": "running" | "ok" | "failed",
+          "stages": {"<script>.py": {"code": sha256, "inputs": sha256, "finished_at": ...}}
+        }
+
+    Con `resume=True` se conservan los scripts completados en la corrida anterior;
+    si no, se empieza de cero. Los hashes de archivos no se guardan aquí sino en el
+    índice `files` de la caché de compilación (ver `load_build_cache`).
+    """
+    previous: dict = {}
+    if RUN_JOURNAL_FILE.exists():
+        try:
+            previous = json.loads(RUN_JOURNAL_FILE.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logging.warning("Diario de ejecución ilegible (%s). Se ignora.", exc)
+
+    journal = {
+        "run_id": dt.datetime.now().strftime("%Y%m%d_%H%M%S"),
+        "status": "running",
+        "stages": {},
+    }
+
+    if resume:
+        if not previous.get("stages"):
+            logging.warning("No hay una corrida anterior que reanudar: se ejecuta todo.")
+        else:
+            journal["stages"] = previous["stages"]
+            logging.info(
+                "Reanudando la corrida %s (%s): %d script(s) completados.",
+                previous.get("run_id", "?"),
+                previous.get("status", "?"),
+                len(previous["stages"]),
+            )
+    return journal
+
+
+def save_run_journal(journal: dict) -> None:
+    """Guarda el diario de la corrida de forma atómica."""
+    save_state_file(RUN_JOURNAL_FILE, journal)
+
+
+def expand_pattern(pattern: str) -> List[Path]:
+    """
+    Devuelve los archivos existentes que cumplen un patrón declarado en Entrada/Salida.
+    Los patrones que terminan en '/' incluyen recursivamente toda la carpeta.
+    """
+    if pattern.endswith("/"):
+        folder = PROJECT_ROOT / pattern
+        if not folder.exists():
+            return []
+        return sorted(p for p in folder.rglob("*") if p.is_file())
+    return sorted(p for p in PROJECT_ROOT.glob(pattern) if p.is_file())
+
+
+def hash_file(path: Path, file_index: dict) -> str:
+    """
+    Calcula el SHA-256 de un archivo. Si tamaño y mtime coinciden con el índice
+    de la caché, reutiliza el hash guardado sin volver a leer el archivo.
+    """
+    stat = path.stat()
+    key = path.relative_to(PROJECT_ROOT).as_posix()
+    entry = file_index.get(key)
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry["sha256"]
+
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+
+    sha = digest.hexdigest()
+    with _BUILD_CACHE_LOCK:
+        file_index[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha}
+    return sha
+
+
+def stage_fingerprint(script_path: Path, inputs: List[str], file_index: dict) -> dict:
+    """
+    Huella de un script: hash de su código (incluyendo los módulos auxiliares
+    `_*.py` de la misma carpeta) y hash de todos los archivos de entrada.
+    """
+    code = hashlib.sha256()
+    helpers = sorted(script_path.parent.glob("_*.py"))
+    for path in [script_path, *helpers]:
+        code.update(path.name.encode())
+        code.update(path.read_bytes())
+
+    data = hashlib.sha256()
+    for pattern in inputs:
+        files = expand_pattern(pattern)
+        if not files:
+            data.update(f"{pattern}:<vacío>\n".encode())
+        for path in files:
+            rel = path.relative_to(PROJECT_ROOT).as_posix()
+            data.update(f"{rel}:{hash_file(path, file_index)}\n".encode())
+
+    return {"code": code.hexdigest(), "inputs": data.hexdigest()}
+
+
+def outputs_exist(outputs: List[str]) -> bool:
+    """Indica si todas las salidas declaradas existen (al menos un archivo por patrón)."""
+    return all(expand_pattern(pattern) for pattern in outputs)
+
+
+def is_forced(script_path: Path, force: set[str]) -> bool:
+    """Indica si el script fue pedido con --force (por nombre, con o sin '.py')."""
+    return "all" in force or script_path.name in force or script_path.stem in force
+
+
+def check_stage_cache(
+    script_path: Path,
+    cache: dict,
+    force: set[str],
+) -> tuple[bool, dict | None]:
+    """
+    Decide si un script puede omitirse en modo incremental.
+
+    Devuelve (omitir, huella). La huella es None cuando el script no es cacheable:
+    - no declara Entrada/Salida, o
+    - no tiene entradas en disco (extrae de fuentes externas: APIs, scraping).
+    """
+    stage_io = parse_stage_io(script_path)
+    if stage_io is None or not stage_io[0]:
+        return False, None
+
+    inputs, outputs = stage_io
+    fingerprint = stage_fingerprint(script_path, inputs, cache["files"])
+
+    if is_forced(script_path, force):
+        return False, fingerprint
+
+    skip = (
+        cache["stages"].get(script_path.name) == fingerprint
+        and outputs_exist(outputs)
+    )
+    return skip, fingerprint
+
+
+def check_stage_journal(
+    script_path: Path,
+    journal: dict,
+    force: set[str],
+    file_index: dict,
+) -> bool:
+    """
+    Decide si un script puede omitirse al reanudar (--resume): ya se completó
+    según el diario, contra el mismo código y las mismas entradas, y sus salidas
+    siguen existiendo.
+
+    A diferencia del modo incremental, aquí también se omiten los scripts sin
+    entradas en disco (scraping, APIs): si ya terminaron, no se repiten.
+
+    Las entradas solo se leen si el diario tiene al script (es decir, al reanudar).
+    """
+    entry = journal["stages"].get(script_path.name)
+    if not entry or is_forced(script_path, force):
+        return False
+
+    inputs, outputs = parse_stage_io(script_path) or ([], [])
+    fingerprint = stage_fingerprint(script_path, inputs, file_index)
+    return (
+        entry.get("code") == fingerprint["code"]
+        and entry.get("inputs") == fingerprint["inputs"]
+        and outputs_exist(outputs)
+    )
+
+
+def execute_stage(
+    script_path: Path,
+    *,
+    dry_run: bool,
+    cache: dict | None,
+    force: set[str],
+    in_process: bool = False,
+    records: List[dict] | None = None,
+    log_dir: Path = STAGE_LOGS_DIR,
+    journal: dict | None = None,
+    file_index: dict | None = None,
+) -> bool:
+    """
+    Ejecuta un script. En modo incremental (`cache` no es None) lo omite si su
+    código y sus entradas no cambiaron desde la última ejecución exitosa.
+
+    Si se pasa `journal`, omite los scripts ya completados según el diario de la
+    corrida (ver `check_stage_journal`) y anota en él cada script que termina bien,
+    con la huella de su código y sus entradas calculada al terminar. `file_index`
+    es el índice de hashes de archivos (el de la caché de compilación).
+
+    Si se pasa `records`, agrega el registro de perfilado del script
+    (ver `profile_inputs` y `profile_outputs`).
+
+    Devuelve True si el script se ejecutó y False si se omitió.
+    """
+    record: dict = {"script": script_path.name}
+
+    if file_index is None:
+        file_index = cache["files"] if cache is not None else {}
+
+    if journal is not None:
+        if check_stage_journal(script_path, journal, force, file_index):
+            logging.info("Completado en la corrida anterior y sin cambios, se omite: %s", script_path.name)
+            record["status"] = "skipped"
+            append_record(records, record)
+            return False
+        if not dry_run:
+            with _BUILD_CACHE_LOCK:
+                journal["stages"].pop(script_path.name, None)
+
+    fingerprint = None
+    if cache is not None:
+        skip, fingerprint = check_stage_cache(script_path, cache, force)
+        if skip:
+            logging.info("Sin cambios en código ni entradas, se omite: %s", script_path.name)
+            record["status"] = "skipped"
+            append_record(records, record)
+            return False
+
+    if cache is not None and fingerprint is not None and not dry_run:
+        # Si el script falla a mitad de camino, sus salidas ya no son confiables
+        with _BUILD_CACHE_LOCK:
+            cache["stages"].pop(script_path.name, None)
+
+    stage_io = parse_stage_io(script_path) if records is not None and not dry_run else None
+    inputs_before = profile_inputs(stage_io[0]) if stage_io else {}
+    log_rel = (log_dir / f"{script_path.stem}.log").relative_to(PROJECT_ROOT).as_posix()
+    start_ns = time.time_ns()
+    start = time.perf_counter()
+
+    try:
+        usage = run_script(script_path, dry_run=dry_run, in_process=in_process, log_dir=log_dir)
+    except Exception:
+        record.update(status="failed", wall_s=time.perf_counter() - start, log=log_rel)
+        append_record(records, record)
+        raise
+
+    if dry_run:
+        record["status"] = "dry-run"
+    else:
+        record.update(status="ok", wall_s=time.perf_counter() - start, **usage)
+        record["log"] = log_rel
+        record.update(inputs_before)
+        if stage_io:
+            record.update(profile_outputs(stage_io[1], start_ns))
+    append_record(records, record)
+
+    if cache is not None and fingerprint is not None and not dry_run:
+        with _BUILD_CACHE_LOCK:
+            cache["stages"][script_path.name] = fingerprint
+        save_build_cache(cache)
+
+    if journal is not None and not dry_run:
+        inputs = (parse_stage_io(script_path) or ([], []))[0]
+        journal_fingerprint = stage_fingerprint(script_path, inputs, file_index)
+        with _BUILD_CACHE_LOCK:
+            journal["stages"][script_path.name] = {
+                **journal_fingerprint,
+                "finished_at": dt.datetime.now().isoformat(timespec="seconds"),
+            }
+        save_run_journal(journal)
+
+    return True
+
+
+def run_stages(
+    scripts: List[Path],
+    deps: dict[Path, set[Path]],
+    *,
+    workers: int,
+    dry_run: bool,
+    cache: dict | None = None,
+    force: set[str] | None = None,
+    in_process: bool = False,
+    records: List[dict] | None = None,
+    log_dir: Path = STAGE_LOGS_DIR,
+    journal: dict | None = None,
+    file_index: dict | None = None,
+) -> None:
+    """
+    Ejecuta los scripts respetando el grafo de dependencias, con hasta `workers`
+    scripts simultáneos. La salida de cada script queda en `log_dir`.
+
+    Un script solo se evalúa (y, en modo incremental, se decide si se omite)
+    cuando terminaron todas sus dependencias, así que un cambio en una salida
+    intermedia se propaga hacia abajo y, si no cambia nada, se omite también
+    todo lo que depende de él.
+
+    Ante el primer error deja de lanzar scripts nuevos, espera a que terminen los
+    que ya estaban en curso y relanza el error.
+    """
+    force = force or set()
+
+    if dry_run:
+        # En simulación no se regeneran salidas: si una dependencia se ejecutaría,
+        # se asume que sus dependientes también.
+        would_run: set[Path] = set()
+        for script in topological_order(scripts, deps):
+            if deps[script] & would_run:
+                run_script(script, dry_run=True, in_process=in_process)
+                would_run.add(script)
+            elif execute_stage(
+                script,
+                dry_run=True,
+                cache=cache,
+                force=force,
+                in_process=in_process,
+                journal=journal,
+                file_index=file_index,
+            ):
+                would_run.add(script)
+        return
+
+    pending = topological_order(scripts, deps)
+    done: set[Path] = set()
+    running: dict[Future, Path] = {}
+    errors: list[Exception] = []
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            if not errors:
+                for script in list(pending):
+                    if len(running) >= workers:
+                        break
+                    if deps[script] <= done:
+                        pending.remove(script)
+                        future = pool.submit(
+                            execute_stage,
+                            script,
+                            dry_run=False,
+                            cache=cache,
+                            force=force,
+                            in_process=in_process,
+                            records=records,
+                            log_dir=log_dir,
+                            journal=journal,
+                            file_index=file_index,
+                        )
+                        running[future] = script
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                script = running.pop(future)
+                try:
+                    future.result()
+                except Exception as exc:  # noqa: BLE001
+                    errors.append(exc)
+                else:
+                    done.add(script)
+                    logging.info(
+                        "Progreso: %d/%d scripts terminados (en curso: %s)",
+                        len(done),
+                        len(scripts),
+                        ", ".join(s.name for s in running.values()) or "-",
+                    )
+
+    if errors:
+        for script in pending:
+            append_record(records, {"script": script.name, "status": "not_run"})
+        if pending:
+            logging.error(
+                "Scripts no ejecutados por el error: %s",
+                ", ".join(s.name for s in pending),
+            )
+        raise errors[0]
+
+
+def run_pipeline(
+    scripts_dir: Path,
+    *,
+    do_backup: bool,
+    dry_run: bool,
+    keep_snapshots: int | None = None,
+    workers: int = DEFAULT_WORKERS,
+    incremental: bool = False,
+    force: List[str] | None = None,
+    in_process: bool = False,
+    resume: bool = False,
+    targets: List[str] | None = None,
+    layers: List[str] | None = None,
+) -> None:
     """
     Orquesta el pipeline completo:
 
     1. Detecta primera ejecución.
-    2. Si no es primera ejecución y do_backup=True, crea backup de data/.
+    2. Si no es primera ejecución y do_backup=True, crea un snapshot de data/
+       y aplica la retención de history/ (`keep_snapshots`).
     3. Descubre scripts en scripts_dir.
-    4. Ejecuta scripts uno por uno en orden alfabético.
+    4. Construye el grafo de dependencias a partir de Entrada/Salida y, si se
+       indican `targets` o `layers`, lo restringe a esos scripts y sus dependencias.
+    5. Ejecuta los scripts en paralelo (hasta `workers`) respetando el grafo.
+       Con `incremental=True` omite los scripts cuyo código y entradas no cambiaron
+       (salvo los indicados en `force`).
+       Con `in_process=True` los scripts corren en workers persistentes en lugar
+       de un subproceso nuevo cada uno.
+       Con `resume=True` continúa la corrida anterior: omite los scripts que ya
+       completó (con el mismo código y las mismas entradas) y no crea un snapshot
+       nuevo, porque `data/` contiene resultados a medias de esa corrida.
     """
     first = is_first_run()
 
@@ -203,8 +1454,11 @@ def run_pipeline(scripts_dir: Path, *, do_backup: bool, dry_run: bool) -> None:
         logging.info("No se realizará backup de 'data/' (no existe o está vacía).")
     else:
         logging.info("Detección: NO es la primera ejecución del pipeline.")
-        if do_backup:
+        if resume:
+            logging.info("Opción --resume activada: no se creará backup de 'data/'.")
+        elif do_backup:
             create_history_snapshot(dry_run=dry_run)
+            prune_history(keep_snapshots, dry_run=dry_run)
         else:
             logging.info("Opción --no-backup activada: no se creará backup de 'data/'.")
 
@@ -213,12 +1467,248 @@ def run_pipeline(scripts_dir: Path, *, do_backup: bool, dry_run: bool) -> None:
         logging.error("No hay scripts para ejecutar. Pipeline abortado.")
         return
 
-    for script in scripts:
-        run_script(script, dry_run=dry_run)
+    deps = build_dependency_graph(scripts)
+    scripts, deps = select_stages(scripts, deps, targets=targets, layers=layers)
+    log_execution_plan(scripts, deps)
+
+    cache = load_build_cache() if incremental else None
+    if cache is not None:
+        logging.info("Modo incremental activo (caché: %s).", BUILD_CACHE_FILE)
+
+    if in_process:
+        configure_worker_pool(workers)
+
+    journal = load_run_journal(resume)
+    # Índice de hashes de archivos compartido por la caché y el diario
+    file_cache = cache if cache is not None else load_build_cache()
+
+    records: List[dict] = []
+    started_at = dt.datetime.now()
+    status = "failed"
+    log_dir = STAGE_LOGS_DIR / started_at.strftime("%Y%m%d_%H%M%S")
+
+    try:
+        run_stages(
+            scripts,
+            deps,
+            workers=max(1, workers),
+            dry_run=dry_run,
+            cache=cache,
+            force=set(force or []),
+            in_process=in_process,
+            records=records,
+            log_dir=log_dir,
+            journal=journal,
+            file_index=file_cache["files"],
+        )
+        status = "ok"
+    finally:
+        shutdown_worker_pool()
+        if not dry_run:
+            journal["status"] = status
+            save_run_journal(journal)
+            save_build_cache(file_cache)
+            write_run_report(
+                records,
+                started_at=started_at,
+                status=status,
+                options={
+                    "workers": workers,
+                    "incremental": incremental,
+                    "in_process": in_process,
+                    "force": sorted(force or []),
+                    "resume": resume,
+                },
+            )
 
     logging.info("Pipeline ejecutado completamente sin errores.")
 
 
+# --- Perfilado y reportes de ejecución ---
+
+_RECORDS_LOCK = threading.Lock()
+
+
+def append_record(records: List[dict] | None, record: dict) -> None:
+    """Agrega un registro de perfilado (seguro entre hilos)."""
+    if records is None:
+        return
+    with _RECORDS_LOCK:
+        records.append(record)
+
+
+def parquet_rows(path: Path) -> int | None:
+    """Número de filas de un parquet leyendo solo sus metadatos (sin cargar datos)."""
+    if path.suffix != ".parquet":
+        return None
+    try:
+        import pyarrow.parquet as pq
+
+        return pq.read_metadata(path).num_rows
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def profile_inputs(inputs: List[str]) -> dict:
+    """
+    Tamaño en disco y filas (parquet) de las entradas declaradas de un script.
+    `input_bytes` es la suma de los tamaños de esos archivos, no lo que el
+    script realmente lee (un parquet leído con `columns=` lee menos).
+    """
+    files = [path for pattern in inputs for path in expand_pattern(pattern)]
+    rows = [parquet_rows(path) for path in files]
+    return {
+        "input_bytes": sum(path.stat().st_size for path in files),
+        "rows_in": sum(r for r in rows if r is not None),
+    }
+
+
+def profile_outputs(outputs: List[str], start_ns: int) -> dict:
+    """
+    Bytes escritos y filas de cada parquet generado por un script: se cuentan
+    los archivos de sus salidas declaradas modificados desde `start_ns`.
+    """
+    written = [
+        path
+        for pattern in outputs
+        for path in expand_pattern(pattern)
+        if path.stat().st_mtime_ns >= start_ns
+    ]
+    return {
+        "bytes_written": sum(path.stat().st_size for path in written),
+        "outputs": {
+            path.relative_to(PROJECT_ROOT).as_posix(): parquet_rows(path)
+            for path in written
+        },
+    }
+
+
+def write_run_report(
+    records: List[dict],
+    *,
+    started_at: dt.datetime,
+    status: str,
+    options: dict,
+) -> Path:
+    """Guarda el reporte de la corrida en `logs/runs/run_AAAAMMDD_HHMMSS.json`."""
+    RUN_REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    finished_at = dt.datetime.now()
+    report = {
+        "run_id": started_at.strftime("%Y%m%d_%H%M%S"),
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "finished_at": finished_at.isoformat(timespec="seconds"),
+        "wall_s": (finished_at - started_at).total_seconds(),
+        "status": status,
+        "options": options,
+        "stages": sorted(records, key=lambda r: r["script"]),
+    }
+    path = RUN_REPORTS_DIR / f"run_{report['run_id']}.json"
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    logging.info("Reporte de ejecución guardado en '%s'.", path.relative_to(PROJECT_ROOT))
+    return path
+
+
+def load_run_reports() -> List[dict]:
+    """Carga todos los reportes de `logs/runs/`, del más antiguo al más reciente."""
+    if not RUN_REPORTS_DIR.exists():
+        return []
+    reports = []
+    for path in sorted(RUN_REPORTS_DIR.glob("run_*.json")):
+        try:
+            reports.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError) as exc:
+            logging.warning("Reporte ilegible %s: %s", path.name, exc)
+    return reports
+
+
+def median(values: List[float]) -> float | None:
+    """Mediana simple (None si no hay valores)."""
+    values = sorted(values)
+    if not values:
+        return None
+    mid = len(values) // 2
+    if len(values) % 2:
+        return values[mid]
+    return (values[mid - 1] + values[mid]) / 2
+
+
+def format_change(current: float | None, baseline: float | None) -> str:
+    """Cambio porcentual respecto a la línea base, p.ej. '+12%'."""
+    if current is None or not baseline:
+        return "   -"
+    return f"{(current - baseline) / baseline:+.0%}"
+
+
+def print_run_report(n_previous: int = DEFAULT_REPORT_RUNS) -> None:
+    """
+    Muestra el perfil de la última corrida y lo compara, script a script, con la
+    mediana de las `n_previous` corridas anteriores. Marca como regresión los
+    scripts cuyo tiempo o pico de memoria crece más de REGRESSION_THRESHOLD.
+    """
+    reports = load_run_reports()
+    if not reports:
+        logging.info("No hay reportes de ejecución en '%s'.", RUN_REPORTS_DIR)
+        return
+
+    latest = reports[-1]
+    previous = reports[-1 - n_previous : -1] if n_previous > 0 else []
+
+    def ok_stages(report: dict) -> dict[str, dict]:
+        return {r["script"]: r for r in report["stages"] if r.get("status") == "ok"}
+
+    history = [ok_stages(report) for report in previous]
+
+    logging.info(
+        "Corrida %s (%s, %.0f s) comparada con la mediana de %d corrida(s) anterior(es):",
+        latest["run_id"],
+        latest["status"],
+        latest.get("wall_s", 0),
+        len(previous),
+    )
+    logging.info(
+        "  %-48s %9s %6s %9s %9s %6s %12s %10s",
+        "script", "wall (s)", "Δ", "cpu (s)", "RSS (MB)", "Δ", "filas salida", "estado",
+    )
+
+    regressions: List[str] = []
+    for record in sorted(latest["stages"], key=lambda r: -(r.get("wall_s") or 0)):
+        name = record["script"]
+        base = [h[name] for h in history if name in h]
+        base_wall = median([r["wall_s"] for r in base if r.get("wall_s") is not None])
+        base_rss = median([r["peak_rss_mb"] for r in base if r.get("peak_rss_mb") is not None])
+
+        wall = record.get("wall_s")
+        rss = record.get("peak_rss_mb")
+        rows_out = sum(v for v in record.get("outputs", {}).values() if v is not None)
+
+        flag = record.get("status", "")
+        if record.get("status") == "ok" and any(
+            current is not None and baseline and current > baseline * (1 + REGRESSION_THRESHOLD)
+            for current, baseline in ((wall, base_wall), (rss, base_rss))
+        ):
+            flag = "REGRESIÓN"
+            regressions.append(name)
+
+        logging.info(
+            "  %-48s %9s %6s %9s %9s %6s %12s %10s",
+            name,
+            f"{wall:.1f}" if wall is not None else "-",
+            format_change(wall, base_wall),
+            f"{record['cpu_s']:.1f}" if record.get("cpu_s") is not None else "-",
+            f"{rss:.0f}" if rss is not None else "-",
+            format_change(rss, base_rss),
+            f"{rows_out:,}" if record.get("outputs") else "-",
+            flag,
+        )
+
+    if regressions:
+        logging.warning(
+            "Posibles regresiones (> %d%% de tiempo o memoria): %s",
+            int(REGRESSION_THRESHOLD * 100),
+            ", ".join(regressions),
+        )
+
+
 # --- CLI / main() ---
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
@@ -245,6 +1735,110 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         help="Modo simulación: no ejecuta scripts ni copia datos, solo muestra lo que haría.",
     )
 
+    parser.add_argument(
+        "--keep-snapshots",
+        type=int,
+        default=None,
+        metavar="N",
+        help=(
+            "Conserva solo los N snapshots más recientes en history/ "
+            "(por defecto se conservan todos)."
+        ),
+    )
+
+    parser.add_argument(
+        "--workers",
+        "-j",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=(
+            "Número máximo de scripts ejecutándose a la vez "
+            f"(por defecto: {DEFAULT_WORKERS}). Usa 1 para ejecución secuencial."
+        ),
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Omite los scripts cuyo código y archivos de entrada no cambiaron desde "
+            "la última ejecución exitosa (y, en cascada, lo que depende de ellos)."
+        ),
+    )
+
+    parser.add_argument(
+        "--force",
+        action="append",
+        default=[],
+        metavar="SCRIPT",
+        help=(
+            "En modo incremental, ejecuta SCRIPT aunque no haya cambios "
+            "(p.ej. 02_process_policia). Puede repetirse; 'all' fuerza todos."
+        ),
+    )
+
+    parser.add_argument(
+        "--target",
+        action="append",
+        default=[],
+        metavar="RUTA",
+        help=(
+            "Ejecuta solo lo necesario para producir RUTA (relativa a data/, p.ej. "
+            "gold/model/regression_monthly_dataset.parquet o gold/dashboard) o el "
+            "script indicado, más sus dependencias. Puede repetirse."
+        ),
+    )
+
+    parser.add_argument(
+        "--layer",
+        action="append",
+        default=[],
+        choices=sorted(LAYER_PREFIXES),
+        help=(
+            "Ejecuta los scripts de una capa (por prefijo: bronze=01_, silver=02_, "
+            "gold=03_, model=04_) más sus dependencias. Puede repetirse."
+        ),
+    )
+
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help=(
+            "Ejecuta los scripts en workers persistentes (uno por --workers) que "
+            "importan pandas/geopandas/etc. una sola vez, en lugar de lanzar un "
+            "intérprete nuevo por script."
+        ),
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Continúa la corrida anterior desde el primer script que falló o "
+            "quedó desactualizado (no crea snapshot de data/)."
+        ),
+    )
+
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help=(
+            "No ejecuta el pipeline: muestra el perfil de la última corrida "
+            "comparado con las anteriores (ver --report-runs)."
+        ),
+    )
+
+    parser.add_argument(
+        "--report-runs",
+        type=int,
+        default=DEFAULT_REPORT_RUNS,
+        metavar="N",
+        help=(
+            "Número de corridas anteriores con las que compara --report "
+            f"(por defecto: {DEFAULT_REPORT_RUNS})."
+        ),
+    )
+
     parser.add_argument(
         "--verbose",
         "-v",
@@ -270,17 +1864,30 @@ def main(argv: list[str] | None = None) -> int:
 
     scripts_dir = PROJECT_ROOT / args.scripts_dir
 
+    if args.report:
+        print_run_report(args.report_runs)
+        return 0
+
     logging.info("Iniciando ejecución del pipeline...")
     logging.info("Directorio del proyecto: %s", PROJECT_ROOT)
     logging.info("Directorio de datos:    %s", DATA_DIR)
     logging.info("Directorio de history:  %s", HISTORY_DIR)
     logging.info("Directorio de scripts:  %s", scripts_dir)
+    logging.info("Workers en paralelo:    %s", args.workers)
 
     try:
         run_pipeline(
             scripts_dir=scripts_dir,
             do_backup=not args.no_backup,
             dry_run=args.dry_run,
+            keep_snapshots=args.keep_snapshots,
+            workers=args.workers,
+            incremental=args.incremental,
+            force=args.force,
+            in_process=args.in_process,
+            resume=args.resume,
+            targets=args.target,
+            layers=args.layer,
         )
     except Exception as e:
         logging.exception("El pipeline terminó con errores: %s", e)
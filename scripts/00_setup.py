@@ -9,7 +9,7 @@ Entrada:
 
 Salida:
     data/bronze/              - Datos crudos (sin procesar)
-        socrata_api/          - JSONs de la API Socrata de Bucaramanga
+        socrata_api/          - NDJSON comprimidos (*.ndjson.gz) de la API Socrata
         policia_scraping/     - Excels descargados de Policía Nacional
         dane_geo/             - Datos geográficos DANE (DIVIPOLA, GeoJSON)
         poblacion_dane/       - Datos de población DANE (ZIPs)
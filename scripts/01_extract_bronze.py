@@ -9,8 +9,9 @@ Entrada:
     No requiere archivos de entrada (consulta APIs externas).
 
 Salida:
-    data/bronze/socrata_api/*.json (solo Santander)
+    data/bronze/socrata_api/*.ndjson.gz (solo Santander)
     data/bronze/dane_geo/divipola_2010.xls
+    data/bronze/_state/socrata_watermarks.json
 
 Datasets Socrata:
     - HOMICIDIOS: m8fd-ahd9
@@ -25,21 +26,112 @@ Adicionales (Bucaramanga y Cibercrimen):
     - BUCARAMANGA_DELITIVA_150: x46e-abhz
     - BUCARAMANGA_DELITOS_40: 75fz-q98y
     - DELITOS_INFORMATICOS: 4v6r-wu98
+
+Descarga concurrente:
+    Los datasets se descargan en paralelo y, dentro de cada uno, sus páginas
+    (`$limit`/`$offset` ordenadas por `:id`) también. Todas las peticiones pasan
+    por un límite de conexiones simultáneas por host y se reintentan con backoff
+    exponencial ante errores de red, 429 y 5xx (respetando `Retry-After`, con
+    un máximo de MAX_RETRY_AFTER segundos).
+    Cada página se escribe en cuanto llega (NDJSON comprimido con gzip, un
+    registro por línea), así que la memoria no crece con el tamaño del dataset.
+
+Proyección de columnas:
+    Para cada dataset de PROJECTIONS se piden con `$select` solo las columnas que
+    usan los scripts Silver y que existen según los metadatos del dataset. Si el
+    esquema cambió (ninguna columna existe, no hay metadatos o la consulta falla
+    con 400), se descargan todas las columnas.
+    Con la variable de entorno SOCRATA_BASE_URL (p.ej. http://127.0.0.1:8000) se
+    puede apuntar a un servidor Socrata local de pruebas; las pruebas usan el
+    de `tests/socrata_server.py`.
+
+Descarga incremental:
+    Cada registro se guarda con los campos de sistema de Socrata `:id` y
+    `:updated_at`. Por dataset se guarda una marca de agua (el mayor `:updated_at`
+    descargado) en `data/bronze/_state/socrata_watermarks.json`, y en las
+    siguientes ejecuciones solo se piden los registros con `:updated_at` mayor o
+    igual, que se fusionan con el archivo existente deduplicando por `:id`.
+    Se hace una descarga completa si no hay marca de agua, si cambió el filtro
+    de departamento, cada FULL_REFRESH_DAYS días (para recoger registros
+    borrados en el origen) o con SOCRATA_FULL_REFRESH=1.
 """
 
+import datetime as dt
+import gzip
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterable, Iterator
+from urllib.parse import urlsplit
 
-import pandas as pd
 import requests
-from sodapy import Socrata
+
+from _http import cached_get, describe_cache
 
 # === CONFIGURACIÓN ===
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data" / "bronze"
 
 SOCRATA_DOMAIN = "www.datos.gov.co"
-SOCRATA_TOKEN: str | None = None
-CLIENT = Socrata(SOCRATA_DOMAIN, SOCRATA_TOKEN)
+SOCRATA_BASE_URL = os.environ.get("SOCRATA_BASE_URL", f"https://{SOCRATA_DOMAIN}").rstrip("/")
+SOCRATA_TOKEN: str | None = os.environ.get("SOCRATA_APP_TOKEN")
+
+# Concurrencia y reintentos
+PAGE_SIZE = 10_000                 # Registros por página ($limit)
+MAX_DATASET_WORKERS = 4            # Datasets descargándose a la vez
+MAX_PAGE_WORKERS = 8               # Páginas descargándose a la vez (entre todos los datasets)
+MAX_PAGES_IN_FLIGHT = 4            # Páginas pedidas y aún no escritas, por dataset
+MAX_CONNECTIONS_PER_HOST = 6       # Peticiones simultáneas contra un mismo host
+MAX_RETRIES = 5
+BACKOFF_SECONDS = 1.0              # Espera base; se duplica en cada reintento
+MAX_RETRY_AFTER = 120.0            # Máximo que se respeta de un `Retry-After` del servidor
+REQUEST_TIMEOUT = 120
+METADATA_TTL = 24 * 3600           # Segundos que se reutilizan los metadatos (/api/views) en caché
+DIVIPOLA_TTL = 30 * 24 * 3600      # DIVIPOLA 2010 es un archivo histórico: casi nunca cambia
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Formato Bronze: un registro JSON por línea, comprimido
+BRONZE_SUFFIX = ".ndjson.gz"
+
+# Descarga incremental
+WATERMARK_FILE = DATA_DIR / "_state" / "socrata_watermarks.json"
+FULL_REFRESH = os.environ.get("SOCRATA_FULL_REFRESH") == "1"
+FULL_REFRESH_DAYS = 30
+SYSTEM_FIELDS = [":id", ":updated_at"]
+
+# Proyección de columnas ($select) por dataset: solo se descargan las que usan
+# los scripts Silver (y que existan en el esquema del dataset). None = todas.
+# Los 7 datasets nacionales solo los consume 02_process_socrata.py; los de
+# Bucaramanga y delitos informáticos pasan todas sus columnas al dashboard.
+CRIME_COLUMNS = [
+    "fecha_hecho",
+    "cod_muni",
+    "codigo_dane",
+    "municipio",
+    "genero",
+    "sexo",
+    "armas_medios",
+    "arma_medio",
+    "cantidad",
+]
+PROJECTIONS: dict[str, list[str] | None] = {
+    "homicidios": CRIME_COLUMNS,
+    "extorsion": CRIME_COLUMNS,
+    "hurto_personas": CRIME_COLUMNS,
+    "lesiones": CRIME_COLUMNS,
+    "amenazas": CRIME_COLUMNS,
+    "delitos_sexuales": CRIME_COLUMNS,
+    "violencia_intrafamiliar": CRIME_COLUMNS,
+    "bucaramanga_delictiva_150": None,
+    "bucaramanga_delitos_40": None,
+    "delitos_informaticos": None,
+}
 
 # Datasets de delitos con sus IDs de Socrata
 DATASETS: dict[str, str] = {
@@ -65,72 +157,429 @@ def ensure_folder(path: Path) -> None:
 
 
 # ---------------------------------------------------------
-# 1. EXTRACCIÓN SOCRATA (DATOS.GOV.CO) - SOLO SANTANDER
+# 1. CLIENTE HTTP SOCRATA (CONCURRENTE, CON REINTENTOS)
 # ---------------------------------------------------------
+_LOCAL = threading.local()
+_HOST_LIMITS: dict[str, threading.BoundedSemaphore] = {}
+_HOST_LIMITS_LOCK = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Sesión HTTP propia de cada hilo (reutiliza conexiones keep-alive)."""
+    session = getattr(_LOCAL, "session", None)
+    if session is None:
+        session = requests.Session()
+        if SOCRATA_TOKEN:
+            session.headers["X-App-Token"] = SOCRATA_TOKEN
+        _LOCAL.session = session
+    return session
+
+
+@contextmanager
+def host_slot(url: str) -> Iterator[None]:
+    """Limita las peticiones simultáneas contra un mismo host."""
+    host = urlsplit(url).netloc
+    with _HOST_LIMITS_LOCK:
+        limit = _HOST_LIMITS.setdefault(host, threading.BoundedSemaphore(MAX_CONNECTIONS_PER_HOST))
+    with limit:
+        yield
+
+
+def retry_delay(attempt: int, retry_after: str | None) -> float:
+    """
+    Segundos a esperar antes del reintento `attempt`: el `Retry-After` del
+    servidor (como máximo MAX_RETRY_AFTER) o backoff exponencial con jitter.
+    """
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), MAX_RETRY_AFTER)
+    return BACKOFF_SECONDS * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+
+
+def socrata_get(dataset_id: str, params: dict, path: str = "resource") -> list[dict] | dict:
+    """
+    Consulta el endpoint SODA `/resource/<id>.json` (o `/api/views/<id>.json`
+    con `path="api/views"`) y devuelve la respuesta JSON.
+    Reintenta hasta MAX_RETRIES veces ante errores de red, 429 y 5xx.
+    """
+    url = f"{SOCRATA_BASE_URL}/{path}/{dataset_id}.json"
+
+    for attempt in range(1, MAX_RETRIES + 1):
+        retry_after = None
+        try:
+            response = cached_get(
+                get_session(),
+                url,
+                params=params,
+                timeout=REQUEST_TIMEOUT,
+                ttl=METADATA_TTL if path == "api/views" else 0,
+                throttle=host_slot,
+            )
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            error: Exception = exc
+        else:
+            if response.status_code not in RETRY_STATUS:
+                response.raise_for_status()
+                return response.json()
+            error = requests.HTTPError(f"HTTP {response.status_code}", response=response)
+            retry_after = response.headers.get("Retry-After")
+
+        if attempt == MAX_RETRIES:
+            raise error
+        delay = retry_delay(attempt, retry_after)
+        print(f"  ↻ {dataset_id}: {error} (reintento {attempt}/{MAX_RETRIES - 1} en {delay:.1f}s)")
+        time.sleep(delay)
+
+
+# ---------------------------------------------------------
+# 2. EXTRACCIÓN SOCRATA (DATOS.GOV.CO) - SOLO SANTANDER
+# ---------------------------------------------------------
+def detect_dept_filter(columns: list[str]) -> str | None:
+    """Determina el filtro SoQL de departamento según la estructura del dataset."""
+    if "departamento" in columns:
+        return "upper(departamento) = 'SANTANDER'"
+    if "departamento_hecho" in columns:
+        return "upper(departamento_hecho) = 'SANTANDER'"
+    if "cod_depto" in columns:
+        return f"cod_depto = '{SANTANDER_CODE}'"
+    if "codigo_dane" in columns:
+        return f"starts_with(codigo_dane, '{SANTANDER_CODE}')"
+    return None
+
+
+def dataset_fields(dataset_id: str) -> list[str] | None:
+    """Nombres de columna del dataset según sus metadatos (None si no se pueden leer)."""
+    try:
+        metadata = socrata_get(dataset_id, {}, path="api/views")
+        return [column["fieldName"] for column in metadata["columns"]]
+    except Exception as exc:  # noqa: BLE001
+        print(f"  ⚠️ {dataset_id}: sin metadatos de columnas ({exc})")
+        return None
+
+
+def resolve_projection(name: str, dataset_id: str) -> list[str] | None:
+    """
+    Columnas a pedir con `$select` para un dataset, o None para pedirlas todas.
+
+    Si el esquema cambió y ya no existe ninguna de las columnas de la proyección,
+    o no se pudieron leer los metadatos, se descarga el dataset completo.
+    """
+    wanted = PROJECTIONS.get(name)
+    if wanted is None:
+        return None
+
+    fields = dataset_fields(dataset_id)
+    if fields is None:
+        return None
+
+    selected = [column for column in wanted if column in fields]
+    if not selected:
+        print(f"  ⚠️ {name}: ninguna columna de la proyección existe, se descargan todas")
+        return None
+    return selected
+
+
+def count_rows(dataset_id: str, where: str | None) -> int:
+    """Número de registros que cumplen el filtro (`count(*)`)."""
+    params = {"$select": "count(*) AS n"}
+    if where:
+        params["$where"] = where
+    result = socrata_get(dataset_id, params)
+    return int(result[0]["n"]) if result else 0
+
+
+def iter_pages(
+    dataset_id: str,
+    where: str | None,
+    page_pool: ThreadPoolExecutor,
+    select: list[str] | None = None,
+) -> Iterator[list[dict]]:
+    """
+    Entrega, en orden, las páginas de registros que cumplen `where` (con `:id`,
+    `:updated_at` y las columnas `select`, o todas si es None). Las páginas se
+    piden en paralelo, pero nunca hay más de MAX_PAGES_IN_FLIGHT descargadas sin
+    consumir, así la memoria no crece con el tamaño del dataset. El orden por
+    `:id` hace que la paginación sea estable.
+    """
+    columns = ", ".join(SYSTEM_FIELDS + (select or ["*"]))
+
+    def page_params(offset: int) -> dict:
+        params = {"$select": columns, "$limit": PAGE_SIZE, "$offset": offset, "$order": ":id"}
+        if where:
+            params["$where"] = where
+        return params
+
+    total = count_rows(dataset_id, where)
+    offsets = iter(range(0, max(total, 1), PAGE_SIZE))
+    in_flight: deque[Future] = deque()
+    last_page: list[dict] = []
+    next_offset = 0
+
+    while True:
+        for offset in offsets:
+            in_flight.append(page_pool.submit(socrata_get, dataset_id, page_params(offset)))
+            next_offset = offset + PAGE_SIZE
+            if len(in_flight) >= MAX_PAGES_IN_FLIGHT:
+                break
+        if not in_flight:
+            break
+        last_page = in_flight.popleft().result()
+        yield last_page
+
+    # Si el dataset creció después del conteo, seguimos hasta una página incompleta
+    while len(last_page) == PAGE_SIZE:
+        last_page = socrata_get(dataset_id, page_params(next_offset))
+        next_offset += PAGE_SIZE
+        yield last_page
+
+
+def read_ndjson(path: Path) -> Iterator[dict]:
+    """Lee registro a registro un archivo NDJSON comprimido con gzip."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def write_ndjson(rows: Iterable[dict], output_path: Path) -> tuple[int, str]:
+    """
+    Escribe los registros en NDJSON comprimido (gzip) a medida que llegan, en un
+    archivo temporal que reemplaza al definitivo al terminar. Si no hay
+    registros no deja ningún archivo (borra también el de una descarga anterior).
+
+    Devuelve (número de registros, mayor `:updated_at`).
+    """
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    n_rows, max_updated = 0, ""
+    try:
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False))
+                f.write("\n")
+                n_rows += 1
+                max_updated = max(max_updated, row.get(":updated_at") or "")
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    if n_rows:
+        tmp_path.replace(output_path)
+    else:
+        tmp_path.unlink()
+        output_path.unlink(missing_ok=True)
+    return n_rows, max_updated
+
+
+def load_watermarks() -> dict[str, dict]:
+    """Carga las marcas de agua por dataset (vacío si no existen o están corruptas)."""
+    if not WATERMARK_FILE.exists():
+        return {}
+    try:
+        return json.loads(WATERMARK_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        print(f"  ⚠️ Marcas de agua ilegibles ({exc}), se hará descarga completa")
+        return {}
+
+
+def save_watermarks(watermarks: dict[str, dict]) -> None:
+    """Guarda las marcas de agua de forma atómica."""
+    ensure_folder(WATERMARK_FILE.parent)
+    tmp_path = WATERMARK_FILE.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(watermarks, indent=2, sort_keys=True), encoding="utf-8")
+    tmp_path.replace(WATERMARK_FILE)
+
+
+def full_refresh_reason(
+    state: dict | None,
+    where: str | None,
+    select: list[str] | None,
+    output_path: Path,
+) -> str | None:
+    """Motivo por el que un dataset debe descargarse completo, o None si basta el incremental."""
+    if FULL_REFRESH:
+        return "SOCRATA_FULL_REFRESH=1"
+    if not state or not state.get("updated_at") or not output_path.exists():
+        return "sin descarga previa"
+    if state.get("where") != where:
+        return "cambió el filtro de departamento"
+    if state.get("select") != select:
+        return "cambió la proyección de columnas"
+    last_full = dt.datetime.fromisoformat(state["full_refresh_at"])
+    age_days = (dt.datetime.now() - last_full).days
+    if age_days >= FULL_REFRESH_DAYS:
+        return f"última descarga completa hace {age_days} días"
+    return None
+
+
+def merge_records(existing: Iterable[dict], changes: dict[str, dict]) -> Iterator[dict]:
+    """
+    Fusiona los registros nuevos (`changes`, por `:id`) con los existentes,
+    deduplicando por `:id`: un registro actualizado reemplaza al anterior en su
+    misma posición y los nuevos van al final. Procesa los existentes en streaming.
+    """
+    pending = dict(changes)
+    for row in existing:
+        yield pending.pop(row[":id"], row)
+    yield from pending.values()
+
+
+def extract_dataset(
+    name: str,
+    dataset_id: str,
+    output_dir: Path,
+    page_pool: ThreadPoolExecutor,
+    state: dict | None = None,
+) -> dict | None:
+    """
+    Descarga un dataset (completo o incremental según su marca de agua, solo
+    con las columnas de su proyección) y lo escribe página a página como NDJSON
+    comprimido en la capa Bronze. Devuelve la nueva marca de agua.
+    """
+    print(f"\n📊 Descargando: {name} ({dataset_id})...")
+    start = time.perf_counter()
+
+    output_path = output_dir / f"{name}{BRONZE_SUFFIX}"
+
+    # Primero obtenemos una muestra para ver la estructura
+    sample = socrata_get(dataset_id, {"$limit": 1})
+    if not sample:
+        print(f"  ⚠️ {name}: dataset vacío")
+        output_path.unlink(missing_ok=True)
+        return None
+
+    columns = list(sample[0].keys())
+    where = detect_dept_filter(columns)
+
+    if where:
+        print(f"  {name}: filtro {where}")
+    else:
+        print(f"  ⚠️ {name}: no se encontró columna de departamento, descargando todo...")
+        print(f"  Columnas disponibles: {columns}")
+
+    select = resolve_projection(name, dataset_id)
+    if select:
+        print(f"  {name}: columnas {', '.join(select)}")
+
+    try:
+        state = download_dataset(name, dataset_id, output_path, page_pool, state, where, select)
+    except requests.HTTPError as exc:
+        # Una columna de la proyección desapareció entre los metadatos y la consulta
+        if select is None or exc.response is None or exc.response.status_code != 400:
+            raise
+        print(f"  ⚠️ {name}: la consulta con $select falló ({exc}), se descargan todas las columnas")
+        state = download_dataset(name, dataset_id, output_path, page_pool, state, where, None)
+
+    # Formato anterior (JSON con indentación), reemplazado por el NDJSON comprimido
+    (output_dir / f"{name}.json").unlink(missing_ok=True)
+
+    if state is not None:
+        print(f"  ✔ {name}: listo en {output_path} ({time.perf_counter() - start:.1f}s)")
+    return state
+
+
+def download_dataset(
+    name: str,
+    dataset_id: str,
+    output_path: Path,
+    page_pool: ThreadPoolExecutor,
+    state: dict | None,
+    where: str | None,
+    select: list[str] | None,
+) -> dict | None:
+    """
+    Descarga completa o incremental (según la marca de agua `state`) de un
+    dataset hacia `output_path`. Devuelve la nueva marca de agua.
+    """
+    now = dt.datetime.now().isoformat(timespec="seconds")
+    reason = full_refresh_reason(state, where, select, output_path)
+
+    if reason:
+        print(f"  {name}: descarga completa ({reason})")
+        rows = (row for page in iter_pages(dataset_id, where, page_pool, select) for row in page)
+        n_rows, max_updated = write_ndjson(rows, output_path)
+        full_refresh_at = now
+        print(f"  {name}: registros Santander: {n_rows:,}")
+    else:
+        since = state["updated_at"]
+        condition = f":updated_at >= '{since}'"
+        changes = {
+            row[":id"]: row
+            for page in iter_pages(
+                dataset_id, f"({where}) AND {condition}" if where else condition, page_pool, select
+            )
+            for row in page
+        }
+        # La condición `>=` vuelve a traer los registros de la marca de agua: se descartan si no cambiaron
+        if changes:
+            for row in read_ndjson(output_path):
+                if changes.get(row[":id"]) == row:
+                    del changes[row[":id"]]
+        print(f"  {name}: {len(changes):,} registros nuevos o actualizados desde {since}")
+        if not changes:
+            return {**state, "checked_at": now}
+        n_rows, max_updated = write_ndjson(merge_records(read_ndjson(output_path), changes), output_path)
+        full_refresh_at = state["full_refresh_at"]
+        print(f"  {name}: registros Santander: {n_rows:,} (antes {state.get('rows', 0):,})")
+
+    if not n_rows:
+        print(f"  ⚠️ {name}: sin registros para Santander")
+        return None
+
+    return {
+        "where": where,
+        "select": select,
+        "updated_at": max_updated,
+        "rows": n_rows,
+        "full_refresh_at": full_refresh_at,
+        "checked_at": now,
+    }
+
+
 def extract_socrata() -> None:
     """
     Extrae datasets de Socrata API (datos.gov.co).
     Filtra SOLO registros del departamento de SANTANDER.
-    
-    IMPORTANTE: Usamos get_all() para obtener TODOS los registros.
-    El método get() por defecto solo retorna 1000 registros.
+
+    IMPORTANTE: se paginan TODOS los registros (una sola petición devuelve
+    como máximo `$limit`). Datasets y páginas se descargan en paralelo y, si hay
+    marca de agua, solo se piden los registros nuevos o actualizados.
     """
     print("=" * 60)
     print("📦 EXTRACCIÓN BRONZE - SOCRATA API")
     print("=" * 60)
     print(f"Filtrando: Solo departamento SANTANDER (código {SANTANDER_CODE})")
+    print(f"Servidor: {SOCRATA_BASE_URL}")
 
     output_dir = DATA_DIR / "socrata_api"
     ensure_folder(output_dir)
-
-    for name, dataset_id in DATASETS.items():
-        print(f"\n📊 Descargando: {name} ({dataset_id})...")
-        try:
-            # Primero obtenemos una muestra para ver la estructura
-            sample = CLIENT.get(dataset_id, limit=1)
-            if not sample:
-                print("  ⚠️ Dataset vacío")
+    watermarks = load_watermarks()
+
+    # Dos pools separados: un dataset espera a sus páginas sin ocupar un hilo de páginas
+    with ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS) as page_pool, ThreadPoolExecutor(
+        max_workers=MAX_DATASET_WORKERS
+    ) as dataset_pool:
+        futures = {
+            dataset_pool.submit(
+                extract_dataset, name, dataset_id, output_dir, page_pool, watermarks.get(name)
+            ): name
+            for name, dataset_id in DATASETS.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                state = future.result()
+            except Exception as exc:  # noqa: BLE001
+                print(f"  ❌ Error en {name}: {exc}")
                 continue
-
-            columns = list(sample[0].keys())
-
-            # Determinar columna de departamento según estructura
-            dept_filter: str | None = None
-
-            if "departamento" in columns:
-                dept_filter = "upper(departamento) = 'SANTANDER'"
-            elif "departamento_hecho" in columns:
-                dept_filter = "upper(departamento_hecho) = 'SANTANDER'"
-            elif "cod_depto" in columns:
-                dept_filter = f"cod_depto = '{SANTANDER_CODE}'"
-            elif "codigo_dane" in columns:
-                dept_filter = f"starts_with(codigo_dane, '{SANTANDER_CODE}')"
-
-            if dept_filter:
-                print(f"  Filtro: {dept_filter}")
-                results = CLIENT.get_all(dataset_id, where=dept_filter)
+            # Se guarda tras cada dataset para no perder el avance si otro falla
+            if state is None:
+                watermarks.pop(name, None)
             else:
-                print("  ⚠️ No se encontró columna de departamento, descargando todo...")
-                print(f"  Columnas disponibles: {columns}")
-                results = CLIENT.get_all(dataset_id)
-
-            results_list = list(results)
-            print(f"  Registros Santander: {len(results_list):,}")
-
-            if results_list:
-                df = pd.DataFrame.from_records(results_list)
-                output_path = output_dir / f"{name}.json"
-                df.to_json(output_path, orient="records", force_ascii=False, indent=2)
-                print(f"  ✔ Guardado en: {output_path}")
-            else:
-                print("  ⚠️ Sin registros para Santander")
-
-        except Exception as exc:  # noqa: BLE001
-            print(f"  ❌ Error: {exc}")
+                watermarks[name] = state
+            save_watermarks(watermarks)
 
 
 # ---------------------------------------------------------
-# 2. EXTRACCIÓN DANE (EXCEL DIRECTO)
+# 3. EXTRACCIÓN DANE (EXCEL DIRECTO)
 # ---------------------------------------------------------
 def extract_dane() -> None:
     """Descarga el archivo DIVIPOLA 2010 desde el DANE."""
@@ -148,7 +597,9 @@ def extract_dane() -> None:
     output_path = output_dir / "divipola_2010.xls"
 
     try:
-        response = requests.get(url, verify=False, timeout=60)  # noqa: S501
+        session = requests.Session()
+        session.verify = False  # noqa: S501 - el geoportal del DANE falla la verificación TLS
+        response = cached_get(session, url, timeout=60, ttl=DIVIPOLA_TTL)
         response.raise_for_status()
         output_path.write_bytes(response.content)
         print(f"  ✔ DANE DIVIPOLA guardado en: {output_path}")
@@ -157,19 +608,20 @@ def extract_dane() -> None:
 
 
 # ---------------------------------------------------------
-# 3. LIMPIAR DATOS ANTERIORES
+# 4. LIMPIAR DATOS ANTERIORES
 # ---------------------------------------------------------
 def clean_previous_data() -> None:
-    """Elimina los archivos JSON anteriores de Socrata."""
+    """Elimina los archivos anteriores de Socrata y sus marcas de agua."""
     print("=" * 60)
     print("🧹 LIMPIANDO DATOS ANTERIORES")
     print("=" * 60)
 
     socrata_dir = DATA_DIR / "socrata_api"
     if socrata_dir.exists():
-        for f in socrata_dir.glob("*.json"):
+        for f in [*socrata_dir.glob("*.json"), *socrata_dir.glob(f"*{BRONZE_SUFFIX}")]:
             print(f"  Eliminando: {f.name}")
             f.unlink()
+        WATERMARK_FILE.unlink(missing_ok=True)
         print("  ✔ Datos anteriores eliminados")
     else:
         print("  No hay datos anteriores")
@@ -181,11 +633,14 @@ def main() -> None:
     print("01 - EXTRACCIÓN CAPA BRONZE (SOCRATA + DANE)")
     print("=" * 60)
 
-    clean_previous_data()
+    # Solo se borra lo anterior en una descarga completa; si no, se actualiza incremental
+    if FULL_REFRESH:
+        clean_previous_data()
     extract_socrata()
     extract_dane()
 
-    print("\n" + "=" * 60)
+    print("\n" + describe_cache())
+    print("=" * 60)
     print("✔ Extracción Bronze completada")
     print("=" * 60)
 
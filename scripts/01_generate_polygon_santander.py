@@ -4,18 +4,30 @@
 
 Descarga y genera el GeoJSON de municipios de Santander desde un repositorio público.
 
+El GeoJSON nacional se descarga en streaming a una copia local (reutilizada
+durante GEOJSON_TTL) y se recorre feature a feature: solo los municipios de
+Santander llegan a construirse como geometrías.
+
 Entrada:
     No requiere archivos de entrada. Consume un GeoJSON remoto.
 
 Salida:
+    data/bronze/dane_geo/co_2018_MGN_MPIO_POLITICO.geojson
     data/bronze/dane_geo/santander_municipios.geojson
 """
 
+import json
+import os
+import time
+from email.utils import formatdate
 from pathlib import Path
+from typing import Iterator
 
 import geopandas as gpd
 import requests
 
+from _http import cached_get, describe_cache
+
 # === CONFIGURACIÓN ===
 # Subimos un nivel desde scripts/ para llegar a la raíz del proyecto
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -26,30 +38,108 @@ GITHUB_GEOJSON_URL = (
     "co_2018_MGN_MPIO_POLITICO.geojson"
 )
 
+NATIONAL_GEOJSON_PATH = DATA_DIR / "co_2018_MGN_MPIO_POLITICO.geojson"
+
+# El MGN 2018 es estático: la copia local se reutiliza durante 30 días
+GEOJSON_TTL = 30 * 24 * 3600
+CHUNK_SIZE = 1024 * 1024
+
+DEPARTMENT_FIELD = "DPTO_CCDGO"
+DEPARTMENT_CODE = "68"
+
 
 def ensure_folder(path: Path) -> None:
     """Crea directorio si no existe."""
     path.mkdir(parents=True, exist_ok=True)
 
 
-def download_geojson(url: str) -> dict:
-    """Descarga un GeoJSON remoto y lo retorna como diccionario."""
-    print("➤ Descargando GeoJSON desde GitHub...")
-    response = requests.get(url, timeout=60)
-    response.raise_for_status()
-    print("✔ GeoJSON descargado correctamente")
-    return response.json()
+def download_geojson(url: str, local_path: Path) -> Path:
+    """
+    Descarga el GeoJSON remoto en streaming a `local_path` y retorna la ruta.
 
+    Si la copia local tiene menos de GEOJSON_TTL segundos se reutiliza; si es
+    más antigua, la petición es condicional (If-Modified-Since) y un 304 la
+    conserva.
+    """
+    headers: dict[str, str] = {}
+    if local_path.exists():
+        age = time.time() - local_path.stat().st_mtime
+        if age < GEOJSON_TTL:
+            print(f"✔ Usando copia local del GeoJSON ({age / 86400:.1f} días): {local_path}")
+            return local_path
+        headers["If-Modified-Since"] = formatdate(local_path.stat().st_mtime, usegmt=True)
 
-def filter_santander_municipalities(geojson_data: dict) -> gpd.GeoDataFrame:
-    """Filtra los municipios del departamento de Santander (código 68)."""
-    print("➤ Convirtiendo a GeoDataFrame...")
-    gdf = gpd.GeoDataFrame.from_features(geojson_data["features"])
+    print("➤ Descargando GeoJSON desde GitHub...")
+    ensure_folder(local_path.parent)
+    tmp_path = local_path.with_name(local_path.name + ".part")
+    with cached_get(requests.Session(), url, headers=headers, timeout=60, stream=True) as response:
+        if response.status_code == 304:
+            local_path.touch()
+            print("✔ GeoJSON sin cambios (304), se conserva la copia local")
+            return local_path
+        response.raise_for_status()
+        with tmp_path.open("wb") as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+    tmp_path.replace(local_path)
+    print(f"✔ GeoJSON descargado correctamente ({os.path.getsize(local_path) / 1e6:.1f} MB)")
+    return local_path
+
+
+def iter_geojson_features(path: Path) -> Iterator[dict]:
+    """
+    Recorre los features de un FeatureCollection sin cargar el archivo completo:
+    lee por bloques de CHUNK_SIZE y decodifica un feature a la vez.
+    """
+    decoder = json.JSONDecoder()
+    with path.open("r", encoding="utf-8-sig") as f:
+        # Avanzar hasta el inicio del arreglo "features"
+        buffer = ""
+        while True:
+            key = buffer.find('"features"')
+            start = buffer.find("[", key) if key != -1 else -1
+            if start != -1:
+                buffer, pos = buffer[start + 1 :], 0
+                break
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                raise ValueError(f"{path} no contiene un arreglo 'features'")
+            buffer += chunk
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer):
+                if buffer[pos] == "]":
+                    return
+                try:
+                    feature, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    feature = None  # Feature incompleto: falta el siguiente bloque
+                if feature is not None:
+                    yield feature
+                    pos = end
+                    continue
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                raise ValueError(f"{path}: arreglo 'features' incompleto o malformado")
+            buffer, pos = buffer[pos:] + chunk, 0
+
+
+def filter_santander_municipalities(geojson_path: Path) -> gpd.GeoDataFrame:
+    """Filtra en streaming los municipios del departamento de Santander (código 68)."""
+    print(f"➤ Filtrando municipios del departamento de Santander ({DEPARTMENT_FIELD} = '{DEPARTMENT_CODE}')...")
+    total = 0
+    features = []
+    for feature in iter_geojson_features(geojson_path):
+        total += 1
+        if (feature.get("properties") or {}).get(DEPARTMENT_FIELD) == DEPARTMENT_CODE:
+            features.append(feature)
 
-    print("➤ Filtrando municipios del departamento de Santander (DPTO_CCDGO = '68')...")
-    gdf_santander = gdf[gdf["DPTO_CCDGO"] == "68"].copy()
+    print("➤ Convirtiendo a GeoDataFrame...")
+    gdf_santander = gpd.GeoDataFrame.from_features(features)
 
-    print(f"✔ Total municipios encontrados: {gdf_santander.shape[0]}")
+    print(f"✔ Total municipios encontrados: {gdf_santander.shape[0]} (de {total} en el archivo nacional)")
     return gdf_santander
 
 
@@ -63,8 +153,8 @@ def save_geojson(gdf_santander: gpd.GeoDataFrame, output_path: Path) -> None:
 
 def generate_santander_polygon() -> None:
     """Orquesta la descarga, filtrado y guardado de los municipios de Santander."""
-    geojson_data = download_geojson(GITHUB_GEOJSON_URL)
-    gdf_santander = filter_santander_municipalities(geojson_data)
+    geojson_path = download_geojson(GITHUB_GEOJSON_URL, NATIONAL_GEOJSON_PATH)
+    gdf_santander = filter_santander_municipalities(geojson_path)
     output_path = DATA_DIR / "santander_municipios.geojson"
     save_geojson(gdf_santander, output_path)
 
@@ -77,6 +167,7 @@ def main() -> None:
 
     try:
         generate_santander_polygon()
+        print(describe_cache())
         print("=" * 60)
         print("✔ Proceso completado con éxito")
         print("=" * 60)
@@ -9,17 +9,59 @@ Entrada:
 
 Salida:
     data/bronze/policia_scraping/*.xlsx
+    data/bronze/_state/policia_manifest.json
+
+Descargas:
+    Las páginas del listado se recorren en orden y cada Excel encontrado se
+    descarga en un pool de MAX_DOWNLOAD_WORKERS hilos. Para cada archivo se
+    guarda su `ETag`/`Last-Modified` en el manifiesto y las siguientes
+    ejecuciones hacen peticiones condicionales: un 304 deja el archivo como
+    está y, si la Policía lo republicó con el mismo nombre, se reemplaza.
+    Las descargas se escriben en `<archivo>.part` y se renombran al
+    terminar; una descarga interrumpida se retoma con `Range`. En lugar de
+    una pausa fija, cada host tiene un presupuesto de cortesía: como máximo
+    MAX_CONNECTIONS_PER_HOST conexiones y una petición cada
+    POLITENESS_INTERVAL s.
+
+Manifiesto:
+    `policia_manifest.json` registra cada archivo conocido (delito, año,
+    URL, tamaño, sha256, validadores HTTP, primera y última vez visto). Con
+    él, el recorrido del listado se detiene en la primera página cuyos
+    enlaces ya son todos conocidos; cada FULL_CRAWL_DAYS días (o con
+    POLICIA_FULL_CRAWL=1) se recorre el listado completo.
+
+    No se publica una lista de archivos nuevos/modificados para la capa
+    Silver: 02_process_policia.py reutiliza la caché de Excel ya leídos
+    (`_excel_cache`, por sha256 del contenido), así que solo vuelve a leer
+    los que cambiaron.
 """
 
+import hashlib
+import json
+import os
 import re
+import threading
 import time
 import unicodedata
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from email.utils import formatdate
 from pathlib import Path
-from urllib.parse import urljoin
+from typing import Iterator
+from urllib.parse import urljoin, urlsplit
 
 import requests
 from bs4 import BeautifulSoup
 
+from _http import cached_get, describe_cache
+
+try:
+    import lxml  # noqa: F401
+
+    HTML_PARSER = "lxml"
+except ImportError:  # pragma: no cover - lxml es opcional
+    HTML_PARSER = "html.parser"
+
 # === CONFIGURACIÓN ===
 # Subimos un nivel desde scripts/ para llegar a la raíz del proyecto
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -28,6 +70,25 @@ OUTPUT_DIR = DATA_DIR / "policia_scraping"
 
 BASE_URL = "https://www.policia.gov.co/estadistica-delictiva"
 
+# Manifiesto del crawl (archivos conocidos)
+MANIFEST_FILE = DATA_DIR / "_state" / "policia_manifest.json"
+
+# Recorrido completo del listado (sin parar en entradas conocidas)
+FULL_CRAWL = os.environ.get("POLICIA_FULL_CRAWL") == "1"
+FULL_CRAWL_DAYS = 30
+
+# Concurrencia y cortesía con el servidor
+MAX_DOWNLOAD_WORKERS = 4         # Descargas simultáneas
+MAX_CONNECTIONS_PER_HOST = 4     # Conexiones simultáneas contra un mismo host
+POLITENESS_INTERVAL = 0.5        # Segundos mínimos entre peticiones a un mismo host
+CHUNK_SIZE = 1024 * 1024
+
+_LOCAL = threading.local()
+_HOST_LOCK = threading.Lock()
+_HOST_SLOTS: dict[str, threading.BoundedSemaphore] = {}
+_HOST_NEXT_REQUEST: dict[str, float] = {}
+_STATE_LOCK = threading.Lock()
+
 
 def ensure_folder(path: Path) -> None:
     """Crea directorio si no existe."""
@@ -62,6 +123,86 @@ def create_session() -> requests.Session:
     return session
 
 
+def get_session() -> requests.Session:
+    """Sesión HTTP propia de cada hilo de descarga."""
+    session = getattr(_LOCAL, "session", None)
+    if session is None:
+        session = create_session()
+        _LOCAL.session = session
+    return session
+
+
+@contextmanager
+def polite_request(url: str) -> Iterator[None]:
+    """
+    Presupuesto de cortesía por host: espera su turno (una petición cada
+    POLITENESS_INTERVAL segundos) y ocupa una de sus MAX_CONNECTIONS_PER_HOST
+    conexiones mientras dura la petición.
+    """
+    host = urlsplit(url).netloc
+    with _HOST_LOCK:
+        slots = _HOST_SLOTS.setdefault(host, threading.BoundedSemaphore(MAX_CONNECTIONS_PER_HOST))
+        now = time.monotonic()
+        turn = max(now, _HOST_NEXT_REQUEST.get(host, now))
+        _HOST_NEXT_REQUEST[host] = turn + POLITENESS_INTERVAL
+    time.sleep(max(0.0, turn - time.monotonic()))
+    with slots:
+        yield
+
+
+def now_iso() -> str:
+    """Fecha y hora local en formato ISO (segundos)."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def load_manifest() -> dict:
+    """
+    Carga el manifiesto del crawl:
+    {"full_crawl_at": ..., "files": {nombre_archivo: {...}}}.
+    """
+    manifest: dict = {"full_crawl_at": None, "files": {}}
+    if not MANIFEST_FILE.exists():
+        return manifest
+    try:
+        manifest.update(json.loads(MANIFEST_FILE.read_text(encoding="utf-8")))
+    except (OSError, ValueError) as exc:
+        print(f"[WARN] Manifiesto ilegible ({exc}), se ignora.")
+    return manifest
+
+
+def save_manifest(manifest: dict) -> None:
+    """Guarda el manifiesto de forma atómica."""
+    ensure_folder(MANIFEST_FILE.parent)
+    tmp_path = MANIFEST_FILE.with_suffix(".tmp")
+    with _STATE_LOCK:
+        tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+        tmp_path.replace(MANIFEST_FILE)
+
+
+def needs_full_crawl(manifest: dict) -> str | None:
+    """Motivo para recorrer el listado completo, o None si basta con las primeras páginas."""
+    if FULL_CRAWL:
+        return "POLICIA_FULL_CRAWL=1"
+    if not manifest["files"]:
+        return "manifiesto vacío"
+    last = manifest.get("full_crawl_at")
+    if last is None:
+        return "sin recorrido completo previo"
+    age_days = (time.time() - time.mktime(time.strptime(last, "%Y-%m-%dT%H:%M:%S"))) / 86400
+    if age_days >= FULL_CRAWL_DAYS:
+        return f"último recorrido completo hace {age_days:.0f} días"
+    return None
+
+
+def file_sha256(path: Path) -> str:
+    """Checksum sha256 de un archivo, leído por bloques."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
 def get_page_html(session: requests.Session, page_number: int) -> str:
     """
     Obtiene el HTML para la página dada usando el parámetro ?page=.
@@ -71,16 +212,19 @@ def get_page_html(session: requests.Session, page_number: int) -> str:
     if page_number > 0:
         params["page"] = page_number
 
-    response = session.get(BASE_URL, params=params, timeout=30)
+    response = cached_get(session, BASE_URL, params=params, timeout=30, throttle=polite_request)
     response.raise_for_status()
     return response.text
 
 
-def parse_table_rows(html: str) -> list[tuple[str, str, str]]:
+def parse_listing_page(html: str) -> tuple[list[tuple[str, str, str]], bool]:
     """
-    Retorna una lista de tuplas (delito, año, download_url) para una página.
+    Analiza una página del listado una sola vez y retorna:
+    - lista de tuplas (delito, año, download_url)
+    - si la página tiene un enlace de paginación 'Siguiente' (<a rel="next">)
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
+    has_next = soup.find("a", rel="next") is not None
 
     # Contenedor principal donde vive la tabla
     container = soup.find("div", class_="table-responsive")
@@ -91,7 +235,7 @@ def parse_table_rows(html: str) -> list[tuple[str, str, str]]:
         table = soup.find("table")
 
     if table is None:
-        return []
+        return [], has_next
 
     tbody = table.find("tbody") or table
     rows: list[tuple[str, str, str]] = []
@@ -114,16 +258,24 @@ def parse_table_rows(html: str) -> list[tuple[str, str, str]]:
 
         rows.append((crime, year, download_url))
 
-    return rows
+    return rows, has_next
 
 
-def has_next_page(html: str) -> bool:
+def conditional_headers(dest_path: Path, entry: dict | None) -> dict[str, str]:
     """
-    Determina si la página tiene un enlace de paginación 'Siguiente'
-    (un <a> con rel="next").
+    Cabeceras para pedir el archivo solo si cambió: los validadores guardados
+    o, para archivos descargados antes de guardarlos, la fecha del archivo local.
     """
-    soup = BeautifulSoup(html, "html.parser")
-    return soup.find("a", rel="next") is not None
+    if not dest_path.exists():
+        return {}
+    if entry and (entry.get("etag") or entry.get("last_modified")):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+    return {"If-Modified-Since": formatdate(dest_path.stat().st_mtime, usegmt=True)}
 
 
 def download_file(
@@ -132,12 +284,19 @@ def download_file(
     year: str,
     url: str,
     index: int | None = None,
-) -> Path:
+    manifest: dict | None = None,
+) -> tuple[Path, str]:
     """
     Descarga el archivo de Excel y lo guarda con la convención de nombres solicitada:
     {AÑO}_{DELITO}_{ÚltimaParteDelEnlace}
 
-    Muestra el índice del archivo (index) si se proporciona.
+    Con `manifest` la petición es condicional (validadores de la descarga
+    anterior): si el servidor responde 304 el archivo local se conserva. La
+    descarga se escribe en `<archivo>.part` y solo reemplaza al archivo al
+    completarse; si quedó una descarga a medias, se retoma con `Range`.
+
+    Retorna la ruta y el estado del archivo: "new", "changed" o "unchanged"
+    (según su sha256). Muestra el índice del archivo (index) si se proporciona.
     """
     ensure_folder(OUTPUT_DIR)
     prefix = f"[{index:03d}] " if index is not None else ""
@@ -149,60 +308,185 @@ def download_file(
 
     filename = f"{year}_{crime_slug}_{last_part}"
     dest_path = OUTPUT_DIR / filename
+    part_path = dest_path.with_name(dest_path.name + ".part")
+
+    if manifest is None:
+        # Sin manifiesto: comportamiento simple (no se vuelve a pedir)
+        if dest_path.exists():
+            print(f"{prefix}[SKIP] Ya existe: {dest_path}")
+            return dest_path, "unchanged"
+        manifest = {"files": {}}
+    files = manifest["files"]
+
+    entry = files.get(filename) or {}
+    headers = conditional_headers(dest_path, entry)
+
+    # Retomar una descarga interrumpida (solo si el servidor identificó la versión)
+    resume_from = part_path.stat().st_size if part_path.exists() else 0
+    partial = entry.get("partial") or {}
+    if resume_from and (partial.get("etag") or partial.get("last_modified")):
+        headers["Range"] = f"bytes={resume_from}-"
+        headers["If-Range"] = partial.get("etag") or partial["last_modified"]
+    else:
+        resume_from = 0
 
-    if dest_path.exists():
-        print(f"{prefix}[SKIP] Ya existe: {dest_path}")
-        return dest_path
+    base_entry = {
+        **entry,
+        "crime": crime,
+        "year": year,
+        "url": url,
+        "first_seen": entry.get("first_seen") or now_iso(),
+        "last_seen": now_iso(),
+    }
 
     print(f"{prefix}[DL  ] {year} | {crime} -> {url}")
-    response = session.get(url, timeout=60)
-    response.raise_for_status()
+    with cached_get(
+        session, url, headers=headers, timeout=60, stream=True, throttle=polite_request
+    ) as response:
+        if response.status_code == 304:
+            print(f"{prefix}[SKIP] Sin cambios (304): {dest_path}")
+            with _STATE_LOCK:
+                files[filename] = {
+                    **base_entry,
+                    "size": dest_path.stat().st_size,
+                    "sha256": entry.get("sha256") or file_sha256(dest_path),
+                    "checked_at": now_iso(),
+                }
+            save_manifest(manifest)
+            return dest_path, "unchanged"
+        response.raise_for_status()
+
+        validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        with _STATE_LOCK:
+            files[filename] = {**base_entry, "partial": validators}
+        save_manifest(manifest)
+
+        # 206: el servidor aceptó el Range; 200: se descarga desde cero
+        mode = "ab" if response.status_code == 206 and resume_from else "wb"
+        if mode == "ab":
+            print(f"{prefix}[RSM ] Retomando desde {resume_from:,} bytes")
+        with part_path.open(mode) as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+
+    sha256 = file_sha256(part_path)
+    previous_sha = entry.get("sha256")
+    if previous_sha is None and dest_path.exists():
+        previous_sha = file_sha256(dest_path)
+
+    if not dest_path.exists():
+        status = "new"
+        part_path.replace(dest_path)
+        print(f"{prefix}[OK  ] Guardado: {dest_path}")
+    elif sha256 == previous_sha:
+        # El servidor no soporta peticiones condicionales pero el contenido es el mismo
+        status = "unchanged"
+        part_path.unlink()
+        print(f"{prefix}[SKIP] Sin cambios: {dest_path}")
+    else:
+        status = "changed"
+        part_path.replace(dest_path)
+        print(f"{prefix}[OK  ] Actualizado: {dest_path}")
+
+    with _STATE_LOCK:
+        files[filename] = {
+            **{k: v for k, v in base_entry.items() if k != "partial"},
+            **validators,
+            "size": dest_path.stat().st_size,
+            "sha256": sha256,
+            "checked_at": now_iso(),
+            "changed_at": now_iso() if status != "unchanged" else entry.get("changed_at"),
+        }
+    save_manifest(manifest)
+    return dest_path, status
+
 
-    dest_path.write_bytes(response.content)
-    print(f"{prefix}[OK  ] Guardado: {dest_path}")
-    return dest_path
+def download_in_worker(
+    crime: str, year: str, url: str, index: int, manifest: dict
+) -> tuple[Path, str]:
+    """Ejecuta download_file en un hilo del pool con la sesión de ese hilo."""
+    return download_file(get_session(), crime, year, url, index=index, manifest=manifest)
 
 
 def run_scraping() -> None:
-    """Ejecuta el proceso completo de scraping y descarga de archivos."""
+    """
+    Ejecuta el proceso completo de scraping y descarga de archivos.
+
+    Las páginas del listado se recorren en orden; cada archivo encontrado se
+    descarga en paralelo (hasta MAX_DOWNLOAD_WORKERS) mientras se sigue paginando.
+    Salvo en un recorrido completo, el paginado se detiene en la primera página
+    cuyos enlaces ya están todos en el manifiesto.
+    """
     session = create_session()
+    manifest = load_manifest()
+    known_urls = {entry.get("url") for entry in manifest["files"].values()}
+
+    full_reason = needs_full_crawl(manifest)
+    if full_reason:
+        print(f"Recorrido completo del listado ({full_reason}).")
+    else:
+        print(f"Recorrido incremental: {len(known_urls)} archivos conocidos en el manifiesto.")
 
     total_files = 0
     page = 0
+    reached_end = False
+    downloads: dict[Future, tuple[int, str, str, str]] = {}
 
-    while True:
-        print(f"\n=== Procesando página {page} ===")
-        html = get_page_html(session, page)
-        rows = parse_table_rows(html)
+    with ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS) as pool:
+        while True:
+            print(f"\n=== Procesando página {page} ===")
+            html = get_page_html(session, page)
+            rows, has_next = parse_listing_page(html)
 
-        if not rows:
-            print("No se encontraron filas en esta página. Deteniendo scraping.")
-            break
+            if not rows:
+                print("No se encontraron filas en esta página. Deteniendo scraping.")
+                reached_end = True
+                break
 
-        print(f"Se encontraron {len(rows)} archivos en la página {page}.")
+            print(f"Se encontraron {len(rows)} archivos en la página {page}.")
 
-        for crime, year, url in rows:
-            try:
+            for crime, year, url in rows:
                 total_files += 1
-                download_file(session, crime, year, url, index=total_files)
-            except Exception as exc:  # noqa: BLE001
-                print(
-                    f"[ERR] Error en archivo {total_files} "
-                    f"({crime} {year} {url}): {exc}",
-                )
-
-        # Si no hay botón "Siguiente", terminamos
-        if not has_next_page(html):
-            print("No se encontró enlace 'Siguiente'. Fin de la paginación.")
-            break
-
-        # Se avanza a la siguiente página
-        page += 1
+                future = pool.submit(download_in_worker, crime, year, url, total_files, manifest)
+                downloads[future] = (total_files, crime, year, url)
+
+            # Si no hay botón "Siguiente", terminamos
+            if not has_next:
+                print("No se encontró enlace 'Siguiente'. Fin de la paginación.")
+                reached_end = True
+                break
+
+            # Todas las entradas de la página ya eran conocidas: lo que sigue también
+            if not full_reason and all(url in known_urls for _, _, url in rows):
+                print("Todas las entradas de la página ya están en el manifiesto. Fin del recorrido.")
+                break
+
+            # Se avanza a la siguiente página (el ritmo lo marca polite_request)
+            page += 1
+
+    new_files: list[str] = []
+    changed_files: list[str] = []
+    for future, (index, crime, year, url) in downloads.items():
+        try:
+            path, status = future.result()
+        except Exception as exc:  # noqa: BLE001
+            print(f"[ERR] Error en archivo {index} ({crime} {year} {url}): {exc}")
+            continue
+        if status == "new":
+            new_files.append(path.name)
+        elif status == "changed":
+            changed_files.append(path.name)
 
-        # Tiempo de espera para no saturar el servidor
-        time.sleep(1)
+    if reached_end:
+        manifest["full_crawl_at"] = now_iso()
+    save_manifest(manifest)
 
     print(f"\nCompletado. Total de archivos procesados: {total_files}")
+    print(f"Nuevos: {len(new_files)} | Modificados: {len(changed_files)}")
+    print(describe_cache())
 
 
 def main() -> None:
@@ -4,6 +4,10 @@
 
 Procesa datos de población del DANE para la capa Silver.
 
+Los TXT nacionales se leen por bloques directamente desde los ZIP, solo con
+las columnas que se usan, y cada bloque se filtra (Santander; 2010–2017 en el
+censo 2005) antes de acumularse: en memoria solo quedan las filas de Santander.
+
 Entrada:
     data/bronze/poblacion_dane/TerriData_Pob_2005.zip (contiene TerriData_Pob_2005.txt)
     data/bronze/poblacion_dane/TerriData_Pob_2018.zip (contiene TerriData_Pob_2018.txt)
@@ -30,6 +34,21 @@ ARCHIVO_INTERNO_2005 = "TerriData_Pob_2005.txt"
 ARCHIVO_INTERNO_2018 = "TerriData_Pob_2018.txt"
 INPUT_SEPARATOR = "|"
 DEPARTAMENTO_FILTRO = "Santander"
+# Años que se toman del censo 2005 (desde 2018 se usa el censo 2018)
+ANIOS_CENSO_2005 = (2010, 2017)
+
+# Columnas que se leen de los TXT (las demás se descartan al leer) y filas por bloque
+INPUT_COLUMNS = [
+    "Código Entidad",
+    "Entidad",
+    "Departamento",
+    "Año",
+    "Mes",
+    "Dato Numérico",
+    "Indicador",
+    "Unidad de Medida",
+]
+CHUNK_ROWS = 200_000
 
 # Salida
 OUTPUT_DIR = BASE_DIR / "data" / "silver" / "poblacion"
@@ -41,18 +60,52 @@ def ensure_folder(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+def read_departamento_from_zip(
+    zip_path: Path,
+    member: str,
+    years: tuple[int, int] | None = None,
+) -> pd.DataFrame:
+    """
+    Lee del ZIP las filas de DEPARTAMENTO_FILTRO (y, si se indica, solo los
+    años `years`, ambos incluidos).
+
+    El TXT se descomprime y se lee por bloques de CHUNK_ROWS filas con solo
+    INPUT_COLUMNS; cada bloque se filtra antes de acumularse.
+    """
+    chunks = []
+    n_rows = 0
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        with zf.open(member) as f:
+            reader = pd.read_csv(
+                f,
+                sep=INPUT_SEPARATOR,
+                dtype=str,
+                usecols=lambda col: col in INPUT_COLUMNS,
+                chunksize=CHUNK_ROWS,
+            )
+            for chunk in reader:
+                n_rows += len(chunk)
+                chunk = chunk[chunk["Departamento"] == DEPARTAMENTO_FILTRO]
+                if years is not None:
+                    chunk = chunk[chunk["Año"].astype(int).between(*years)]
+                chunks.append(chunk)
+
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=INPUT_COLUMNS, dtype=str)
+    print(f"   {member}: {len(df):,} de {n_rows:,} filas")
+    return df
+
+
 def load_poblacion_data() -> tuple[pd.DataFrame, pd.DataFrame]:
-    """Carga los archivos de población del DANE desde archivos ZIP comprimidos."""
-    print("Cargando archivo Censo 2005 desde ZIP...")
-    with zipfile.ZipFile(INPUT_POB_2005_ZIP, 'r') as zf:
-        with zf.open(ARCHIVO_INTERNO_2005) as f:
-            poblacion_2005 = pd.read_csv(f, sep=INPUT_SEPARATOR, dtype=str)
-    
-    print("Cargando archivo Censo 2018 desde ZIP...")
-    with zipfile.ZipFile(INPUT_POB_2018_ZIP, 'r') as zf:
-        with zf.open(ARCHIVO_INTERNO_2018) as f:
-            poblacion_2018 = pd.read_csv(f, sep=INPUT_SEPARATOR, dtype=str)
-    
+    """
+    Carga desde los ZIP las filas de Santander de los archivos de población
+    del DANE (del censo 2005, solo los años ANIOS_CENSO_2005).
+    """
+    print(f"Cargando archivo Censo 2005 desde ZIP ({DEPARTAMENTO_FILTRO}, {ANIOS_CENSO_2005[0]}–{ANIOS_CENSO_2005[1]})...")
+    poblacion_2005 = read_departamento_from_zip(INPUT_POB_2005_ZIP, ARCHIVO_INTERNO_2005, ANIOS_CENSO_2005)
+
+    print(f"Cargando archivo Censo 2018 desde ZIP ({DEPARTAMENTO_FILTRO})...")
+    poblacion_2018 = read_departamento_from_zip(INPUT_POB_2018_ZIP, ARCHIVO_INTERNO_2018)
+
     return poblacion_2005, poblacion_2018
 
 
@@ -130,27 +183,17 @@ def process_poblacion(
     Procesa y combina los datasets de población.
     
     Args:
-        poblacion_2005: DataFrame del censo 2005
-        poblacion_2018: DataFrame del censo 2018
+        poblacion_2005: DataFrame del censo 2005, ya filtrado (Santander, 2010-2017)
+        poblacion_2018: DataFrame del censo 2018, ya filtrado (Santander)
         
     Returns:
         DataFrame agregado por municipio, año, género y grupo de edad
     """
-    print(f"Filtrando datos del departamento '{DEPARTAMENTO_FILTRO}'...")
-    
     # Procesar dataset 2018
-    pob18_filtrado = poblacion_2018[
-        poblacion_2018["Departamento"] == DEPARTAMENTO_FILTRO
-    ].copy()
-    pob18_filtrado = limpiar_df(pob18_filtrado)
+    pob18_filtrado = limpiar_df(poblacion_2018.copy())
     
     # Procesar dataset 2005 (años 2010-2017)
-    print("Filtrando datos del Censo para Santander (2010–2017)...")
-    pob05_filtrado = poblacion_2005[
-        (poblacion_2005["Departamento"] == DEPARTAMENTO_FILTRO) &
-        (poblacion_2005["Año"].astype(int).between(2010, 2017))
-    ].copy()
-    pob05_filtrado = limpiar_df(pob05_filtrado)
+    pob05_filtrado = limpiar_df(poblacion_2005.copy())
     
     # Concatenar datasets
     print("Concatenando datasets...")
@@ -18,6 +18,8 @@ from pathlib import Path
 
 import pandas as pd
 
+from _excel_cache import read_cached
+
 # === CONFIGURACIÓN DE RUTAS ===
 # Subimos un nivel desde scripts/ para llegar a la raíz del proyecto
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -31,6 +33,9 @@ INPUT_METAS = BRONZE_DIR / "metas.xlsx"
 OUTPUT_MANDATOS = SILVER_DIR / "mandatos.parquet"
 OUTPUT_METAS = SILVER_DIR / "metas.parquet"
 
+# Versión de la lectura de los Excel; cambiarla invalida la caché de Excel ya leídos
+EXCEL_PARSER_VERSION = "metas-1"
+
 
 def ensure_folder(path: Path) -> None:
     """Crea directorio si no existe."""
@@ -53,7 +58,7 @@ def load_excel(path: Path, label: str) -> pd.DataFrame:
     """Carga un archivo Excel desde la capa Bronze."""
     check_exists(path, label=label)
     print(f"➤ Cargando archivo Excel: {label}...")
-    df = pd.read_excel(path)
+    df = read_cached(path, EXCEL_PARSER_VERSION, pd.read_excel)
     print(f"✔ Datos cargados ({label}): {df.shape[0]} filas, {df.shape[1]} columnas")
     return df
 
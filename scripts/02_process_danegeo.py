@@ -20,6 +20,9 @@ import geopandas as gpd
 import pandas as pd
 import unidecode
 
+from _categorical import categorical_transform
+from _excel_cache import read_cached
+
 # === CONFIGURACIÓN DE RUTAS ===
 # Subimos un nivel desde scripts/ para llegar a la raíz del proyecto
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -35,6 +38,9 @@ DIVIPOLA_OUTPUT = SILVER_DIR / "divipola_silver.parquet"
 GEOGRAPHY_OUTPUT_PARQUET = SILVER_DIR / "geografia_silver.parquet"
 GEOGRAPHY_OUTPUT_GEOJSON = SILVER_DIR / "geografia_silver.geojson"
 
+# Versión de la lectura de DIVIPOLA; cambiarla invalida la caché de Excel ya leídos
+DIVIPOLA_PARSER_VERSION = "divipola-1"
+
 
 def ensure_folder(path: Path) -> None:
     """Crea directorio si no existe."""
@@ -64,10 +70,10 @@ def load_divipola(filepath: Path) -> pd.DataFrame:
     """
     check_exists(filepath, label="DIVIPOLA 2010")
     print("➤ Cargando archivo DIVIPOLA 2010...")
-    df = pd.read_excel(
+    df = read_cached(
         filepath,
-        sheet_name="LISTADO_VIGENTES",
-        header=2,
+        DIVIPOLA_PARSER_VERSION,
+        lambda path: pd.read_excel(path, sheet_name="LISTADO_VIGENTES", header=2),
     )
     df = df.reset_index(drop=True)
     print(f"✔ DIVIPOLA cargado: {df.shape[0]} filas, {df.shape[1]} columnas")
@@ -99,17 +105,13 @@ def transform_divipola_to_silver(df: pd.DataFrame) -> pd.DataFrame:
     # Filtrar solo Santander
     df_santander = df[df["Nombre Departamento"].str.upper() == "SANTANDER"].copy()
 
-    # Normalización de nombres (departamento / municipio)
-    df_santander.loc[:, "Nombre Departamento"] = (
-        df_santander["Nombre Departamento"]
-        .str.upper()
-        .map(unidecode.unidecode)
-    )
-    df_santander.loc[:, "Nombre Municipio"] = (
-        df_santander["Nombre Municipio"]
-        .str.upper()
-        .map(unidecode.unidecode)
-    )
+    # Normalización de nombres (departamento / municipio), una vez por nombre
+    # distinto; las columnas quedan categóricas
+    for col in ["Nombre Departamento", "Nombre Municipio"]:
+        df_santander[col] = categorical_transform(
+            df_santander[col],
+            lambda names: names.str.upper().map(unidecode.unidecode),
+        )
 
     # Renombrar columnas
     rename_map = {
@@ -2,19 +2,33 @@
 02_process_policia.py
 =====================
 
-Procesa datos de la Policía Nacional para la capa Silver.
+Procesa datos de la Policía Nacional para la capa Silver en una sola pasada:
+los Excel se leen y limpian una vez para todo el país y de ahí salen las dos
+vistas.
+
+- Nacional: dataset particionado por departamento (`departamento=<NOMBRE>/`),
+  con codigo_departamento = primeros 2 dígitos de codigo_municipio.
+- Santander: la partición `departamento=SANTANDER`, con codigo_departamento
+  "68"; es la que consumen Gold y el dashboard.
 
 Entrada:
     data/bronze/policia_scraping/*.xlsx
+    data/bronze/policia_scraping/*.xls
 
 Salida:
+    data/silver/policia_scraping/policia_completo/
     data/silver/policia_scraping/policia_santander.parquet
 """
 
+import shutil
 from pathlib import Path
-from typing import List
 
 import pandas as pd
+from fastparquet import ParquetFile
+
+from _categorical import categorical_transform, strip_upper
+from _dane import department_code, normalize_cod_muni
+from _policia import unify_police_files
 
 # === CONFIGURACIÓN ===
 # Subimos un nivel desde scripts/ para llegar a la raíz del proyecto
@@ -22,7 +36,17 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 BRONZE_POLICE_DIR = BASE_DIR / "data" / "bronze" / "policia_scraping"
 SILVER_POLICE_DIR = BASE_DIR / "data" / "silver" / "policia_scraping"
-SILVER_POLICE_FILENAME = "policia_santander.parquet"
+SILVER_NATIONAL_DIRNAME = "policia_completo"
+SILVER_SANTANDER_FILENAME = "policia_santander.parquet"
+
+# Columna de partición del dataset nacional
+PARTITION_COLUMN = "departamento"
+# Partición de los registros sin departamento: el particionado descarta las
+# filas con la columna de partición nula
+MISSING_PARTITION = "SIN DEPARTAMENTO"
+
+# Valor que reemplaza edades y armas/medios no informados
+NO_REPORT_VALUE = "NO REPORTADO"
 
 DEPARTMENT_CODE = "68"
 DEPARTMENT_NAME = "SANTANDER"
@@ -48,31 +72,9 @@ def check_exists(path: Path, label: str | None = None) -> None:
     print(f"✔ Archivo encontrado: {path}")
 
 
-def normalize_cod_muni(value) -> str:
-    """
-    Normaliza el código de municipio a 5 dígitos.
-
-    Ejemplos:
-        "68755000" -> "68755"
-        "68001" -> "68001"
-        68755 -> "68755"
-    """
-    if pd.isna(value):
-        return "00000"
-
-    # Convertir a string y limpiar
-    code = str(value).strip()
-
-    # Remover decimales si existen (ej: "68755.0")
-    if "." in code:
-        code = code.split(".")[0]
-
-    # Si tiene más de 5 dígitos, tomar los primeros 5
-    if len(code) > 5:
-        code = code[:5]
-
-    # Asegurar que tenga 5 dígitos (padding con ceros a la izquierda)
-    return code.zfill(5)
+def as_text_or(values: pd.Series, missing_value: str) -> pd.Series:
+    """Valores como texto (`str(valor)`); los nulos se reemplazan por `missing_value`."""
+    return values.astype(str).where(values.notna(), missing_value)
 
 
 def normalize_date(df: pd.DataFrame, date_col: str) -> pd.Series:
@@ -87,261 +89,16 @@ def normalize_date(df: pd.DataFrame, date_col: str) -> pd.Series:
 
 
 # =========================================================
-# Lectura y unificación de archivos de Policía
-# =========================================================
-
-def detect_header_row(
-    df: pd.DataFrame,
-    min_idx: int = 9,
-    max_idx: int = 12,
-) -> int:
-    """
-    Detecta la fila de encabezado en un DataFrame,
-    asumiendo que los posibles encabezados están entre min_idx y max_idx (0-based),
-    escogiendo la fila con más valores no nulos.
-    """
-    max_idx = min(max_idx, len(df) - 1)
-    min_idx = max(min_idx, 0)
-
-    if min_idx > max_idx:
-        return 0
-
-    best_row = min_idx
-    best_count = -1
-
-    for i in range(min_idx, max_idx + 1):
-        count_not_null = df.iloc[i].notna().sum()
-        if count_not_null > best_count:
-            best_count = count_not_null
-            best_row = i
-
-    return best_row
-
-
-def load_police_file(path: Path) -> pd.DataFrame:
-    """
-    Lee un archivo Excel de la policía (xls/xlsx), detectando la fila de encabezados
-    entre los índices 9 y 12, limpiando filas vacías y añadiendo metadatos:
-        - anio
-        - delito_archivo
-        - archivo_origen
-    """
-    print(f"\n➤ Procesando archivo: {path.name}")
-
-    # 1) Leer todo el archivo una sola vez (optimización)
-    raw = pd.read_excel(path, header=None)
-
-    # 2) Detectar la fila de encabezado en el DataFrame completo
-    header_row = detect_header_row(raw, min_idx=9, max_idx=12)
-    print(f"   • Fila de encabezado detectada (index): {header_row}")
-
-    # 3) Separar encabezados y datos
-    header = raw.iloc[header_row]
-    df_file = raw.iloc[header_row + 1 :].copy()
-
-    # 4) Asignar encabezados
-    df_file.columns = header
-
-    # 5) Eliminar columnas cuyo encabezado sea NaN
-    df_file = df_file.loc[:, df_file.columns.notna()]
-
-    # 6) Eliminar filas completamente vacías
-    df_file = df_file.dropna(how="all")
-
-    # 7) Normalizar nombres de columnas
-    df_file.columns = df_file.columns.astype(str).str.strip()
-
-    # 8) Extraer metadatos desde el nombre de archivo
-    stem = path.stem  # nombre sin extensión
-    parts = stem.split("_")
-
-    # Año: primer token de 4 dígitos
-    year = None
-    for token in parts:
-        if token.isdigit() and len(token) == 4:
-            year = int(token)
-            break
-
-    # Delito (desde nombre del archivo): primer token no numérico
-    file_crime = None
-    for token in parts:
-        if not token.isdigit():
-            file_crime = token
-            break
-
-    df_file["anio"] = year
-    df_file["delito_archivo"] = file_crime
-    df_file["archivo_origen"] = path.name
-
-    return df_file
-
-
-def unify_police_files(bronze_dir: Path) -> pd.DataFrame:
-    """
-    Une todos los archivos .xls y .xlsx de la carpeta de policía scraping
-    en un único DataFrame.
-    """
-    check_exists(bronze_dir, label="Carpeta Bronze Policía")
-
-    files: List[Path] = sorted(
-        list(bronze_dir.glob("*.xlsx")) + list(bronze_dir.glob("*.xls")),
-    )
-
-    print(f"\nEncontrados {len(files)} archivos de policía (xls + xlsx).")
-
-    dataframes: list[pd.DataFrame] = []
-    for path in files:
-        try:
-            df_file = load_police_file(path)
-            dataframes.append(df_file)
-        except Exception as exc:  # noqa: BLE001
-            print(f"⚠️ Error procesando {path.name}: {exc}")
-
-    if not dataframes:
-        print("❌ No se logró cargar ningún archivo de policía.")
-        return pd.DataFrame()
-
-    df_unified = pd.concat(dataframes, ignore_index=True, sort=False)
-    print("\n✔ Unificación completa.")
-    print(f"   Filas totales unificadas: {len(df_unified):,}")
-
-    return df_unified
-
-
-# =========================================================
-# Limpieza y normalización de columnas
+# Limpieza de datos
 # =========================================================
 
-def combine_columns(
-    df: pd.DataFrame,
-    source_columns: List[str],
-    target_name: str,
-) -> pd.DataFrame:
-    """
-    Combina varias columnas similares en una sola, tomando el primer valor no nulo.
-    Solo usa las columnas que existan en el DataFrame.
-    """
-    existing_cols = [col for col in source_columns if col in df.columns]
-    if not existing_cols:
-        return df
-
-    df[target_name] = df[existing_cols].bfill(axis=1).iloc[:, 0]
-    return df
-
-
-def build_clean_dataframe(df_unified: pd.DataFrame) -> pd.DataFrame:
+def clean_police_data(df_clean: pd.DataFrame) -> pd.DataFrame:
     """
-    A partir de df_unified, crea un DataFrame limpio con
-    columnas homogéneas y nombres estandarizados.
-    """
-    df = df_unified.copy()
-
-    # Definición de grupos de columnas equivalentes
-    age_cols = [
-        "*AGRUPA EDAD PERSONA",
-        "*AGRUPA EDAD PERSONA*",
-        "*AGRUPA_EDAD_PERSONA",
-        "AGRUPA EDAD PERSONA",
-        "AGRUPA_EDAD_PERSONA",
-        "GRUPO ETARIO",
-    ]
-
-    weapon_cols = [
-        "ARMA MEDIO",
-        "ARMAS MEDIO",
-        "ARMAS MEDIOS",
-        "ARMAS_MEDIOS",
-    ]
-
-    dane_code_cols = [
-        "CODIGO DANE",
-        "CODIGO_DANE",
-    ]
-
-    crime_cols = [
-        "DELITO",
-        "DELITOS",
-    ]
-
-    department_cols = [
-        "DEPARTAMENTO",
-        "Departamento",
-    ]
-
-    date_cols = [
-        "FECHA",
-        "FECHA  HECHO",
-        "FECHA HECHO",
-    ]
-
-    city_cols = [
-        "MUNICICPIO",
-        "MUNICIPIO",
-        "MUNICIPO",
-        "Municipio",
-    ]
-
-    description_col = "DESCRIPCION CONDUCTA"
-    gender_col = "GENERO"
-    quantity_col = "CANTIDAD"
-
-    # Combinar columnas en nuevas columnas limpias
-    df = combine_columns(df, age_cols, "edad_persona")
-    df = combine_columns(df, weapon_cols, "armas_medios")
-    df = combine_columns(df, dane_code_cols, "codigo_dane")
-    df = combine_columns(df, crime_cols, "delito")
-    df = combine_columns(df, department_cols, "departamento")
-    df = combine_columns(df, date_cols, "fecha")
-    df = combine_columns(df, city_cols, "municipio")
-
-    if description_col in df.columns:
-        df["descripcion_conducta"] = df[description_col]
-
-    if gender_col in df.columns:
-        df["genero"] = df[gender_col]
-
-    if quantity_col in df.columns:
-        df["cantidad"] = df[quantity_col]
-
-    # Columnas finales que nos interesa conservar
-    final_columns = [
-        "departamento",
-        "municipio",
-        "codigo_dane",
-        "delito",
-        "edad_persona",
-        "armas_medios",
-        "cantidad",
-        "descripcion_conducta",
-        "fecha",
-        "genero",
-        "anio",
-        "delito_archivo",
-        "archivo_origen",
-    ]
-
-    existing_final_columns = [col for col in final_columns if col in df.columns]
-    df_clean = df[existing_final_columns].copy()
-
-    # Normalizar departamento a mayúsculas
-    if "departamento" in df_clean.columns:
-        df_clean["departamento"] = (
-            df_clean["departamento"].astype(str).str.strip().str.upper()
-        )
-
-    return df_clean
-
-
-def clean_and_filter_santander(df_clean: pd.DataFrame) -> pd.DataFrame:
-    """
-    Aplica todas las transformaciones de limpieza sobre df_clean y
-    devuelve df_policia_santander listo para exportar.
+    Aplica todas las transformaciones de limpieza sobre df_clean
+    sin filtrar por departamento.
     """
     df = df_clean.copy()
 
-    # Filtrar solo SANTANDER
-    df = df[df["departamento"] == DEPARTMENT_NAME].copy()
-
     # Correcciones a delito_archivo
     replacements_file_crime = {
         "Delitos%20sexuales": "Delitos sexuales",
@@ -365,31 +122,23 @@ def clean_and_filter_santander(df_clean: pd.DataFrame) -> pd.DataFrame:
         "Homicidios%20en%20accidente%20de%20tr%C3%A1nsito": "Homicidios",
     }
 
+    # Las columnas de texto tienen pocos valores distintos: cada limpieza se
+    # aplica una vez por valor distinto y la columna queda categórica
     if "delito_archivo" in df.columns:
-        df["delito_archivo"] = df["delito_archivo"].replace(replacements_file_crime)
+        df["delito_archivo"] = categorical_transform(
+            df["delito_archivo"],
+            lambda names: names.replace(replacements_file_crime),
+        )
 
     # Limpiar municipio y delito (si existen)
     if "municipio" in df.columns:
-        df["municipio"] = (
-            df["municipio"].astype(str).str.strip().str.upper()
-        )
+        df["municipio"] = categorical_transform(df["municipio"].astype(str), strip_upper)
 
     if "delito" in df.columns:
-        df["delito"] = (
-            df["delito"].astype(str).str.strip().str.upper()
-        )
+        df["delito"] = categorical_transform(df["delito"].astype(str), strip_upper)
 
-    # Limpiar edad_persona
+    # Limpiar edad_persona (nulos y variantes de "no reporta" -> NO REPORTADO)
     if "edad_persona" in df.columns:
-        df["edad_persona"] = df["edad_persona"].where(df["edad_persona"].notna())
-        mask_notna = df["edad_persona"].notna()
-        df.loc[mask_notna, "edad_persona"] = (
-            df.loc[mask_notna, "edad_persona"]
-            .astype(str)
-            .str.strip()
-            .str.upper()
-        )
-
         no_report_age_values = [
             "",
             "-",
@@ -398,14 +147,13 @@ def clean_and_filter_santander(df_clean: pd.DataFrame) -> pd.DataFrame:
             "NO RESPORTADO",
         ]
 
-        df["edad_persona"] = df["edad_persona"].replace(
-            no_report_age_values,
-            "NO REPORTADO",
+        df["edad_persona"] = categorical_transform(
+            as_text_or(df["edad_persona"], NO_REPORT_VALUE),
+            lambda ages: strip_upper(ages).replace(no_report_age_values, NO_REPORT_VALUE),
         )
-        df["edad_persona"] = df["edad_persona"].fillna("NO REPORTADO")
 
         # Eliminar registros con edad_persona = NO REPORTADO
-        df = df[df["edad_persona"] != "NO REPORTADO"].copy()
+        df = df[df["edad_persona"] != NO_REPORT_VALUE].copy()
 
     # Eliminar registros con genero nulo
     if "genero" in df.columns:
@@ -413,15 +161,6 @@ def clean_and_filter_santander(df_clean: pd.DataFrame) -> pd.DataFrame:
 
     # Limpiar armas_medios
     if "armas_medios" in df.columns:
-        df["armas_medios"] = df["armas_medios"].where(df["armas_medios"].notna())
-        mask_notna_weapon = df["armas_medios"].notna()
-        df.loc[mask_notna_weapon, "armas_medios"] = (
-            df.loc[mask_notna_weapon, "armas_medios"]
-            .astype(str)
-            .str.strip()
-            .str.upper()
-        )
-
         no_report_weapon_values = [
             "-",
             "NO REPORTA",
@@ -429,11 +168,10 @@ def clean_and_filter_santander(df_clean: pd.DataFrame) -> pd.DataFrame:
             "NO RESPORTADO",
         ]
 
-        df["armas_medios"] = df["armas_medios"].replace(
-            no_report_weapon_values,
-            "NO REPORTADO",
+        df["armas_medios"] = categorical_transform(
+            as_text_or(df["armas_medios"], NO_REPORT_VALUE),
+            lambda weapons: strip_upper(weapons).replace(no_report_weapon_values, NO_REPORT_VALUE),
         )
-        df["armas_medios"] = df["armas_medios"].fillna("NO REPORTADO")
 
     # Si existe descripcion_conducta, ya no se usa; se elimina
     if "descripcion_conducta" in df.columns:
@@ -446,9 +184,7 @@ def clean_and_filter_santander(df_clean: pd.DataFrame) -> pd.DataFrame:
     # Renombrar delito_archivo -> delito y poner en mayúsculas
     if "delito_archivo" in df.columns:
         df = df.rename(columns={"delito_archivo": "delito"})
-        df["delito"] = (
-            df["delito"].astype(str).str.strip().str.upper()
-        )
+        df["delito"] = categorical_transform(df["delito"].astype(str), strip_upper)
 
     # Eliminar archivo_origen si existe
     if "archivo_origen" in df.columns:
@@ -461,15 +197,15 @@ def clean_and_filter_santander(df_clean: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def prepare_for_export(df_police_santander: pd.DataFrame) -> pd.DataFrame:
+def prepare_for_export(df_police: pd.DataFrame) -> pd.DataFrame:
     """
     Convierte tipos problemáticos antes de exportar:
         - fecha a datetime (usando normalize_date)
         - codigo_dane a string
-        - agrega codigo_departamento = "68"
         - agrega codigo_municipio normalizado desde codigo_dane
+        - agrega codigo_departamento = primeros 2 dígitos de codigo_municipio
     """
-    df = df_police_santander.copy()
+    df = df_police.copy()
 
     # Normalizar fecha
     if "fecha" in df.columns:
@@ -478,36 +214,90 @@ def prepare_for_export(df_police_santander: pd.DataFrame) -> pd.DataFrame:
     # Normalizar códigos DANE / municipio / departamento
     if "codigo_dane" in df.columns:
         df["codigo_dane"] = df["codigo_dane"].astype(str).str.strip()
-        df["codigo_municipio"] = df["codigo_dane"].apply(normalize_cod_muni)
+        df["codigo_municipio"] = normalize_cod_muni(df["codigo_dane"])
     else:
         df["codigo_municipio"] = "00000"
 
-    # Agregar código de departamento (Santander)
-    df["codigo_departamento"] = DEPARTMENT_CODE
+    # Código de departamento: primeros 2 dígitos del código de municipio
+    df["codigo_departamento"] = department_code(df["codigo_municipio"])
+
+    return df
 
+
+def derive_santander_view(df_police: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vista Santander del dataset nacional: la partición departamento = SANTANDER,
+    con codigo_departamento = "68".
+    """
+    df = df_police[df_police[PARTITION_COLUMN] == DEPARTMENT_NAME].copy()
+    df["codigo_departamento"] = DEPARTMENT_CODE
     return df
 
 
+def export_partitioned(df_police: pd.DataFrame, output_dir: Path) -> None:
+    """
+    Exporta el dataset nacional particionado por departamento (estilo Hive).
+    Se escribe en una carpeta temporal que reemplaza a la anterior al terminar,
+    para no dejar particiones de ejecuciones previas.
+
+    Los registros sin departamento (nulo, vacío o "NAN", como queda un nulo
+    convertido a texto) van a la partición MISSING_PARTITION.
+    """
+    departamento = df_police[PARTITION_COLUMN]
+    missing = departamento.isna() | departamento.isin(["", "NAN"])
+    if missing.any():
+        print(f"   ⚠️ {int(missing.sum()):,} registros sin departamento → partición '{MISSING_PARTITION}'")
+        df_police = df_police.assign(**{PARTITION_COLUMN: departamento.where(~missing, MISSING_PARTITION)})
+
+    ensure_folder(output_dir.parent)
+    tmp_dir = output_dir.with_name(output_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    df_police.to_parquet(
+        tmp_dir,
+        engine="fastparquet",
+        partition_on=[PARTITION_COLUMN],
+        index=False,
+    )
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    tmp_dir.rename(output_dir)
+
+    # El dataset nacional antes era un único archivo
+    output_dir.with_suffix(".parquet").unlink(missing_ok=True)
+
+    # Registros escritos según los metadatos del dataset en disco
+    n_written = ParquetFile(str(output_dir)).count()
+    if n_written != len(df_police):
+        raise RuntimeError(
+            f"El dataset nacional tiene {n_written:,} registros en disco; se esperaban {len(df_police):,}"
+        )
+
+    n_partitions = df_police[PARTITION_COLUMN].nunique()
+    print(f"\n✅ Dataset nacional guardado en: {output_dir}")
+    print(f"   Registros: {n_written:,} | Particiones ({PARTITION_COLUMN}): {n_partitions}")
+
+
 def export_to_parquet(
-    df_police_santander: pd.DataFrame,
+    df_police: pd.DataFrame,
     silver_dir: Path,
     filename: str,
 ) -> None:
     """
-    Exporta df_police_santander a un archivo Parquet en la ruta Silver.
+    Exporta df_police a un archivo Parquet en la ruta Silver.
     """
     ensure_folder(silver_dir)
     output_path = silver_dir / filename
 
-    df_police_santander.to_parquet(
+    df_police.to_parquet(
         output_path,
         engine="fastparquet",
         index=False,
     )
 
     print(f"\n✅ Archivo guardado en: {output_path}")
-    print(f"   Registros: {len(df_police_santander):,}")
-    print(f"   Columnas: {df_police_santander.columns.tolist()}")
+    print(f"   Registros: {len(df_police):,}")
+    print(f"   Columnas: {df_police.columns.tolist()}")
 
 
 # =========================================================
@@ -520,27 +310,28 @@ def main() -> None:
     print("02 - PROCESAMIENTO POLICÍA (BRONZE → SILVER)")
     print("=" * 60)
 
-    # 1) Unificar todos los archivos de policía (Bronze)
-    df_unified = unify_police_files(BRONZE_POLICE_DIR)
+    # 1) Unificar todos los archivos de policía (Bronze) con columnas homogéneas
+    check_exists(BRONZE_POLICE_DIR, label="Carpeta Bronze Policía")
+    df_clean = unify_police_files(BRONZE_POLICE_DIR)
 
-    if df_unified.empty:
+    if df_clean.empty:
         print("❌ No hay datos para procesar.")
         return
 
-    # 2) Crear dataframe limpio con columnas homogéneas
-    df_clean = build_clean_dataframe(df_unified)
+    # 2) Limpiar datos (todo el país)
+    df_police_clean = clean_police_data(df_clean)
 
-    # 3) Limpiar y filtrar para Santander
-    df_police_santander = clean_and_filter_santander(df_clean)
+    # 3) Ajustar tipos y códigos para exportar
+    df_police_ready = prepare_for_export(df_police_clean)
 
-    # 4) Ajustar tipos y códigos para exportar
-    df_police_santander = prepare_for_export(df_police_santander)
+    # 4) Exportar el dataset nacional particionado por departamento
+    export_partitioned(df_police_ready, SILVER_POLICE_DIR / SILVER_NATIONAL_DIRNAME)
 
-    # 5) Exportar a Silver
+    # 5) Exportar la vista Santander (partición SANTANDER)
     export_to_parquet(
-        df_police_santander,
+        derive_santander_view(df_police_ready),
         SILVER_POLICE_DIR,
-        SILVER_POLICE_FILENAME,
+        SILVER_SANTANDER_FILENAME,
     )
 
     print("=" * 60)
@@ -549,4 +340,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
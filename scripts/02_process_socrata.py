@@ -5,7 +5,7 @@
 Procesa y unifica los datos Bronze de Socrata en un esquema Silver estandarizado.
 
 Entrada:
-    data/bronze/socrata_api/*.json (7 archivos de delitos)
+    data/bronze/socrata_api/*.ndjson.gz (7 archivos de delitos, un registro JSON por línea)
 
 Salida:
     data/silver/delitos/consolidado_delitos.parquet
@@ -26,11 +26,16 @@ from typing import List
 
 import pandas as pd
 
+from _dane import normalize_cod_muni
+
 # === CONFIGURACIÓN ===
 BASE_DIR = Path(__file__).resolve().parent.parent
 BRONZE_DIR = BASE_DIR / "data" / "bronze" / "socrata_api"
 SILVER_DIR = BASE_DIR / "data" / "silver" / "delitos"
 
+# Formato Bronze de Socrata: NDJSON comprimido con gzip
+BRONZE_SUFFIX = ".ndjson.gz"
+
 # Mapeo de nombre de archivo a tipo de delito
 DELITO_MAP = {
     "homicidios": "HOMICIDIOS",
@@ -55,33 +60,6 @@ SILVER_COLUMNS = [
 ]
 
 
-def normalize_cod_muni(value) -> str:
-    """
-    Normaliza el código de municipio a 5 dígitos.
-    
-    Ejemplos:
-        "68755000" -> "68755"
-        "68001" -> "68001"
-        68755 -> "68755"
-    """
-    if pd.isna(value):
-        return "00000"
-    
-    # Convertir a string y limpiar
-    code = str(value).strip()
-    
-    # Remover decimales si existen (ej: "68755.0")
-    if "." in code:
-        code = code.split(".")[0]
-    
-    # Si tiene más de 5 dígitos, tomar los primeros 5
-    if len(code) > 5:
-        code = code[:5]
-    
-    # Asegurar que tenga 5 dígitos (padding con ceros a la izquierda)
-    return code.zfill(5)
-
-
 def normalize_date(df: pd.DataFrame, date_col: str) -> pd.Series:
     """
     Normaliza fechas manejando múltiples formatos.
@@ -108,16 +86,16 @@ def get_column_value(df: pd.DataFrame, possible_names: List[str], default: str =
 
 def process_file(filepath: Path) -> pd.DataFrame:
     """
-    Procesa un archivo JSON Bronze y lo transforma al esquema Silver.
+    Procesa un archivo NDJSON Bronze y lo transforma al esquema Silver.
     """
     # Obtener nombre del delito desde el nombre del archivo
-    file_stem = filepath.stem
+    file_stem = filepath.name.removesuffix(BRONZE_SUFFIX)
     tipo_delito = DELITO_MAP.get(file_stem, file_stem.upper())
     
     print(f"  Procesando: {filepath.name} -> {tipo_delito}")
     
-    # Leer JSON
-    df = pd.read_json(filepath)
+    # Leer NDJSON (un registro por línea)
+    df = pd.read_json(filepath, lines=True, compression="gzip")
     
     if df.empty:
         print(f"    ⚠ Archivo vacío")
@@ -149,7 +127,7 @@ def process_file(filepath: Path) -> pd.DataFrame:
             break
     
     if cod_col:
-        df_silver["cod_muni"] = df[cod_col].apply(normalize_cod_muni)
+        df_silver["cod_muni"] = normalize_cod_muni(df[cod_col])
     else:
         df_silver["cod_muni"] = "00000"
     
@@ -191,10 +169,10 @@ def main() -> None:
     # Crear directorio de salida
     SILVER_DIR.mkdir(parents=True, exist_ok=True)
     
-    # Procesar cada archivo JSON
+    # Procesar cada archivo Bronze
     dataframes = []
     
-    for filepath in sorted(BRONZE_DIR.glob("*.json")):
+    for filepath in sorted(BRONZE_DIR.glob(f"*{BRONZE_SUFFIX}")):
         try:
             df = process_file(filepath)
             if not df.empty:
@@ -2,12 +2,12 @@
 02_socrata_bucaramanga_to_parquet.py
 ====================================
 
-Convierte y limpia archivos JSON de Socrata a Parquet para la capa Silver.
+Convierte y limpia archivos NDJSON de Socrata a Parquet para la capa Silver.
 
 Entrada (Bronze):
-    data/bronze/socrata_api/bucaramanga_delictiva_150.json
-    data/bronze/socrata_api/bucaramanga_delitos_40.json
-    data/bronze/socrata_api/delitos_informaticos.json
+    data/bronze/socrata_api/bucaramanga_delictiva_150.ndjson.gz
+    data/bronze/socrata_api/bucaramanga_delitos_40.ndjson.gz
+    data/bronze/socrata_api/delitos_informaticos.ndjson.gz
 
 Salida (Silver):
     data/silver/socrata_api/delitos_bucaramanga.parquet        # Bucaramanga unificado y limpio
@@ -34,8 +34,11 @@ import re
 from pathlib import Path
 from typing import List
 
+import numpy as np
 import pandas as pd
 
+from _categorical import map_unique
+
 # === CONFIGURACIÓN ===
 # Subimos un nivel desde scripts/ para llegar a la raíz del proyecto
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -43,6 +46,9 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 BRONZE_DIR = BASE_DIR / "data" / "bronze" / "socrata_api"
 SILVER_DIR = BASE_DIR / "data" / "silver" / "socrata_api"
 
+# Formato Bronze de Socrata: NDJSON comprimido con gzip
+BRONZE_SUFFIX = ".ndjson.gz"
+
 # Archivos a procesar (sin extensión)
 BUCARAMANGA_STEMS: List[str] = [
     "bucaramanga_delictiva_150",
@@ -54,6 +60,43 @@ DELITOS_INF_STEM = "delitos_informaticos"
 BUCARAMANGA_OUTPUT = "delitos_bucaramanga.parquet"
 DELITOS_INF_OUTPUT = "delitos_informaticos.parquet"
 
+# Patrones de los textos de Bucaramanga (compilados una vez)
+LEADING_NUMBER_RE = re.compile(r"^(\d+)")
+DAY_OF_WEEK_RE = re.compile(r"^(\d+)\D+(.*)")
+ARTICULO_RE = re.compile(r"^(ARTICULO\s+\d+)")
+CONDUCTA_RE = re.compile(r"^ARTICULO\s+\d+\.\s*(.*)", re.IGNORECASE)
+
+MONTH_NUMBERS = {
+    "ENERO": 1,
+    "FEBRERO": 2,
+    "MARZO": 3,
+    "ABRIL": 4,
+    "MAYO": 5,
+    "JUNIO": 6,
+    "JULIO": 7,
+    "AGOSTO": 8,
+    "SEPTIEMBRE": 9,
+    "SETIEMBRE": 9,
+    "OCTUBRE": 10,
+    "NOVIEMBRE": 11,
+    "DICIEMBRE": 12,
+}
+
+# Curso de vida por edad (años cumplidos): límites superiores de cada tramo
+CURSO_VIDA_BINS = [-1, 6, 11, 18, 28, 59, np.inf]
+CURSO_VIDA_LABELS = [
+    "01. PRIMERA INFANCIA",
+    "02. INFANCIA",
+    "03. ADOLESCENCIA",
+    "04. JOVENES",
+    "05. ADULTEZ",
+    "06. PERSONA MAYOR",
+]
+CURSO_VIDA_MISSING = "NO REPORTA"
+
+# Resultados de infer_dtype que se pueden convertir a número directamente
+NUMERIC_FIRST_KINDS = {"floating", "integer", "mixed-integer-float", "decimal", "string", "empty"}
+
 
 # =========================================================
 # Utilidades generales
@@ -105,19 +148,38 @@ def normalize_date(df: pd.DataFrame, date_col: str) -> pd.Series:
     return pd.to_datetime(df[date_col], format="mixed", dayfirst=True, errors="coerce")
 
 
+def parse_decimal(series: pd.Series) -> pd.Series:
+    """
+    Convierte a número valores que pueden venir como números o como texto con
+    coma decimal ("7,1193"). Primero intenta la conversión numérica directa y
+    solo pasa por texto (strip + coma -> punto) los valores que fallan.
+    """
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series
+
+    if pd.api.types.infer_dtype(series, skipna=True) not in NUMERIC_FIRST_KINDS:
+        # Tipos mezclados (p.ej. booleanos): todo por texto
+        return pd.to_numeric(
+            series.astype(str).str.strip().str.replace(",", ".", regex=False),
+            errors="coerce",
+        )
+
+    numeric = pd.to_numeric(series, errors="coerce")
+    retry = numeric.isna() & series.notna()
+    if retry.any():
+        text = series[retry].astype(str).str.strip().str.replace(",", ".", regex=False)
+        numeric = numeric.astype(float)
+        numeric[retry] = pd.to_numeric(text, errors="coerce")
+    return numeric
+
+
 def clean_latlon(series: pd.Series, is_lat: bool) -> pd.Series:
     """
     Limpia columnas de latitud/longitud:
-        - Intenta convertir a float
-        - Sustituye comas por puntos
+        - Convierte a float (ver parse_decimal; acepta coma decimal)
         - Valores fuera de rango se ponen como null
     """
-    s = (
-        series.astype(str)
-        .str.strip()
-        .replace({"": pd.NA, "nan": pd.NA, "NaN": pd.NA})
-    )
-    s = pd.to_numeric(s.str.replace(",", ".", regex=False), errors="coerce")
+    s = parse_decimal(series)
 
     if is_lat:
         mask_valid = (s >= -90) & (s <= 90)
@@ -128,35 +190,58 @@ def clean_latlon(series: pd.Series, is_lat: bool) -> pd.Series:
     return s
 
 
-def extract_articulo(text: str | float | int | None) -> str | None:
+def as_optional_text(values: pd.Series) -> pd.Series:
+    """Series object donde los nulos son None (como las columnas armadas con listas)."""
+    values = values.astype(object)
+    return values.where(values.notna(), None)
+
+
+def text_values(values: pd.Series) -> pd.Series:
     """
-    Extrae la parte 'ARTICULO XX' de una descripción tipo:
-        'ARTICULO 123. DESCRIPCION...'
+    Los valores que son texto; el resto (números, nulos) queda como NaN, igual
+    que con los métodos `.str` de pandas.
     """
-    if not isinstance(text, str):
-        return None
-
-    t = text.strip().upper()
-    match = re.match(r"(ARTICULO\s+\d+)", t)
-    if match:
-        return match.group(1)
-    return None
+    if not pd.api.types.is_object_dtype(values) and not pd.api.types.is_string_dtype(values):
+        return pd.Series(np.nan, index=values.index, dtype=object)
+    values = values.astype(object)
+    if pd.api.types.infer_dtype(values, skipna=True) != "string":
+        # Columna mixta (o sin texto): `.str` falla si ningún valor es texto
+        is_text = values.map(lambda value: isinstance(value, str)).astype(bool)
+        if not is_text.any():
+            return pd.Series(np.nan, index=values.index, dtype=object)
+        values = values.where(is_text)
+    return values.str.strip()
+
+
+def extract_articulo(values: pd.Series) -> pd.Series:
+    """
+    Extrae la parte 'ARTICULO XX' de descripciones tipo:
+        'ARTICULO 123. DESCRIPCION...' -> 'ARTICULO 123'
+    Valores que no son texto o no empiezan así -> None. Se evalúa una vez por
+    descripción distinta.
+    """
+    articulo = map_unique(
+        values,
+        lambda descriptions: text_values(descriptions).str.upper().str.extract(ARTICULO_RE, expand=False),
+    )
+    return as_optional_text(articulo)
 
 
-def extract_conducta(text: str | float | int | None) -> str | None:
+def extract_conducta(values: pd.Series) -> pd.Series:
     """
-    Extrae la descripción de la conducta desde un texto:
+    Extrae la descripción de la conducta:
         'ARTICULO 123. DESCRIPCION...' -> 'DESCRIPCION...'
+    Si el texto no empieza con 'ARTICULO XX.' se conserva completo; texto
+    vacío o valores que no son texto -> None. Se evalúa una vez por
+    descripción distinta.
     """
-    if not isinstance(text, str):
-        return None
 
-    t = text.strip()
-    # Buscar 'ARTICULO XX. ' y quedarse con lo que viene después
-    match = re.match(r"(?i)ARTICULO\s+\d+\.\s*(.*)", t)
-    if match:
-        return match.group(1).strip()
-    return t if t else None
+    def conducta_from_text(descriptions: pd.Series) -> pd.Series:
+        text = text_values(descriptions)
+        conducta = text.str.extract(CONDUCTA_RE, expand=False).str.strip()
+        return conducta.where(conducta.notna(), text.where(text != ""))
+
+    return as_optional_text(map_unique(values, conducta_from_text))
 
 
 def standardize_column_names(df: pd.DataFrame) -> pd.DataFrame:
@@ -196,16 +281,18 @@ def standardize_column_names(df: pd.DataFrame) -> pd.DataFrame:
 
 def load_and_clean_json(stem: str) -> pd.DataFrame:
     """
-    Lee un JSON Bronze, estandariza nombres de columnas y retorna el DataFrame.
+    Lee un NDJSON Bronze, estandariza nombres de columnas y retorna el DataFrame.
     No aplica filtros de filas, solo limpieza de nombres.
     """
-    input_path = BRONZE_DIR / f"{stem}.json"
+    input_path = BRONZE_DIR / f"{stem}{BRONZE_SUFFIX}"
     check_exists(input_path, label=stem)
 
     print(f"\n➤ Cargando dataset: {stem}")
-    print(f"   Leyendo JSON desde: {input_path}")
+    print(f"   Leyendo NDJSON desde: {input_path}")
 
-    df = pd.read_json(input_path)
+    df = pd.read_json(input_path, lines=True, compression="gzip")
+    # Campos de sistema de Socrata (`:id`, `:updated_at`), solo útiles para la descarga incremental
+    df = df.drop(columns=[col for col in df.columns if str(col).startswith(":")])
 
     print(f"   Registros raw: {len(df):,}")
     print(f"   Columnas raw: {list(df.columns)}")
@@ -221,70 +308,78 @@ def load_and_clean_json(stem: str) -> pd.DataFrame:
 # Transformaciones específicas Bucaramanga
 # =========================================================
 
-def parse_month_label(value) -> int | None:
-    """
-    Convierte un valor tipo '01. ENERO' o 'ENERO' a número de mes.
-    """
-    if pd.isna(value):
-        return None
-
-    s = str(value).strip().upper()
-
-    # Intentar extraer números al inicio
-    match = re.match(r"(\d+)", s)
-    if match:
-        try:
-            return int(match.group(1))
-        except ValueError:
-            pass
-
-    # Si no hay número claro, usar nombre del mes
-    parts = s.split(".")
-    name = parts[-1].strip()
-
-    month_map = {
-        "ENERO": 1,
-        "FEBRERO": 2,
-        "MARZO": 3,
-        "ABRIL": 4,
-        "MAYO": 5,
-        "JUNIO": 6,
-        "JULIO": 7,
-        "AGOSTO": 8,
-        "SEPTIEMBRE": 9,
-        "SETIEMBRE": 9,
-        "OCTUBRE": 10,
-        "NOVIEMBRE": 11,
-        "DICIEMBRE": 12,
-    }
+def month_from_label(labels: pd.Series) -> pd.Series:
+    """
+    Número de mes (Int64) de etiquetas tipo '01. ENERO' o 'ENERO': primero el
+    número al inicio; si no hay, el nombre del mes (lo que va después del
+    último punto).
+    """
+    text = labels.str.strip().str.upper()
+    number = pd.to_numeric(text.str.extract(LEADING_NUMBER_RE, expand=False), errors="coerce")
+    name = text.str.rsplit(".", n=1).str[-1].str.strip()
+    return number.fillna(name.map(MONTH_NUMBERS)).astype("Int64")
+
 
-    return month_map.get(name)
+def parse_month_label(values: pd.Series) -> pd.Series:
+    """Convierte la columna de mes a número (ver month_from_label); nulos -> <NA>."""
+    month = map_unique(values.astype(str), month_from_label)
+    return month.where(values.notna())
 
 
-def split_day_of_week(value) -> tuple[int | None, str | None]:
+def day_order_from_text(labels: pd.Series) -> pd.Series:
+    """Número al inicio de etiquetas tipo '05. VIERNES' (Int64)."""
+    parts = labels.str.strip().str.extract(DAY_OF_WEEK_RE)
+    return pd.to_numeric(parts[0], errors="coerce").astype("Int64")
+
+
+def day_name_from_text(labels: pd.Series) -> pd.Series:
     """
-    Convierte un valor tipo '05. VIERNES' en:
-        (5, 'VIERNES')
+    Nombre del día de etiquetas tipo '05. VIERNES': el texto después del número
+    y los separadores, en mayúsculas. Sin número al inicio, el texto completo.
     """
-    if pd.isna(value):
-        return None, None
+    text = labels.str.strip()
+    parts = text.str.extract(DAY_OF_WEEK_RE)
+    name_after_number = parts[1].str.strip().str.upper().where(parts[1] != "")
+    whole_text = text.str.upper().where(text != "")
+    return name_after_number.where(parts[0].notna(), whole_text)
 
-    s = str(value).strip()
 
-    # Buscar 'numero - texto'
-    match = re.match(r"(\d+)\D+(.*)", s)
-    if not match:
-        return None, s.strip().upper() if s else None
+def split_day_of_week(values: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """
+    Convierte la columna dia_semana ('05. VIERNES') en (orden, nombre):
+        (5, 'VIERNES'); nulos -> (<NA>, None).
+    """
+    text = values.astype(str)
+    missing = values.isna()
+    orden = map_unique(text, day_order_from_text).mask(missing)
+    nombre = map_unique(text, day_name_from_text).mask(missing)
+    return orden, as_optional_text(nombre)
 
-    num = match.group(1)
-    name = match.group(2).strip().upper() if match.group(2) else None
 
-    try:
-        num_int = int(num)
-    except ValueError:
-        num_int = None
+def map_curso_vida(edad: pd.Series) -> pd.Series:
+    """
+    Curso de vida según la edad (se truncan los decimales, como int()).
+    Edades nulas o negativas -> 'NO REPORTA'.
+    """
+    tramo = pd.cut(np.trunc(edad), bins=CURSO_VIDA_BINS, labels=CURSO_VIDA_LABELS)
+    return tramo.astype(object).where(tramo.notna(), CURSO_VIDA_MISSING)
 
-    return num_int, name
+
+def format_hora(values: pd.Series) -> pd.Series:
+    """
+    Normaliza horas a texto HH:MM:SS (dtype string); valores inválidos -> <NA>.
+    La conversión se hace una vez por cada hora distinta.
+    """
+    hora_raw = (
+        values
+        .astype(str)
+        .str.strip()
+        .replace({"": pd.NA, "NaT": pd.NA, "nan": pd.NA})
+    )
+    codes, uniques = pd.factorize(hora_raw, use_na_sentinel=False)
+    dt = pd.to_datetime("1970-01-01 " + pd.Series(uniques, dtype=object).astype(str), errors="coerce")
+    hora_unique = dt.dt.strftime("%H:%M:%S").where(dt.notna(), pd.NA).astype("string")
+    return pd.Series(hora_unique.array.take(codes), index=values.index)
 
 
 def transform_bucaramanga_40(df: pd.DataFrame) -> pd.DataFrame:
@@ -307,20 +402,11 @@ def transform_bucaramanga_40(df: pd.DataFrame) -> pd.DataFrame:
 
     # 2) Mes en texto -> numérico
     if "mes" in df.columns:
-        df["mes"] = df["mes"].apply(parse_month_label).astype("Int64")
+        df["mes"] = parse_month_label(df["mes"])
 
     # 3) dia_semana -> dia_nombre, dia_nombre_orden
     if "dia_semana" in df.columns:
-        dias_orden: list[int | None] = []
-        dias_nombre: list[str | None] = []
-
-        for val in df["dia_semana"]:
-            orden, nombre = split_day_of_week(val)
-            dias_orden.append(orden)
-            dias_nombre.append(nombre)
-
-        df["dia_nombre_orden"] = pd.Series(dias_orden, index=df.index).astype("Int64")
-        df["dia_nombre"] = dias_nombre
+        df["dia_nombre_orden"], df["dia_nombre"] = split_day_of_week(df["dia_semana"])
 
         df = df.drop(columns=["dia_semana"])
 
@@ -336,7 +422,7 @@ def transform_bucaramanga_40(df: pd.DataFrame) -> pd.DataFrame:
 
     # 6) Nueva columna articulo desde descripcion_conducta
     if "descripcion_conducta" in df.columns:
-        df["articulo"] = df["descripcion_conducta"].apply(extract_articulo)
+        df["articulo"] = extract_articulo(df["descripcion_conducta"])
 
     return df
 
@@ -386,8 +472,8 @@ def transform_bucaramanga_150(df: pd.DataFrame) -> pd.DataFrame:
 
     # 3) descripcion_conducta -> conducta + articulo
     if "descripcion_conducta" in df.columns:
-        df["conducta"] = df["descripcion_conducta"].apply(extract_conducta)
-        df["articulo"] = df["descripcion_conducta"].apply(extract_articulo)
+        df["conducta"] = extract_conducta(df["descripcion_conducta"])
+        df["articulo"] = extract_articulo(df["descripcion_conducta"])
 
     # 4) edad "NO DISPONIBLE" -> null
     if "edad" in df.columns:
@@ -398,26 +484,8 @@ def transform_bucaramanga_150(df: pd.DataFrame) -> pd.DataFrame:
         )
         edad_num = pd.to_numeric(df["edad"], errors="coerce")
 
-        # 5) curso_de_vida desde edad
-        def map_curso_vida(age: float | int | None) -> str:
-            if pd.isna(age):
-                return "NO REPORTA"
-            age_int = int(age)
-            if 0 <= age_int <= 6:
-                return "01. PRIMERA INFANCIA"
-            if 7 <= age_int <= 11:
-                return "02. INFANCIA"
-            if 12 <= age_int <= 18:
-                return "03. ADOLESCENCIA"
-            if 19 <= age_int <= 28:
-                return "04. JOVENES"
-            if 29 <= age_int <= 59:
-                return "05. ADULTEZ"
-            if age_int >= 60:
-                return "06. PERSONA MAYOR"
-            return "NO REPORTA"
-
-        df["curso_de_vida"] = edad_num.apply(map_curso_vida)
+        # 5) curso_de_vida desde edad (años cumplidos)
+        df["curso_de_vida"] = map_curso_vida(edad_num)
 
     # 6) Eliminar columnas curso_vida y curso_vida_orden si existen
     cols_to_drop = [c for c in ["curso_vida", "curso_vida_orden"] if c in df.columns]
@@ -429,23 +497,7 @@ def transform_bucaramanga_150(df: pd.DataFrame) -> pd.DataFrame:
         df["fecha"] = normalize_date(df, "fecha")
 
     if "hora" in df.columns:
-        # Normalizar a strings HH:MM:SS, valores inválidos -> <NA>
-        hora_raw = (
-            df["hora"]
-            .astype(str)
-            .str.strip()
-            .replace({"": pd.NA, "NaT": pd.NA, "nan": pd.NA})
-        )
-
-        dt = pd.to_datetime(
-            "1970-01-01 " + hora_raw.astype(str),
-            errors="coerce",
-        )
-
-        hora_out = dt.dt.strftime("%H:%M:%S")
-        # Donde la conversión falló, dejamos como <NA>
-        hora_out = hora_out.where(dt.notna(), pd.NA)
-        df["hora"] = hora_out.astype("string")
+        df["hora"] = format_hora(df["hora"])
 
     return df
 
@@ -517,8 +569,7 @@ def process_bucaramanga() -> None:
         mask_null_art = df_bucaramanga["articulo"].isna()
         if mask_null_art.any():
             df_bucaramanga.loc[mask_null_art, "articulo"] = (
-                df_bucaramanga.loc[mask_null_art, "descripcion_conducta"]
-                .apply(extract_articulo)
+                extract_articulo(df_bucaramanga.loc[mask_null_art, "descripcion_conducta"])
             )
 
     # Eliminar duplicados
@@ -0,0 +1,96 @@
+"""
+03_generate_dim_fecha.py
+========================
+
+Genera la dimensión calendario `dim_fecha` (un día por fila) que usan
+03_process_silver_data.py y 04_generate_dashboard_data.py para agregar los
+atributos temporales de cada evento con un cruce por fecha, en lugar de
+calcular los festivos fila por fila.
+
+Cubre años completos, desde el primer hasta el último año con eventos en los
+datasets Silver.
+
+Entrada:
+    data/silver/policia_scraping/policia_santander.parquet
+    data/silver/delitos/consolidado_delitos.parquet
+    data/silver/socrata_api/delitos_informaticos.parquet
+    data/silver/socrata_api/delitos_bucaramanga.parquet
+
+Salida:
+    data/gold/base/dim_fecha.parquet
+"""
+
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from _calendar import DIM_FECHA_PATH, build_dim_fecha
+
+# === CONFIGURACIÓN DE RUTAS ===
+# Subimos un nivel desde scripts/ para llegar a la raíz del proyecto
+BASE_DIR = Path(__file__).resolve().parent.parent
+SILVER_ROOT = BASE_DIR / "data" / "silver"
+
+# Años aceptados al fijar el rango (descarta años mal digitados, p. ej. 20222)
+MIN_YEAR, MAX_YEAR = 1900, 2100
+
+# Datasets de eventos y sus columnas de fecha / año
+EVENT_INPUTS = {
+    SILVER_ROOT / "policia_scraping" / "policia_santander.parquet": ["fecha"],
+    SILVER_ROOT / "delitos" / "consolidado_delitos.parquet": ["fecha_hecho"],
+    SILVER_ROOT / "socrata_api" / "delitos_informaticos.parquet": ["fecha"],
+    SILVER_ROOT / "socrata_api" / "delitos_bucaramanga.parquet": ["fecha", "anio"],
+}
+
+
+def event_years(path: Path, columns: list[str]) -> pd.Series:
+    """Años con eventos en un dataset Silver (solo lee sus columnas de fecha/año)."""
+    available = [col for col in columns if col in pq.read_schema(path).names]
+    if not available:
+        return pd.Series(dtype="Int64")
+
+    df = pd.read_parquet(path, columns=available)
+    years = []
+    for col in available:
+        if col == "anio":
+            years.append(pd.to_numeric(df[col], errors="coerce"))
+        else:
+            years.append(pd.to_datetime(df[col], errors="coerce").dt.year)
+    years = pd.concat(years, ignore_index=True).dropna().astype("Int64")
+    return years[years.between(MIN_YEAR, MAX_YEAR)]
+
+
+def main() -> None:
+    print("=" * 60)
+    print("03 - DIMENSIÓN CALENDARIO (dim_fecha)")
+    print("=" * 60)
+
+    years = []
+    for path, columns in EVENT_INPUTS.items():
+        if not path.exists():
+            print(f"⚠ No se encontró {path}, se omite.")
+            continue
+        path_years = event_years(path, columns)
+        if not path_years.empty:
+            print(f"✔ {path.name}: {path_years.min()}–{path_years.max()}")
+            years.append(path_years)
+
+    if years:
+        all_years = pd.concat(years, ignore_index=True)
+        first_year, last_year = int(all_years.min()), int(all_years.max())
+    else:
+        first_year = last_year = pd.Timestamp.today().year
+        print("⚠ No se encontraron fechas de eventos; se genera solo el año actual.")
+
+    dim = build_dim_fecha(first_year, last_year)
+
+    DIM_FECHA_PATH.parent.mkdir(parents=True, exist_ok=True)
+    dim.to_parquet(DIM_FECHA_PATH, index=False)
+
+    print(f"\n✔ dim_fecha: {first_year}–{last_year} ({len(dim):,} días, {int(dim['es_festivo'].sum())} festivos)")
+    print(f"   Guardado en: {DIM_FECHA_PATH}")
+
+
+if __name__ == "__main__":
+    main()
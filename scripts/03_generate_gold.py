@@ -1,3 +1,19 @@
+"""
+03_generate_gold.py
+===================
+
+Integra los datasets Gold/base en una única tabla municipio-año-mes.
+
+Entrada:
+    data/gold/base/geo_gold.parquet
+    data/gold/base/policia_gold.parquet
+    data/gold/base/poblacion_gold.parquet
+    data/gold/base/divipola_gold.parquet
+
+Salida:
+    data/gold/gold_integrado.parquet
+"""
+
 from pathlib import Path
 
 import pandas as pd
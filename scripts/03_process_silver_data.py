@@ -1,3 +1,26 @@
+"""
+03_process_silver_data.py
+=========================
+
+Limpia los datasets Silver y los exporta a la capa Gold/base. Complementa los
+datos de Policía con el consolidado de Socrata donde faltan años/delitos.
+
+Entrada:
+    data/gold/base/dim_fecha.parquet
+    data/silver/dane_geo/geografia_silver.parquet
+    data/silver/policia_scraping/policia_santander.parquet
+    data/silver/delitos/consolidado_delitos.parquet
+    data/silver/poblacion/poblacion_santander.parquet
+    data/silver/dane_geo/divipola_silver.parquet
+
+Salida:
+    data/gold/base/geo_gold.parquet
+    data/gold/base/policia_gold.parquet
+    data/gold/base/socrata_gold.parquet
+    data/gold/base/poblacion_gold.parquet
+    data/gold/base/divipola_gold.parquet
+"""
+
 from pathlib import Path
 import sys
 
@@ -5,7 +28,10 @@ import pandas as pd
 import geopandas as gpd
 import numpy as np
 from shapely.geometry import Polygon, MultiPolygon
-import holidays
+
+from _calendar import add_calendar_features, load_dim_fecha
+from _categorical import categorical_transform, strip_upper
+from _dane import municipality_code_from_dane
 
 # === CONFIGURACIÓN DE RUTAS ===
 # Subimos un nivel desde scripts/ para llegar a la raíz del proyecto
@@ -70,14 +96,16 @@ def load_silver() -> tuple[gpd.GeoDataFrame, pd.DataFrame, pd.DataFrame, pd.Data
 # Limpieza de cada dataset
 
 def clean_names(df: pd.DataFrame, cols: list[str] = ["municipio", "departamento"]) -> pd.DataFrame:
+    """
+    Nombres y categorías en mayúsculas, sin espacios en los extremos y como
+    columna categórica (nulos -> NaN). La limpieza se aplica solo a los
+    valores distintos.
+    """
     for c in cols:
         if c in df.columns:
-            df[c] = (
-                df[c]
-                .astype(str)
-                .str.strip()
-                .str.upper()
-                .replace({"NAN": np.nan})
+            df[c] = categorical_transform(
+                df[c].astype(str),
+                lambda names: strip_upper(names).replace({"NAN": np.nan}),
             )
     return df
 
@@ -100,19 +128,9 @@ def clean_geo(geo: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     return geo
 
 
-def clean_policia(df: pd.DataFrame) -> pd.DataFrame:
-
-    df["codigo_dane"] = df["codigo_dane"].astype(str).str.strip()
-
-    df["codigo_dane"] = df["codigo_dane"].apply(
-        lambda x: x[:-3] if isinstance(x, str) and len(x) > 3 else x
-    )
-
-    df["codigo_dane"] = df["codigo_dane"].str.replace(r"\D+", "", regex=True)
+def clean_policia(df: pd.DataFrame, dim_fecha: pd.DataFrame | None = None) -> pd.DataFrame:
 
-    df["codigo_municipio"] = pd.to_numeric(
-        df["codigo_dane"], errors="coerce"
-    ).astype("Int64")
+    df["codigo_municipio"] = municipality_code_from_dane(df["codigo_dane"])
 
     df = clean_names(df)
 
@@ -120,46 +138,12 @@ def clean_policia(df: pd.DataFrame) -> pd.DataFrame:
     if "fecha" in df.columns:
         df["fecha"] = pd.to_datetime(df["fecha"], errors="coerce")
 
-        df["anio"] = df["fecha"].dt.year.astype("Int64")
-        df["mes"] = df["fecha"].dt.month.astype("Int64")
-        df["dia"] = df["fecha"].dt.day.astype("Int64")
-
-        # --- Día de la semana y fin de semana ---
-        dia_semana = df["fecha"].dt.dayofweek
-        df["es_dia_semana"] = (dia_semana < 5).fillna(False).astype(int)
-        df["es_fin_de_semana"] = (dia_semana >= 5).fillna(False).astype(int)
-
-        # --- Fin de mes ---
-        df["es_fin_mes"] = (df["dia"] == df["fecha"].dt.days_in_month).fillna(False).astype(int)
-
-        # --- Festivos colombianos ---
-        anios = df["anio"].dropna().unique().tolist()
-        if anios:
-            col_holidays = holidays.Colombia(years=[int(a) for a in anios])
-            df["es_festivo"] = df["fecha"].apply(
-                lambda x: 1 if pd.notna(x) and x in col_holidays else 0
-            )
-            df["nombre_festivo"] = df["fecha"].apply(
-                lambda x: col_holidays.get(x, None) if pd.notna(x) else None
-            )
-        else:
-            df["es_festivo"] = 0
-            df["nombre_festivo"] = None
-
-        # --- Día laboral (día de semana y no festivo) ---
-        df["es_dia_laboral"] = ((df["es_dia_semana"] == 1) & (df["es_festivo"] == 0)).astype(int)
+        # --- Atributos de calendario (año, mes, día, fin de semana, fin de mes,
+        #     festivos y día laboral) desde dim_fecha ---
+        df = add_calendar_features(df, "fecha", dim_fecha)
 
     # categorías
-    for col in ["genero", "armas_medios", "delito", "edad_persona"]:
-        if col in df.columns:
-            df[col] = (
-                df[col]
-                .astype(str)
-                .str.strip()
-                .str.upper()
-                .replace({"NAN": np.nan})
-                .astype("category")
-            )
+    df = clean_names(df, ["genero", "armas_medios", "delito", "edad_persona"])
 
     # eliminar campo viejo
     df = df.drop(columns=["codigo_dane"], errors="ignore")
@@ -181,7 +165,7 @@ def clean_divipola(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def clean_socrata(df: pd.DataFrame) -> pd.DataFrame:
+def clean_socrata(df: pd.DataFrame, dim_fecha: pd.DataFrame | None = None) -> pd.DataFrame:
     """
     Limpia y estandariza el consolidado de delitos de Socrata.
     Normaliza columnas para que sean compatibles con policia_gold.
@@ -206,46 +190,12 @@ def clean_socrata(df: pd.DataFrame) -> pd.DataFrame:
     if "fecha" in df.columns:
         df["fecha"] = pd.to_datetime(df["fecha"], errors="coerce")
 
-        df["anio"] = df["fecha"].dt.year.astype("Int64")
-        df["mes"] = df["fecha"].dt.month.astype("Int64")
-        df["dia"] = df["fecha"].dt.day.astype("Int64")
-
-        # --- Día de la semana y fin de semana ---
-        dia_semana = df["fecha"].dt.dayofweek
-        df["es_dia_semana"] = (dia_semana < 5).fillna(False).astype(int)
-        df["es_fin_de_semana"] = (dia_semana >= 5).fillna(False).astype(int)
-
-        # --- Fin de mes ---
-        df["es_fin_mes"] = (df["dia"] == df["fecha"].dt.days_in_month).fillna(False).astype(int)
-
-        # --- Festivos colombianos ---
-        anios = df["anio"].dropna().unique().tolist()
-        if anios:
-            col_holidays = holidays.Colombia(years=[int(a) for a in anios])
-            df["es_festivo"] = df["fecha"].apply(
-                lambda x: 1 if pd.notna(x) and x in col_holidays else 0
-            )
-            df["nombre_festivo"] = df["fecha"].apply(
-                lambda x: col_holidays.get(x, None) if pd.notna(x) else None
-            )
-        else:
-            df["es_festivo"] = 0
-            df["nombre_festivo"] = None
-
-        # --- Día laboral (día de semana y no festivo) ---
-        df["es_dia_laboral"] = ((df["es_dia_semana"] == 1) & (df["es_festivo"] == 0)).astype(int)
+        # --- Atributos de calendario (año, mes, día, fin de semana, fin de mes,
+        #     festivos y día laboral) desde dim_fecha ---
+        df = add_calendar_features(df, "fecha", dim_fecha)
 
     # Categorías
-    for col in ["genero", "armas_medios", "delito"]:
-        if col in df.columns:
-            df[col] = (
-                df[col]
-                .astype(str)
-                .str.strip()
-                .str.upper()
-                .replace({"NAN": np.nan})
-                .astype("category")
-            )
+    df = clean_names(df, ["genero", "armas_medios", "delito"])
 
     # Agregar columna origen para trazabilidad
     df["origen"] = "SOCRATA"
@@ -380,16 +330,17 @@ def prepare_silver_to_gold() -> None:
 
     print("Cargando datos Silver…")
     geo, policia, socrata, poblacion, divipola = load_silver()
+    dim_fecha = load_dim_fecha()
 
     print("Limpiando Geografia…")
     geo = clean_geo(geo)
 
     print("Limpiando Policía (scraping)…")
-    policia = clean_policia(policia)
+    policia = clean_policia(policia, dim_fecha)
     policia["origen"] = "SCRAPING"  # Agregar origen para trazabilidad
 
     print("Limpiando Socrata (consolidado delitos)…")
-    socrata = clean_socrata(socrata)
+    socrata = clean_socrata(socrata, dim_fecha)
 
     print("Limpiando Población…")
     poblacion = clean_poblacion(poblacion)
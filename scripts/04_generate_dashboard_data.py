@@ -4,6 +4,9 @@
 
 Genera los datasets de la capa GOLD específicos para el dashboard.
 
+Entrada (Gold base):
+    - data/gold/base/dim_fecha.parquet
+
 Entrada (Silver):
     - data/silver/dane_geo/geografia_silver.parquet
     - data/silver/metas/*.parquet
@@ -30,7 +33,9 @@ from typing import Tuple
 import pandas as pd
 import geopandas as gpd
 import numpy as np
-import holidays
+
+from _calendar import add_calendar_features, load_dim_fecha
+from _categorical import categorical_transform, strip_upper
 
 
 # ============================================================
@@ -88,9 +93,10 @@ def add_temporal_features(
     df: pd.DataFrame,
     date_col: str = "fecha",
     prefix_log: str = "",
+    dim_fecha: pd.DataFrame | None = None,
 ) -> pd.DataFrame:
     """
-    A partir de una columna de fecha, agrega:
+    A partir de una columna de fecha y la dimensión calendario `dim_fecha`, agrega:
         - anio, mes, dia
         - es_dia_semana, es_fin_de_semana
         - es_fin_mes
@@ -107,37 +113,8 @@ def add_temporal_features(
 
     df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
 
-    # anio, mes, dia
-    df["anio"] = df[date_col].dt.year.astype("Int64")
-    df["mes"] = df[date_col].dt.month.astype("Int64")
-    df["dia"] = df[date_col].dt.day.astype("Int64")
-
-    # Día de la semana (0 = lunes, 6 = domingo)
-    dia_semana = df[date_col].dt.dayofweek
-    df["es_dia_semana"] = (dia_semana < 5).astype("Int64")
-    df["es_fin_de_semana"] = (dia_semana >= 5).astype("Int64")
-
-    # Fin de mes
-    df["es_fin_mes"] = (df["dia"] == df[date_col].dt.days_in_month).astype("Int64")
-
-    # Festivos colombianos
-    years = df["anio"].dropna().unique().tolist()
-    if years:
-        co_holidays = holidays.Colombia(years=[int(y) for y in years])
-        df["es_festivo"] = df[date_col].apply(
-            lambda x: 1 if pd.notna(x) and x in co_holidays else 0
-        ).astype("Int64")
-        df["nombre_festivo"] = df[date_col].apply(
-            lambda x: co_holidays.get(x, None) if pd.notna(x) else None
-        )
-    else:
-        df["es_festivo"] = 0
-        df["nombre_festivo"] = None
-
-    # Día laboral: día de semana y no festivo
-    df["es_dia_laboral"] = (
-        (df["es_dia_semana"] == 1) & (df["es_festivo"] == 0)
-    ).astype("Int64")
+    # Un solo cruce por fecha con la dimensión calendario
+    df = add_calendar_features(df, date_col, dim_fecha, flag_dtype="Int64")
 
     return df
 
@@ -211,7 +188,7 @@ def process_poblacion() -> None:
     save_parquet(df, POBLACION_OUTPUT)
 
 
-def process_policia() -> None:
+def process_policia(dim_fecha: pd.DataFrame | None = None) -> None:
     """
     Procesa data/silver/policia_scraping/policia_santander.parquet:
         - Normaliza codigo_municipio a Int64
@@ -231,12 +208,12 @@ def process_policia() -> None:
             pd.to_numeric(df["codigo_municipio"], errors="coerce").astype("Int64")
         )
 
-    df = add_temporal_features(df, date_col="fecha", prefix_log="   ")
+    df = add_temporal_features(df, date_col="fecha", prefix_log="   ", dim_fecha=dim_fecha)
 
     save_parquet(df, POLICIA_OUTPUT)
 
 
-def process_delitos_informaticos() -> None:
+def process_delitos_informaticos(dim_fecha: pd.DataFrame | None = None) -> None:
     """
     Procesa data/silver/socrata_api/delitos_informaticos.parquet:
         - Agrega columnas temporales basadas en 'fecha'
@@ -249,7 +226,7 @@ def process_delitos_informaticos() -> None:
     check_exists(DELITOS_INF_INPUT, "delitos_informaticos")
     df = pd.read_parquet(DELITOS_INF_INPUT)
 
-    df = add_temporal_features(df, date_col="fecha", prefix_log="   ")
+    df = add_temporal_features(df, date_col="fecha", prefix_log="   ", dim_fecha=dim_fecha)
 
     save_parquet(df, DELITOS_INF_OUTPUT)
 
@@ -382,7 +359,7 @@ def map_delito_bucaramanga(valor: str) -> str:
     return v
 
 
-def process_delitos_bucaramanga() -> None:
+def process_delitos_bucaramanga(dim_fecha: pd.DataFrame | None = None) -> None:
     """
     Procesa data/silver/socrata_api/delitos_bucaramanga.parquet:
 
@@ -401,7 +378,9 @@ def process_delitos_bucaramanga() -> None:
     df = pd.read_parquet(DELITOS_BUCA_INPUT).copy()
 
     if "delito" in df.columns:
-        df["delito"] = df["delito"].astype(str).str.strip().str.upper()
+        # delito tiene pocos valores distintos: la limpieza y la clasificación
+        # se aplican una vez por valor y la columna queda categórica
+        df["delito"] = categorical_transform(df["delito"].astype(str), strip_upper)
 
         mask_drop = (
             df["delito"].str.contains("NO REPORTA", case=False, na=False)
@@ -413,7 +392,10 @@ def process_delitos_bucaramanga() -> None:
         removed = before - len(df)
         print(f"   Registros eliminados por NO REPORTA / OMISIÓN DE DENUNCIA: {removed:,}")
 
-        df["delito"] = df["delito"].apply(map_delito_bucaramanga)
+        df["delito"] = categorical_transform(
+            df["delito"],
+            lambda delitos: delitos.map(map_delito_bucaramanga),
+        )
     else:
         print("   ⚠ La tabla delitos_bucaramanga no tiene columna 'delito'.")
 
@@ -435,7 +417,7 @@ def process_delitos_bucaramanga() -> None:
 
     df["fecha"] = fecha
 
-    df = add_temporal_features(df, date_col="fecha", prefix_log="   ")
+    df = add_temporal_features(df, date_col="fecha", prefix_log="   ", dim_fecha=dim_fecha)
 
     save_parquet(df, DELITOS_BUCA_OUTPUT)
 
@@ -452,9 +434,10 @@ def main() -> None:
     process_municipios()
     process_metas()
     process_poblacion()
-    process_policia()
-    process_delitos_informaticos()
-    process_delitos_bucaramanga()
+    dim_fecha = load_dim_fecha()
+    process_policia(dim_fecha)
+    process_delitos_informaticos(dim_fecha)
+    process_delitos_bucaramanga(dim_fecha)
 
     print("\n" + "=" * 60)
     print("✔ Generación de datos para dashboard completada")
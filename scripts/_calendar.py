@@ -0,0 +1,137 @@
+"""
+_calendar.py
+============
+
+Dimensión calendario (`dim_fecha`) y enriquecimiento temporal de eventos.
+
+`dim_fecha` tiene una fila por día con todos los atributos de calendario que
+usan las capas Gold y dashboard (año, mes, día, día de la semana, fin de
+semana, fin de mes, festivo colombiano y día laboral). La genera una vez por
+ejecución 03_generate_dim_fecha.py en `data/gold/base/dim_fecha.parquet`.
+
+`add_calendar_features` agrega esos atributos a una tabla de eventos con un
+solo cruce por la fecha (sin la hora). Si alguna fecha queda fuera de la
+dimensión, la dimensión se amplía en memoria para cubrirla.
+"""
+
+from pathlib import Path
+
+import holidays
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DIM_FECHA_PATH = BASE_DIR / "data" / "gold" / "base" / "dim_fecha.parquet"
+
+# Atributos que se agregan a cada evento (en este orden)
+CALENDAR_FEATURES = [
+    "anio",
+    "mes",
+    "dia",
+    "es_dia_semana",
+    "es_fin_de_semana",
+    "es_fin_mes",
+    "es_festivo",
+    "nombre_festivo",
+    "es_dia_laboral",
+]
+
+# Columnas de dim_fecha (en este orden)
+DIM_FECHA_COLUMNS = ["fecha", "anio", "mes", "dia", "dia_semana"] + CALENDAR_FEATURES[3:]
+
+# Atributos enteros (0/1); los eventos sin fecha quedan en 0
+CALENDAR_FLAGS = [
+    "es_dia_semana",
+    "es_fin_de_semana",
+    "es_fin_mes",
+    "es_festivo",
+    "es_dia_laboral",
+]
+
+
+def build_dim_fecha(first_year: int, last_year: int) -> pd.DataFrame:
+    """
+    Construye la dimensión calendario con un día por fila, desde el 1 de enero
+    de `first_year` hasta el 31 de diciembre de `last_year`.
+    """
+    fechas = pd.date_range(f"{first_year}-01-01", f"{last_year}-12-31", freq="D")
+
+    co_holidays = holidays.Colombia(years=range(first_year, last_year + 1))
+    holiday_names = pd.Series(
+        {pd.Timestamp(day): name for day, name in co_holidays.items()},
+        dtype=object,
+    )
+
+    dim = pd.DataFrame({"fecha": fechas})
+    fecha = dim["fecha"].dt
+    dim["anio"] = fecha.year.astype("Int64")
+    dim["mes"] = fecha.month.astype("Int64")
+    dim["dia"] = fecha.day.astype("Int64")
+    dim["dia_semana"] = fecha.dayofweek.astype("Int64")  # 0 = lunes, 6 = domingo
+    dim["es_dia_semana"] = (dim["dia_semana"] < 5).astype("Int64")
+    dim["es_fin_de_semana"] = (dim["dia_semana"] >= 5).astype("Int64")
+    dim["es_fin_mes"] = fecha.is_month_end.astype("Int64")
+
+    nombre = holiday_names.reindex(fechas).to_numpy()
+    dim["nombre_festivo"] = np.where(pd.isna(nombre), None, nombre)
+    dim["es_festivo"] = dim["nombre_festivo"].notna().astype("Int64")
+    dim["es_dia_laboral"] = ((dim["es_dia_semana"] == 1) & (dim["es_festivo"] == 0)).astype("Int64")
+
+    return dim[DIM_FECHA_COLUMNS]
+
+
+def year_bounds(keys: pd.Series) -> tuple[int, int]:
+    """Primer y último año de las fechas `keys` (el año actual si no hay ninguna)."""
+    if keys.notna().any():
+        return keys.min().year, keys.max().year
+    today = pd.Timestamp.today()
+    return today.year, today.year
+
+
+def load_dim_fecha(path: Path = DIM_FECHA_PATH) -> pd.DataFrame | None:
+    """Lee la dimensión calendario generada en esta ejecución, o None si no existe."""
+    if not path.exists():
+        print(f"⚠ No se encontró {path}; la dimensión calendario se construirá en memoria.")
+        return None
+    return pd.read_parquet(path)
+
+
+def add_calendar_features(
+    df: pd.DataFrame,
+    date_col: str = "fecha",
+    dim: pd.DataFrame | None = None,
+    flag_dtype: str = "int64",
+) -> pd.DataFrame:
+    """
+    Agrega a `df` los atributos de CALENDAR_FEATURES cruzando `df[date_col]`
+    (datetime) con la dimensión calendario `dim`.
+
+    - anio, mes, dia: Int64 (<NA> si el evento no tiene fecha).
+    - banderas es_*: `flag_dtype` (0 si el evento no tiene fecha).
+    - nombre_festivo: texto o None.
+    """
+    keys = df[date_col].dt.normalize()
+
+    if dim is None:
+        dim = build_dim_fecha(*year_bounds(keys))
+
+    positions = pd.Index(dim["fecha"]).get_indexer(keys)
+    uncovered = (positions == -1) & keys.notna().to_numpy()
+    if uncovered.any():
+        print(f"⚠ {int(uncovered.sum()):,} fechas fuera de dim_fecha; se amplía la dimensión en memoria.")
+        first_year, last_year = year_bounds(keys)
+        dim = build_dim_fecha(
+            min(int(dim["anio"].min()), first_year),
+            max(int(dim["anio"].max()), last_year),
+        )
+        positions = pd.Index(dim["fecha"]).get_indexer(keys)
+
+    for col in CALENDAR_FEATURES:
+        values = pd.Series(dim[col].array.take(positions, allow_fill=True), index=df.index)
+        if col in CALENDAR_FLAGS:
+            values = values.fillna(0).astype(flag_dtype)
+        elif col == "nombre_festivo":
+            values = values.astype(object).where(values.notna(), None)
+        df[col] = values
+
+    return df
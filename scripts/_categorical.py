@@ -0,0 +1,71 @@
+"""
+_categorical.py
+===============
+
+Evaluación por valores distintos para columnas con pocos valores diferentes
+(códigos, meses, días, descripciones de delitos, ...).
+
+`map_unique(values, transform)` factoriza la columna, aplica `transform` solo
+a los valores distintos y reconstruye la columna completa con un `take`. El
+costo de la transformación pasa de depender del número de filas a depender del
+número de valores distintos.
+
+`categorical_transform(values, transform)` hace lo mismo pero devuelve la
+columna como `Categorical`: las categorías son los resultados distintos de
+`transform` y la columna solo guarda un código por fila (en Parquet se escribe
+como columna de diccionario). Se usa para la limpieza de nombres y categorías
+(municipio, delito, armas_medios, genero, edad_persona, ...).
+
+Al factorizar, los valores iguales para Python se agrupan aunque sean de tipos
+distintos (1, 1.0 y True son el mismo valor). Si `transform` depende de
+`str(valor)`, conviene factorizar el texto (`values.astype(str)`).
+"""
+
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+
+def factorize(values: pd.Series) -> tuple[np.ndarray, pd.Index]:
+    """
+    Códigos por fila (-1 para nulos) y valores distintos de `values`. En una
+    columna categórica son sus códigos y sus categorías, sin factorizar de nuevo.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    codes, uniques = pd.factorize(values)
+    return codes, pd.Index(uniques)
+
+
+def map_unique(values: pd.Series, transform: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """
+    Aplica `transform` (una función vectorizada) solo a los valores distintos
+    de `values` y reconstruye la Series completa. Los nulos quedan nulos.
+    """
+    codes, uniques = factorize(values)
+    mapped = transform(pd.Series(uniques)).array
+    return pd.Series(mapped.take(codes, allow_fill=True), index=values.index, name=values.name)
+
+
+def categorical_transform(values: pd.Series, transform: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """
+    Aplica `transform` solo a los valores distintos de `values` y devuelve la
+    columna como Categorical. Los nulos, y los valores que `transform` deja
+    nulos, quedan nulos.
+    """
+    codes, uniques = factorize(values)
+    mapped = pd.Series(transform(pd.Series(uniques)).array)
+    mapped_codes, categories = pd.factorize(mapped)
+    # El -1 de los nulos de `values` también indexa el último elemento: nulo
+    codes = np.append(mapped_codes, -1)[codes]
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=categories),
+        index=values.index,
+        name=values.name,
+    )
+
+
+def strip_upper(labels: pd.Series) -> pd.Series:
+    """Texto sin espacios en los extremos y en mayúsculas."""
+    return labels.str.strip().str.upper()
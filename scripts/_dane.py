@@ -0,0 +1,90 @@
+"""
+_dane.py
+========
+
+Normalización de códigos DANE (DIVIPOLA) de municipio y departamento,
+compartida por las etapas Silver y Gold.
+
+Todas las funciones reciben y devuelven Series completas, sin llamadas de
+Python por fila: los valores se factorizan y las operaciones `.str` de pandas
+se aplican solo a los códigos distintos (unos pocos miles frente a cientos de
+miles de filas). Sirven igual para columnas object que para `string` /
+`string[pyarrow]` (el tipo de la salida sigue al de la entrada).
+
+Ejemplos de códigos en las fuentes:
+    "68755000"   código de 8 dígitos de la Policía (municipio + "000")
+    "68755.0"    código leído como número decimal
+    68755        código numérico
+"""
+
+import pandas as pd
+
+from _categorical import map_unique
+
+# Código que se asigna cuando el municipio no viene informado
+MISSING_MUNICIPALITY_CODE = "00000"
+
+# Largos de los códigos DIVIPOLA
+MUNICIPALITY_CODE_LENGTH = 5
+DEPARTMENT_CODE_LENGTH = 2
+
+
+def as_text(values: pd.Series) -> pd.Series:
+    """
+    Convierte los valores a texto como lo haría `str(valor)`. Las columnas de
+    texto se dejan en su tipo (object con solo strings, string, string[pyarrow]).
+    """
+    if pd.api.types.is_string_dtype(values.dtype) and values.dtype != object:
+        return values
+    return values.astype(str)
+
+
+def normalize_cod_muni(values: pd.Series) -> pd.Series:
+    """
+    Normaliza códigos de municipio a 5 dígitos.
+
+    Por cada valor:
+        - nulo -> "00000"
+        - texto sin espacios en los extremos
+        - sin la parte decimal ("68755.0" -> "68755")
+        - solo los primeros 5 caracteres ("68755000" -> "68755")
+        - relleno con ceros a la izquierda ("5001" -> "05001")
+    """
+    missing = values.isna()
+    codes = map_unique(
+        as_text(values),
+        lambda codes: codes.str.strip()
+        .str.replace(r"\.[\s\S]*", "", regex=True)
+        .str.slice(0, MUNICIPALITY_CODE_LENGTH)
+        .str.zfill(MUNICIPALITY_CODE_LENGTH),
+    )
+    return codes.where(~missing, MISSING_MUNICIPALITY_CODE)
+
+
+def department_code(cod_muni: pd.Series) -> pd.Series:
+    """Código de departamento: primeros 2 dígitos del código de municipio."""
+    if cod_muni.dtype != object:
+        # string / string[pyarrow]: el recorte ya es vectorizado (sin Python por fila)
+        return cod_muni.str.slice(0, DEPARTMENT_CODE_LENGTH)
+    return map_unique(cod_muni, lambda codes: codes.str.slice(0, DEPARTMENT_CODE_LENGTH))
+
+
+def dane_digits(codes: pd.Series) -> pd.Series:
+    """Quita el sufijo de 3 caracteres de los códigos DANE largos y deja solo dígitos."""
+    codes = codes.str.strip()
+    short = (codes.str.len() <= 3).fillna(True)
+    codes = codes.where(short, codes.str.slice(0, -3))
+    return codes.str.replace(r"\D+", "", regex=True)
+
+
+def municipality_code_from_dane(values: pd.Series) -> pd.Series:
+    """
+    Código de municipio entero (Int64) a partir del `codigo_dane` de la Policía:
+    quita los 3 últimos caracteres a los códigos de más de 3 ("68755000" ->
+    "68755"), descarta lo que no sea dígito y convierte a número (lo que no se
+    pueda convertir queda como <NA>).
+    """
+    return map_unique(
+        as_text(values),
+        lambda codes: pd.to_numeric(dane_digits(codes), errors="coerce").astype("Int64"),
+    )
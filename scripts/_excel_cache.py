@@ -0,0 +1,137 @@
+"""
+_excel_cache.py
+===============
+
+Caché de hojas de cálculo Bronze ya leídas. Leer Excel es el paso de CPU más
+lento del pipeline y los archivos (Policía, DIVIPOLA, metas) casi nunca cambian.
+
+`read_cached(path, parser_version, reader)` devuelve el DataFrame que produce
+`reader(path)`, guardado en `.cache/excel/` bajo una clave que combina:
+    - el sha256 del contenido del archivo,
+    - `parser_version` (cambiarla al modificar la lectura),
+    - la versión de pandas.
+
+Cada entrada se guarda en Parquet cuando el DataFrame vuelve idéntico (mismos
+tipos y valores) al leerlo de nuevo; si no (p. ej. columnas object que mezclan
+números y texto, frecuentes en hojas sin procesar) se guarda con pickle.
+
+Variables de entorno:
+    EXCEL_CACHE      "0" desactiva la caché.
+    EXCEL_CACHE_DIR  Carpeta de la caché (por defecto `.cache/excel/`).
+"""
+
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+EXCEL_CACHE_ENABLED = os.environ.get("EXCEL_CACHE", "1") != "0"
+EXCEL_CACHE_DIR = Path(os.environ.get("EXCEL_CACHE_DIR", BASE_DIR / ".cache" / "excel"))
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: Path) -> str:
+    """Checksum sha256 del contenido de un archivo, leído por bloques."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def entry_prefix(path: Path) -> str:
+    """Prefijo de las entradas de un archivo (su ruta, apta como nombre de archivo)."""
+    try:
+        name = path.resolve().relative_to(BASE_DIR).as_posix()
+    except ValueError:
+        name = path.resolve().as_posix()
+    return re.sub(r"[^0-9A-Za-z._-]+", "_", name).strip("_")
+
+
+def restore_missing(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Parquet guarda los NaN de columnas object como nulos que se leen como None;
+    read_excel siempre produce NaN, así que se restauran.
+    """
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
+
+
+def load_entry(entry: Path) -> pd.DataFrame:
+    """Lee una entrada de la caché (Parquet o pickle)."""
+    if entry.suffix == ".parquet":
+        return restore_missing(pd.read_parquet(entry))
+    return pd.read_pickle(entry)
+
+
+def store_entry(df: pd.DataFrame, prefix: str, key: str) -> Path:
+    """
+    Guarda `df` en Parquet si el resultado es idéntico al leerlo de nuevo; si
+    no, en pickle. Borra las entradas anteriores del mismo archivo.
+    """
+    EXCEL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    for old in EXCEL_CACHE_DIR.glob(f"{prefix}.{'?' * len(key)}.*"):
+        old.unlink(missing_ok=True)
+
+    entry = EXCEL_CACHE_DIR / f"{prefix}.{key}.parquet"
+    tmp_path = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+    try:
+        df.to_parquet(tmp_path, index=True)
+        back = restore_missing(pd.read_parquet(tmp_path))
+        exact = list(back.dtypes) == list(df.dtypes) and back.equals(df) and back.index.equals(df.index)
+    except (ValueError, TypeError, NotImplementedError):
+        exact = False
+
+    if not exact:
+        tmp_path.unlink(missing_ok=True)
+        entry = entry.with_suffix(".pkl")
+        tmp_path = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        df.to_pickle(tmp_path)
+
+    tmp_path.replace(entry)
+    return entry
+
+
+def read_cached(
+    path: Path,
+    parser_version: str,
+    reader: Callable[[Path], pd.DataFrame],
+) -> pd.DataFrame:
+    """
+    Retorna `reader(path)`, reutilizando el resultado guardado si el contenido
+    de `path` y `parser_version` no cambiaron.
+    """
+    if not EXCEL_CACHE_ENABLED:
+        return reader(path)
+
+    prefix = entry_prefix(path)
+    key_source = f"{file_sha256(path)}|{parser_version}|pandas-{pd.__version__}"
+    key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()[:16]
+
+    for suffix in (".parquet", ".pkl"):
+        entry = EXCEL_CACHE_DIR / f"{prefix}.{key}{suffix}"
+        if not entry.exists():
+            continue
+        try:
+            df = load_entry(entry)
+        except Exception as exc:  # noqa: BLE001
+            print(f"   ⚠️ Entrada de caché ilegible ({exc}), se vuelve a leer el Excel")
+            entry.unlink(missing_ok=True)
+            break
+        print(f"   • Leído desde caché: {entry.name}")
+        return df
+
+    df = reader(path)
+    try:
+        store_entry(df, prefix, key)
+    except OSError as exc:
+        print(f"   ⚠️ No se pudo guardar en caché {path.name}: {exc}")
+    return df
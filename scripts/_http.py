@@ -0,0 +1,228 @@
+"""
+_http.py
+========
+
+Capa HTTP compartida por los scripts de extracción Bronze, con caché en disco.
+
+Todas las descargas pasan por `cached_get`, que decide según HTTP_CACHE_MODE
+si la respuesta sale de la red, de la caché o de ambas:
+
+    off      Sin caché: siempre a la red, no se guarda nada.
+    cache    (por defecto) Respuestas con TTL > 0 se guardan y se reutilizan
+             mientras estén vigentes. Con TTL 0 se comporta como `off`.
+    record   Siempre a la red y se guardan todas las respuestas 200. Las
+             cabeceras condicionales se omiten para grabar respuestas completas.
+    replay   Sin red: todo sale de la caché, sin importar su antigüedad; una
+             petición no grabada es un error. Alias: `offline`.
+
+Variables de entorno:
+    HTTP_CACHE_MODE  Modo (ver arriba).
+    HTTP_CACHE_DIR   Carpeta de la caché (por defecto `.cache/http/`).
+    HTTP_CACHE_TTL   TTL en segundos para todas las peticiones; si no se
+                     define, cada llamada usa su propio `ttl`.
+
+Flujo típico: `HTTP_CACHE_MODE=record` en una ejecución real y después
+`HTTP_CACHE_MODE=replay` para repetir la ingesta (desarrollo, CI o medir el
+rendimiento de Bronze) con exactamente las mismas respuestas y sin red.
+
+La clave de caché es la URL con sus parámetros; las cabeceras condicionales
+(`If-None-Match`, `Range`, ...) no forman parte de ella y una respuesta servida
+desde la caché es siempre la respuesta completa (200).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import AbstractContextManager, ExitStack
+from pathlib import Path
+from typing import Callable
+from urllib.parse import urlencode
+
+import requests
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+HTTP_CACHE_MODE = os.environ.get("HTTP_CACHE_MODE", "cache").lower()
+HTTP_CACHE_DIR = Path(os.environ.get("HTTP_CACHE_DIR", BASE_DIR / ".cache" / "http"))
+HTTP_CACHE_TTL = os.environ.get("HTTP_CACHE_TTL")
+
+CACHE_MODES = {"off", "cache", "record", "replay", "offline"}
+if HTTP_CACHE_MODE not in CACHE_MODES:
+    raise ValueError(f"HTTP_CACHE_MODE inválido: {HTTP_CACHE_MODE!r} (opciones: {sorted(CACHE_MODES)})")
+
+# Cabeceras de la respuesta que se conservan en la caché
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+# Cabeceras de la petición que cambian la respuesta pero no forman parte de la clave
+CONDITIONAL_HEADERS = {"If-None-Match", "If-Modified-Since", "If-Range", "Range"}
+
+_STATS_LOCK = threading.Lock()
+_STATS = {"hits": 0, "misses": 0, "stored": 0}
+
+
+def is_replay() -> bool:
+    """True si las peticiones deben salir exclusivamente de la caché."""
+    return HTTP_CACHE_MODE in {"replay", "offline"}
+
+
+def effective_ttl(ttl: float) -> float:
+    """TTL aplicable: HTTP_CACHE_TTL si está definido, si no el de la llamada."""
+    return float(HTTP_CACHE_TTL) if HTTP_CACHE_TTL is not None else ttl
+
+
+def cache_key(url: str, params: dict | None = None) -> str:
+    """Clave estable para una URL y sus parámetros (sin importar su orden)."""
+    query = urlencode(sorted((params or {}).items()), doseq=True)
+    return hashlib.sha256(f"GET {url}?{query}".encode("utf-8")).hexdigest()
+
+
+def cache_paths(key: str) -> tuple[Path, Path]:
+    """Rutas (metadatos, cuerpo) de una entrada de la caché."""
+    folder = HTTP_CACHE_DIR / key[:2]
+    return folder / f"{key}.json", folder / f"{key}.body"
+
+
+def count(stat: str) -> None:
+    """Incrementa un contador de uso de la caché."""
+    with _STATS_LOCK:
+        _STATS[stat] += 1
+
+
+def cache_stats() -> dict[str, int]:
+    """Aciertos, fallos y respuestas guardadas desde que se importó el módulo."""
+    with _STATS_LOCK:
+        return dict(_STATS)
+
+
+def describe_cache() -> str:
+    """Resumen de una línea del uso de la caché, para el final de cada script."""
+    stats = cache_stats()
+    return (
+        f"Caché HTTP ({HTTP_CACHE_MODE}): {stats['hits']} aciertos, "
+        f"{stats['misses']} fallos, {stats['stored']} guardadas en {HTTP_CACHE_DIR}"
+    )
+
+
+def load_cached(key: str, ttl: float | None) -> requests.Response | None:
+    """
+    Reconstruye la respuesta guardada bajo `key`, o None si no existe o si es
+    más antigua que `ttl` segundos (ttl=None: sin límite de antigüedad).
+    """
+    meta_path, body_path = cache_paths(key)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if ttl is not None and time.time() - meta["stored_at"] > ttl:
+            return None
+        content = body_path.read_bytes()
+    except (OSError, ValueError, KeyError):
+        return None
+
+    response = requests.Response()
+    response.status_code = meta["status"]
+    response.url = meta["url"]
+    response.reason = "OK (caché)"
+    response.headers.update(meta["headers"])
+    response.encoding = meta.get("encoding")
+    response._content = content
+    response._content_consumed = True
+    return response
+
+
+def store(key: str, response: requests.Response) -> None:
+    """Guarda una respuesta 200 (cuerpo y metadatos) de forma atómica."""
+    meta_path, body_path = cache_paths(key)
+    meta_path.parent.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "url": response.url,
+        "status": response.status_code,
+        "headers": {h: response.headers[h] for h in STORED_HEADERS if h in response.headers},
+        "encoding": response.encoding,
+        "stored_at": time.time(),
+    }
+    suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+    for path, data in (
+        (body_path, response.content),
+        (meta_path, json.dumps(meta, indent=2).encode("utf-8")),
+    ):
+        tmp_path = path.with_name(path.name + suffix)
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+    count("stored")
+
+
+def cached_get(
+    session: requests.Session,
+    url: str,
+    params: dict | None = None,
+    headers: dict | None = None,
+    timeout: float = 60,
+    ttl: float = 0,
+    stream: bool = False,
+    throttle: Callable[[str], AbstractContextManager] | None = None,
+) -> requests.Response:
+    """
+    GET con la caché en disco según HTTP_CACHE_MODE.
+
+    - `ttl`: segundos que la respuesta se puede reutilizar en modo `cache`.
+    - `throttle`: función que recibe la URL y devuelve el context manager que
+      limita las peticiones a la red (cupos por host, cortesía...). Las
+      respuestas servidas desde la caché no lo consumen.
+
+    Con `stream=True` la respuesta de la red se devuelve sin leer (salvo que
+    haya que guardarla) y el cupo de `throttle` se mantiene hasta cerrarla.
+    """
+    key = cache_key(url, params)
+    ttl = effective_ttl(ttl)
+
+    if is_replay():
+        response = load_cached(key, ttl=None)
+        if response is None:
+            count("misses")
+            raise RuntimeError(f"HTTP_CACHE_MODE={HTTP_CACHE_MODE}: respuesta no grabada para {url} {params or ''}")
+        count("hits")
+        return response
+
+    if HTTP_CACHE_MODE == "cache" and ttl > 0:
+        response = load_cached(key, ttl=ttl)
+        if response is not None:
+            count("hits")
+            return response
+
+    if HTTP_CACHE_MODE != "off":
+        count("misses")
+
+    if HTTP_CACHE_MODE == "record" and headers:
+        headers = {h: v for h, v in headers.items() if h not in CONDITIONAL_HEADERS}
+
+    should_store = HTTP_CACHE_MODE == "record" or (HTTP_CACHE_MODE == "cache" and ttl > 0)
+    slot = ExitStack()
+    try:
+        if throttle is not None:
+            slot.enter_context(throttle(url))
+        response = session.get(url, params=params, headers=headers, timeout=timeout, stream=stream)
+        should_store = should_store and response.status_code == 200
+        if should_store:
+            response.content  # noqa: B018 - leer el cuerpo dentro del cupo
+    except BaseException:
+        slot.close()
+        raise
+
+    if should_store:
+        slot.close()
+        store(key, response)
+    elif stream:
+        # El cuerpo se lee después: el cupo se libera al cerrar la respuesta
+        close_response = response.close
+
+        def release() -> None:
+            try:
+                close_response()
+            finally:
+                slot.close()
+
+        response.close = release
+    else:
+        slot.close()
+    return response
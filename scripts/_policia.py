@@ -0,0 +1,326 @@
+"""
+_policia.py
+===========
+
+Lectura y unificación de los Excel de la Policía Nacional (Bronze) para
+02_process_policia.py.
+
+Cada archivo se lee y se lleva al esquema común (FINAL_COLUMNS) en un proceso
+del pool; los resultados se unen en el orden de los archivos, así que la salida
+no depende de cuál proceso termina primero. Con POLICIA_EXCEL_WORKERS=1 la
+lectura es secuencial, en el mismo proceso.
+"""
+
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+
+from _excel_cache import read_cached
+
+# Procesos para leer Excel (la lectura es CPU-bound); 1 = secuencial
+POLICE_WORKERS = int(os.environ.get("POLICIA_EXCEL_WORKERS", max(1, min(8, (os.cpu_count() or 2) // 2))))
+
+# Versión de la lectura de un Excel de la Policía (parse_police_file); cambiarla
+# invalida la caché de Excel ya leídos
+POLICE_PARSER_VERSION = "policia-2"
+
+# Filas (0-based) entre las que se busca el encabezado de cada Excel
+HEADER_MIN_ROW = 9
+HEADER_MAX_ROW = 12
+
+# Columnas del esquema común (en este orden)
+FINAL_COLUMNS = [
+    "departamento",
+    "municipio",
+    "codigo_dane",
+    "delito",
+    "edad_persona",
+    "armas_medios",
+    "cantidad",
+    "descripcion_conducta",
+    "fecha",
+    "genero",
+    "anio",
+    "delito_archivo",
+    "archivo_origen",
+]
+
+
+def detect_header_row(
+    df: pd.DataFrame,
+    min_idx: int = 9,
+    max_idx: int = 12,
+) -> int:
+    """
+    Detecta la fila de encabezado en un DataFrame,
+    asumiendo que los posibles encabezados están entre min_idx y max_idx (0-based),
+    escogiendo la fila con más valores no nulos.
+    """
+    max_idx = min(max_idx, len(df) - 1)
+    min_idx = max(min_idx, 0)
+
+    if min_idx > max_idx:
+        return 0
+
+    best_row = min_idx
+    best_count = -1
+
+    for i in range(min_idx, max_idx + 1):
+        count_not_null = df.iloc[i].notna().sum()
+        if count_not_null > best_count:
+            best_count = count_not_null
+            best_row = i
+
+    return best_row
+
+
+def load_police_file(path: Path) -> pd.DataFrame:
+    """
+    Lee un archivo Excel de la policía (ver parse_police_file), reutilizando la
+    versión ya leída de la caché si el archivo no cambió.
+    """
+    print(f"\n➤ Procesando archivo: {path.name}")
+    return read_cached(path, POLICE_PARSER_VERSION, parse_police_file)
+
+
+def parse_police_file(path: Path) -> pd.DataFrame:
+    """
+    Lee un archivo Excel de la policía (xls/xlsx), detectando la fila de encabezados
+    entre los índices 9 y 12, limpiando filas vacías y añadiendo metadatos:
+        - anio
+        - delito_archivo
+        - archivo_origen
+
+    La lectura es en dos fases sobre el mismo libro: primero solo las primeras
+    filas para ubicar el encabezado y después el cuerpo, ya sin las filas de
+    título ni las columnas sin encabezado.
+    """
+    with pd.ExcelFile(path) as excel:
+        # 1) Sondear solo las filas donde puede estar el encabezado
+        probe = excel.parse(header=None, nrows=HEADER_MAX_ROW + 1)
+        header_row = detect_header_row(probe, min_idx=HEADER_MIN_ROW, max_idx=HEADER_MAX_ROW)
+        print(f"   • Fila de encabezado detectada (index): {header_row}")
+
+        # 2) Columnas con encabezado (las de encabezado NaN no se leen)
+        header = probe.iloc[header_row]
+        positions = [i for i, name in enumerate(header) if pd.notna(name)]
+
+        # 3) Leer el cuerpo debajo del encabezado. dtype=object conserva los
+        #    valores tal como los entrega el Excel (igual que la lectura completa)
+        df_file = excel.parse(
+            header=None,
+            skiprows=header_row + 1,
+            usecols=positions,
+            dtype=object,
+        )
+    if df_file.columns.empty:
+        # Encabezado sin filas debajo
+        df_file = pd.DataFrame(columns=positions, dtype=object)
+
+    # 4) Asignar encabezados normalizados
+    df_file.columns = header.iloc[positions].astype(str).str.strip()
+
+    # 5) Eliminar filas completamente vacías
+    df_file = df_file.dropna(how="all")
+
+    # 6) Extraer metadatos desde el nombre de archivo
+    stem = path.stem  # nombre sin extensión
+    parts = stem.split("_")
+
+    # Año: primer token de 4 dígitos
+    year = None
+    for token in parts:
+        if token.isdigit() and len(token) == 4:
+            year = int(token)
+            break
+
+    # Delito (desde nombre del archivo): primer token no numérico
+    file_crime = None
+    for token in parts:
+        if not token.isdigit():
+            file_crime = token
+            break
+
+    df_file["anio"] = year
+    df_file["delito_archivo"] = file_crime
+    df_file["archivo_origen"] = path.name
+
+    return df_file
+
+
+def combine_columns(
+    df: pd.DataFrame,
+    source_columns: List[str],
+    target_name: str,
+) -> pd.DataFrame:
+    """
+    Combina varias columnas similares en una sola, tomando el primer valor no nulo.
+    Solo usa las columnas que existan en el DataFrame.
+    """
+    existing_cols = [col for col in source_columns if col in df.columns]
+    if not existing_cols:
+        return df
+
+    # Equivale a bfill(axis=1) pero sin que pandas convierta a float una
+    # columna de enteros (en un solo archivo suele ser toda numérica)
+    combined = df[existing_cols[0]]
+    for col in existing_cols[1:]:
+        combined = combined.where(combined.notna(), df[col])
+    df[target_name] = combined
+    return df
+
+
+def harmonize_police_columns(df_file: pd.DataFrame) -> pd.DataFrame:
+    """
+    Lleva el DataFrame de un archivo al esquema común: combina las columnas
+    equivalentes en columnas limpias con nombres estandarizados y conserva solo
+    esas. Se aplica a cada archivo antes de unificarlos.
+    """
+    df = df_file
+
+    # Definición de grupos de columnas equivalentes
+    age_cols = [
+        "*AGRUPA EDAD PERSONA",
+        "*AGRUPA EDAD PERSONA*",
+        "*AGRUPA_EDAD_PERSONA",
+        "AGRUPA EDAD PERSONA",
+        "AGRUPA_EDAD_PERSONA",
+        "GRUPO ETARIO",
+    ]
+
+    weapon_cols = [
+        "ARMA MEDIO",
+        "ARMAS MEDIO",
+        "ARMAS MEDIOS",
+        "ARMAS_MEDIOS",
+    ]
+
+    dane_code_cols = [
+        "CODIGO DANE",
+        "CODIGO_DANE",
+    ]
+
+    crime_cols = [
+        "DELITO",
+        "DELITOS",
+    ]
+
+    department_cols = [
+        "DEPARTAMENTO",
+        "Departamento",
+    ]
+
+    date_cols = [
+        "FECHA",
+        "FECHA  HECHO",
+        "FECHA HECHO",
+    ]
+
+    city_cols = [
+        "MUNICICPIO",
+        "MUNICIPIO",
+        "MUNICIPO",
+        "Municipio",
+    ]
+
+    description_col = "DESCRIPCION CONDUCTA"
+    gender_col = "GENERO"
+    quantity_col = "CANTIDAD"
+
+    # Combinar columnas en nuevas columnas limpias
+    df = combine_columns(df, age_cols, "edad_persona")
+    df = combine_columns(df, weapon_cols, "armas_medios")
+    df = combine_columns(df, dane_code_cols, "codigo_dane")
+    df = combine_columns(df, crime_cols, "delito")
+    df = combine_columns(df, department_cols, "departamento")
+    df = combine_columns(df, date_cols, "fecha")
+    df = combine_columns(df, city_cols, "municipio")
+
+    if description_col in df.columns:
+        df["descripcion_conducta"] = df[description_col]
+
+    if gender_col in df.columns:
+        df["genero"] = df[gender_col]
+
+    if quantity_col in df.columns:
+        df["cantidad"] = df[quantity_col]
+
+    existing_final_columns = [col for col in FINAL_COLUMNS if col in df.columns]
+    return df[existing_final_columns].copy()
+
+
+def load_police_worker(path: Path) -> tuple[pd.DataFrame | None, str, str | None]:
+    """
+    Lee y armoniza un archivo dentro de un proceso del pool. Retorna
+    (DataFrame o None, mensajes impresos, error) para que el proceso principal
+    muestre los mensajes en orden y reporte los errores por archivo.
+    """
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            df_file = harmonize_police_columns(load_police_file(path))
+    except Exception as exc:  # noqa: BLE001
+        return None, output.getvalue(), f"{type(exc).__name__}: {exc}"
+    return df_file, output.getvalue(), None
+
+
+def unify_police_files(bronze_dir: Path, workers: int = POLICE_WORKERS) -> pd.DataFrame:
+    """
+    Une todos los archivos .xls y .xlsx de la carpeta de policía scraping
+    en un único DataFrame limpio, con el esquema común.
+
+    Los archivos se leen en paralelo (`workers` procesos) y se unen en orden
+    alfabético. Como cada archivo ya llega con las columnas de FINAL_COLUMNS,
+    el concat no arrastra las decenas de variantes de encabezados.
+    """
+    files: List[Path] = sorted(
+        list(bronze_dir.glob("*.xlsx")) + list(bronze_dir.glob("*.xls")),
+    )
+
+    workers = max(1, min(workers, len(files)))
+    print(f"\nEncontrados {len(files)} archivos de policía (xls + xlsx). Procesos de lectura: {workers}")
+
+    if workers == 1:
+        results = map(load_police_worker, files)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(load_police_worker, files, chunksize=4)
+
+    dataframes: list[pd.DataFrame] = []
+    errors: list[str] = []
+    try:
+        for path, (df_file, messages, error) in zip(files, results):
+            print(messages, end="")
+            if error is not None:
+                print(f"⚠️ Error procesando {path.name}: {error}")
+                errors.append(path.name)
+            else:
+                dataframes.append(df_file)
+    finally:
+        if workers > 1:
+            pool.shutdown(cancel_futures=True)
+
+    if errors:
+        print(f"\n⚠️ {len(errors)} archivo(s) con error: {', '.join(errors)}")
+
+    if not dataframes:
+        print("❌ No se logró cargar ningún archivo de policía.")
+        return pd.DataFrame()
+
+    df_unified = pd.concat(dataframes, ignore_index=True, sort=False)
+    df_unified = df_unified[[col for col in FINAL_COLUMNS if col in df_unified.columns]]
+
+    # Normalizar departamento a mayúsculas
+    if "departamento" in df_unified.columns:
+        df_unified["departamento"] = (
+            df_unified["departamento"].astype(str).str.strip().str.upper()
+        )
+    print("\n✔ Unificación completa.")
+    print(f"   Filas totales unificadas: {len(df_unified):,}")
+
+    return df_unified
@@ -0,0 +1,242 @@
+"""
+bench_bucaramanga_transforms.py
+===============================
+
+Benchmark de las transformaciones de Bucaramanga
+(02_socrata_bucaramanga_to_parquet.py): compara las funciones vectorizadas
+con las versiones fila por fila a las que reemplazaron (`Series.apply`),
+sobre columnas sintéticas con los valores problemáticos de las fuentes (meses
+y días en varios formatos, coordenadas con coma decimal, descripciones con y
+sin 'ARTICULO', edades y horas inválidas, nulos).
+
+Además de los tiempos, verifica que ambas versiones den el mismo resultado.
+
+Uso:
+    python scripts/bench/bench_bucaramanga_transforms.py
+    python scripts/bench/bench_bucaramanga_transforms.py --rows 200000 --repeat 3
+
+No forma parte del pipeline (run_pipeline.py solo ejecuta scripts/*.py).
+"""
+
+import argparse
+import importlib.util
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+spec = importlib.util.spec_from_file_location(
+    "bucaramanga", SCRIPTS_DIR / "02_socrata_bucaramanga_to_parquet.py"
+)
+bucaramanga = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(bucaramanga)
+
+# Valores de muestra por columna (incluye formatos inválidos y nulos)
+MESES = ["01. ENERO", "02. FEBRERO", "ENERO", "marzo", "SETIEMBRE", " 12. DICIEMBRE ", "13", "xx", None, np.nan, "", 4, 7.0]
+DIAS = ["05. VIERNES", "01 - LUNES", "7.DOMINGO", "DOMINGO", "", None, np.nan, " 3 ", "x", 6, 2.0]
+COORDENADAS = ["7,1193", "7.1193", " 7.12 ", "", "nan", "95", None, np.nan, "-73,1", "abc", "0"]
+DESCRIPCIONES = [
+    "ARTICULO 239. HURTO PERSONAS",
+    "articulo 111. lesiones personales",
+    "ARTICULO 103.HOMICIDIO",
+    "  ARTICULO 229.  VIOLENCIA INTRAFAMILIAR  ",
+    "HURTO SIN ARTICULO",
+    "",
+    None,
+    np.nan,
+    5,
+]
+EDADES = ["25", "NO DISPONIBLE", "", "0", "6", "6.9", "7", "-1", "60", "100", None, np.nan, "abc", 18, 28.5]
+HORAS = ["10:15:00", "23:59:59", "1:05", "", "nan", None, np.nan, "25:00:00", "12:30"]
+
+MONTH_NUMBERS = {
+    "ENERO": 1,
+    "FEBRERO": 2,
+    "MARZO": 3,
+    "ABRIL": 4,
+    "MAYO": 5,
+    "JUNIO": 6,
+    "JULIO": 7,
+    "AGOSTO": 8,
+    "SEPTIEMBRE": 9,
+    "SETIEMBRE": 9,
+    "OCTUBRE": 10,
+    "NOVIEMBRE": 11,
+    "DICIEMBRE": 12,
+}
+
+
+# === Implementaciones fila por fila anteriores ===
+
+def parse_month_label_row(value) -> int | None:
+    if pd.isna(value):
+        return None
+    s = str(value).strip().upper()
+    match = re.match(r"(\d+)", s)
+    if match:
+        return int(match.group(1))
+    return MONTH_NUMBERS.get(s.split(".")[-1].strip())
+
+
+def parse_month_label_rows(values: pd.Series) -> pd.Series:
+    return values.apply(parse_month_label_row).astype("Int64")
+
+
+def split_day_of_week_row(value) -> tuple[int | None, str | None]:
+    if pd.isna(value):
+        return None, None
+    s = str(value).strip()
+    match = re.match(r"(\d+)\D+(.*)", s)
+    if not match:
+        return None, s.strip().upper() if s else None
+    name = match.group(2).strip().upper() if match.group(2) else None
+    return int(match.group(1)), name
+
+
+def split_day_of_week_rows(values: pd.Series) -> pd.DataFrame:
+    dias_orden, dias_nombre = [], []
+    for val in values:
+        orden, nombre = split_day_of_week_row(val)
+        dias_orden.append(orden)
+        dias_nombre.append(nombre)
+    return pd.DataFrame(
+        {"orden": pd.Series(dias_orden, index=values.index).astype("Int64"), "nombre": dias_nombre},
+        index=values.index,
+    )
+
+
+def split_day_of_week(values: pd.Series) -> pd.DataFrame:
+    orden, nombre = bucaramanga.split_day_of_week(values)
+    return pd.DataFrame({"orden": orden, "nombre": nombre}, index=values.index)
+
+
+def clean_latlon_rows(values: pd.Series) -> pd.Series:
+    s = values.astype(str).str.strip().replace({"": pd.NA, "nan": pd.NA, "NaN": pd.NA})
+    s = pd.to_numeric(s.str.replace(",", ".", regex=False), errors="coerce")
+    return s.where((s >= -90) & (s <= 90))
+
+
+def clean_latlon(values: pd.Series) -> pd.Series:
+    return bucaramanga.clean_latlon(values, is_lat=True)
+
+
+def extract_articulo_row(text) -> str | None:
+    if not isinstance(text, str):
+        return None
+    match = re.match(r"(ARTICULO\s+\d+)", text.strip().upper())
+    return match.group(1) if match else None
+
+
+def extract_articulo_rows(values: pd.Series) -> pd.Series:
+    return values.apply(extract_articulo_row)
+
+
+def extract_conducta_row(text) -> str | None:
+    if not isinstance(text, str):
+        return None
+    t = text.strip()
+    match = re.match(r"(?i)ARTICULO\s+\d+\.\s*(.*)", t)
+    if match:
+        return match.group(1).strip()
+    return t if t else None
+
+
+def extract_conducta_rows(values: pd.Series) -> pd.Series:
+    return values.apply(extract_conducta_row)
+
+
+def map_curso_vida_row(age) -> str:
+    if pd.isna(age):
+        return "NO REPORTA"
+    age_int = int(age)
+    if 0 <= age_int <= 6:
+        return "01. PRIMERA INFANCIA"
+    if 7 <= age_int <= 11:
+        return "02. INFANCIA"
+    if 12 <= age_int <= 18:
+        return "03. ADOLESCENCIA"
+    if 19 <= age_int <= 28:
+        return "04. JOVENES"
+    if 29 <= age_int <= 59:
+        return "05. ADULTEZ"
+    if age_int >= 60:
+        return "06. PERSONA MAYOR"
+    return "NO REPORTA"
+
+
+def map_curso_vida_rows(edad: pd.Series) -> pd.Series:
+    return edad.apply(map_curso_vida_row)
+
+
+def format_hora_rows(values: pd.Series) -> pd.Series:
+    hora_raw = values.astype(str).str.strip().replace({"": pd.NA, "NaT": pd.NA, "nan": pd.NA})
+    dt = pd.to_datetime("1970-01-01 " + hora_raw.astype(str), errors="coerce")
+    return dt.dt.strftime("%H:%M:%S").where(dt.notna(), pd.NA).astype("string")
+
+
+def synthetic_columns(n_rows: int, seed: int = 42) -> dict[str, pd.Series]:
+    """Columnas sintéticas (object) con los valores de muestra."""
+    rng = random.Random(seed)
+
+    def sample(values: list) -> pd.Series:
+        return pd.Series([rng.choice(values) for _ in range(n_rows)], dtype=object)
+
+    edad = sample(EDADES).replace("NO DISPONIBLE", pd.NA).replace("", pd.NA)
+    return {
+        "mes": sample(MESES),
+        "dia_semana": sample(DIAS),
+        "latitud": sample(COORDENADAS),
+        "descripcion_conducta": sample(DESCRIPCIONES),
+        "edad": pd.to_numeric(edad, errors="coerce"),
+        "hora": sample(HORAS),
+    }
+
+
+def best_time(func, values: pd.Series, repeat: int) -> tuple[float, pd.Series]:
+    """Mejor tiempo de `repeat` ejecuciones y el resultado de la última."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(values)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Filas de las columnas sintéticas")
+    parser.add_argument("--repeat", type=int, default=1, help="Repeticiones (se reporta la mejor)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    print(f"Generando {args.rows:,} filas sintéticas...")
+    columns = synthetic_columns(args.rows)
+
+    cases = [
+        ("parse_month_label", parse_month_label_rows, bucaramanga.parse_month_label, "mes"),
+        ("split_day_of_week", split_day_of_week_rows, split_day_of_week, "dia_semana"),
+        ("clean_latlon", clean_latlon_rows, clean_latlon, "latitud"),
+        ("extract_articulo", extract_articulo_rows, bucaramanga.extract_articulo, "descripcion_conducta"),
+        ("extract_conducta", extract_conducta_rows, bucaramanga.extract_conducta, "descripcion_conducta"),
+        ("map_curso_vida", map_curso_vida_rows, bucaramanga.map_curso_vida, "edad"),
+        ("format_hora", format_hora_rows, bucaramanga.format_hora, "hora"),
+    ]
+    print(f"\n{'función':<22}{'anterior':>10}{'actual':>10}{'speedup':>9}  resultado")
+    for name, old_func, new_func, column in cases:
+        t_old, expected = best_time(old_func, columns[column], args.repeat)
+        t_new, result = best_time(new_func, columns[column], args.repeat)
+        same = "idéntico" if result.equals(expected) else "DIFERENTE"
+        print(f"{name:<22}{t_old:>9.2f}s{t_new:>9.2f}s{t_old / t_new:>8.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
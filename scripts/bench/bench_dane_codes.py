@@ -0,0 +1,115 @@
+"""
+bench_dane_codes.py
+===================
+
+Micro-benchmark de scripts/_dane.py: compara las funciones vectorizadas con
+las versiones fila por fila a las que reemplazaron (`Series.apply`), sobre una
+columna sintética de códigos con ~1.100 municipios distintos en los formatos
+de las fuentes ("68001000", "68001.0", 68001, con espacios, nulos).
+
+Además de los tiempos, verifica que ambas versiones den el mismo resultado.
+
+Uso:
+    python scripts/bench/bench_dane_codes.py
+    python scripts/bench/bench_dane_codes.py --rows 200000 --repeat 5
+
+No forma parte del pipeline (run_pipeline.py solo ejecuta scripts/*.py).
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from _dane import department_code, municipality_code_from_dane, normalize_cod_muni  # noqa: E402
+
+N_MUNICIPALITIES = 1_100
+
+
+# === Implementaciones fila por fila anteriores ===
+
+def normalize_cod_muni_row(value) -> str:
+    if pd.isna(value):
+        return "00000"
+    code = str(value).strip()
+    if "." in code:
+        code = code.split(".")[0]
+    if len(code) > 5:
+        code = code[:5]
+    return code.zfill(5)
+
+
+def normalize_cod_muni_rows(values: pd.Series) -> pd.Series:
+    return values.apply(normalize_cod_muni_row)
+
+
+def department_code_rows(cod_muni: pd.Series) -> pd.Series:
+    return cod_muni.str[:2]
+
+
+def municipality_code_from_dane_rows(values: pd.Series) -> pd.Series:
+    codes = values.astype(str).str.strip()
+    codes = codes.apply(lambda x: x[:-3] if isinstance(x, str) and len(x) > 3 else x)
+    codes = codes.str.replace(r"\D+", "", regex=True)
+    return pd.to_numeric(codes, errors="coerce").astype("Int64")
+
+
+def synthetic_codes(n_rows: int, seed: int = 42) -> pd.Series:
+    """Columna object de códigos DANE de 8 dígitos en varios formatos."""
+    rng = np.random.default_rng(seed)
+    municipalities = rng.choice(np.arange(5001, 99774), N_MUNICIPALITIES, replace=False)
+    codes = pd.Series(rng.choice(municipalities, n_rows) * 1000).astype(str).astype(object)
+
+    formats = rng.integers(0, 10, n_rows)
+    codes[formats == 0] = codes[formats == 0] + ".0"
+    codes[formats == 1] = " " + codes[formats == 1] + " "
+    codes[formats == 2] = None
+    return codes
+
+
+def best_time(func, values: pd.Series, repeat: int) -> tuple[float, pd.Series]:
+    """Mejor tiempo de `repeat` ejecuciones y el resultado de la última."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(values)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Filas de la columna sintética")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones (se reporta la mejor)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    codes = synthetic_codes(args.rows)
+    cod_muni = normalize_cod_muni(codes)
+
+    cases = [
+        ("normalize_cod_muni", normalize_cod_muni_rows, normalize_cod_muni, codes),
+        ("department_code", department_code_rows, department_code, cod_muni),
+        ("municipality_code_from_dane", municipality_code_from_dane_rows, municipality_code_from_dane, codes),
+    ]
+    for label, dtype in (("object", object), ("string[pyarrow]", "string[pyarrow]")):
+        print(f"\n{args.rows:,} filas ({label}), {N_MUNICIPALITIES:,} municipios distintos")
+        print(f"{'función':<30}{'por fila':>10}{'vector.':>10}{'speedup':>9}  resultado")
+        for name, row_func, vector_func, values in cases:
+            values = values.astype(dtype)
+            t_row, expected = best_time(row_func, values, args.repeat)
+            t_vec, result = best_time(vector_func, values, args.repeat)
+            same = "idéntico" if result.astype(object).equals(expected.astype(object)) else "DIFERENTE"
+            print(f"{name:<30}{t_row:>9.2f}s{t_vec:>9.2f}s{t_row / t_vec:>8.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
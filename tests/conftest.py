@@ -0,0 +1,10 @@
+"""
+Configuración de pytest: los módulos compartidos de `scripts/` (`_dane.py`,
+`_http.py`, ...) se importan directamente, igual que lo hacen los scripts.
+"""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
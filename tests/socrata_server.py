@@ -0,0 +1,131 @@
+"""
+Servidor Socrata (SODA) local para las pruebas de 01_extract_bronze.py.
+
+Atiende, sobre `http.server` en un hilo aparte, lo que usa el extractor:
+
+    GET /resource/<id>.json   registros: `$limit`/`$offset` (orden de carga,
+                              que es el orden por `:id`) y `$select=count(*) AS n`
+    GET /api/views/<id>.json  metadatos con los nombres de columna
+
+El filtro `$where` no se evalúa (los datasets de prueba son todos de
+Santander), pero queda registrado en `requests` para las aserciones.
+
+Para probar reintentos y concurrencia:
+    - `fail_next(n, status, retry_after)` hace que las próximas `n` peticiones
+      respondan con `status` (y la cabecera `Retry-After` si se indica).
+    - `delay` demora cada respuesta; `max_in_flight` es el mayor número de
+      peticiones atendidas a la vez.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class FakeSocrata:
+    def __init__(self, datasets: dict[str, list[dict]], delay: float = 0.0):
+        self.datasets = datasets
+        self.delay = delay
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._failures: list[tuple[int, str | None]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeSocrata":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def fail_next(self, n: int, status: int, retry_after: str | None = None) -> None:
+        """Las próximas `n` peticiones responden `status`."""
+        with self._lock:
+            self._failures.extend([(status, retry_after)] * n)
+
+    def count(self, path_prefix: str) -> int:
+        """Peticiones recibidas cuya ruta empieza con `path_prefix`."""
+        with self._lock:
+            return sum(path.startswith(path_prefix) for path, _ in self.requests)
+
+    def respond(self, path: str, params: dict[str, str]) -> tuple[int, dict[str, str], object]:
+        """(status, cabeceras, cuerpo JSON) para una petición."""
+        with self._lock:
+            self.requests.append((path, params))
+            if self._failures:
+                status, retry_after = self._failures.pop(0)
+                headers = {"Retry-After": retry_after} if retry_after else {}
+                return status, headers, {"error": True, "message": f"HTTP {status}"}
+
+        kind, _, name = path.strip("/").rpartition("/")
+        dataset_id = name.removesuffix(".json")
+        if dataset_id not in self.datasets:
+            return 404, {}, {"error": True, "message": "dataset not found"}
+        rows = self.datasets[dataset_id]
+
+        if kind == "api/views":
+            fields = list(dict.fromkeys(key for row in rows for key in row if not key.startswith(":")))
+            return 200, {}, {"id": dataset_id, "columns": [{"fieldName": field} for field in fields]}
+
+        if params.get("$select", "").startswith("count(*)"):
+            return 200, {}, [{"n": str(len(rows))}]
+
+        offset = int(params.get("$offset", 0))
+        limit = int(params.get("$limit", 1000))
+        return 200, {}, rows[offset : offset + limit]
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - nombre de http.server
+                with fake._lock:
+                    fake._in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight, fake._in_flight)
+                try:
+                    time.sleep(fake.delay)
+                    parts = urlsplit(self.path)
+                    params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+                    status, headers, body = fake.respond(parts.path, params)
+                    payload = json.dumps(body).encode("utf-8")
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    for header, value in headers.items():
+                        self.send_header(header, value)
+                    self.end_headers()
+                    self.wfile.write(payload)
+                finally:
+                    with fake._lock:
+                        fake._in_flight -= 1
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+
+def make_rows(n: int, dataset: str = "ds") -> list[dict]:
+    """`n` registros de Santander con `:id` y `:updated_at` crecientes."""
+    return [
+        {
+            ":id": f"row-{dataset}-{i:06d}",
+            ":updated_at": f"2024-01-01T00:00:{i % 60:02d}.000Z",
+            "departamento": "SANTANDER",
+            "municipio": "BUCARAMANGA",
+            "cantidad": str(i),
+        }
+        for i in range(n)
+    ]
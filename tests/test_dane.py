@@ -0,0 +1,164 @@
+"""
+Pruebas de regresión de scripts/_dane.py.
+
+Las funciones vectorizadas deben dar exactamente lo mismo que las versiones
+fila por fila a las que reemplazaron (copiadas abajo como referencia).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from _dane import department_code, municipality_code_from_dane, normalize_cod_muni
+
+
+# === Implementaciones fila por fila anteriores (referencia) ===
+
+def normalize_cod_muni_row(value) -> str:
+    if pd.isna(value):
+        return "00000"
+    code = str(value).strip()
+    if "." in code:
+        code = code.split(".")[0]
+    if len(code) > 5:
+        code = code[:5]
+    return code.zfill(5)
+
+
+def municipality_code_from_dane_rows(values: pd.Series) -> pd.Series:
+    codes = values.astype(str).str.strip()
+    codes = codes.apply(lambda x: x[:-3] if isinstance(x, str) and len(x) > 3 else x)
+    codes = codes.str.replace(r"\D+", "", regex=True)
+    return pd.to_numeric(codes, errors="coerce").astype("Int64")
+
+
+# Mezcla de códigos como llegan en las fuentes
+RAW_CODES = [
+    "68001000",
+    "68755",
+    " 68081 ",
+    "68001.0",
+    68001.0,
+    68755,
+    "5001",
+    5001,
+    "5",
+    "",
+    "  ",
+    "nan",
+    None,
+    np.nan,
+    "68.755",
+    "6800100A",
+    "A6800",
+]
+
+
+# === normalize_cod_muni ===
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("68755000", "68755"),
+        ("68001", "68001"),
+        (68755, "68755"),
+        (68001.0, "68001"),
+        ("68001.0", "68001"),
+        (" 68081 ", "68081"),
+        ("5001", "05001"),
+        (5001, "05001"),
+        ("5", "00005"),
+        (None, "00000"),
+        (np.nan, "00000"),
+    ],
+)
+def test_normalize_cod_muni_examples(value, expected):
+    result = normalize_cod_muni(pd.Series([value], dtype=object))
+    assert result.tolist() == [expected]
+
+
+def test_normalize_cod_muni_matches_row_implementation():
+    values = pd.Series(RAW_CODES * 3, dtype=object)
+    expected = values.apply(normalize_cod_muni_row)
+    pd.testing.assert_series_equal(normalize_cod_muni(values), expected)
+
+
+def test_normalize_cod_muni_float_column():
+    values = pd.Series([68001.0, np.nan, 5001.0])
+    assert normalize_cod_muni(values).tolist() == ["68001", "00000", "05001"]
+
+
+@pytest.mark.parametrize("dtype", ["string", "string[pyarrow]"])
+def test_normalize_cod_muni_string_arrays(dtype):
+    values = pd.Series(["68001000", " 5001 ", "68755.0", None], dtype=dtype)
+    result = normalize_cod_muni(values)
+    assert result.dtype == values.dtype
+    assert result.tolist() == ["68001", "05001", "68755", "00000"]
+
+
+def test_normalize_cod_muni_keeps_index_and_name():
+    values = pd.Series(["68001", None], index=[10, 20], name="cod_muni")
+    result = normalize_cod_muni(values)
+    assert result.index.tolist() == [10, 20]
+    assert result.name == "cod_muni"
+
+
+def test_normalize_cod_muni_empty():
+    assert normalize_cod_muni(pd.Series([], dtype=object)).empty
+
+
+# === department_code ===
+
+def test_department_code():
+    cod_muni = normalize_cod_muni(pd.Series(RAW_CODES, dtype=object))
+    expected = cod_muni.str[:2]
+    pd.testing.assert_series_equal(department_code(cod_muni), expected)
+    assert department_code(pd.Series(["68001", "05001", "00000"])).tolist() == ["68", "05", "00"]
+
+
+def test_department_code_pyarrow():
+    cod_muni = pd.Series(["68001", None], dtype="string[pyarrow]")
+    result = department_code(cod_muni)
+    assert result.dtype == cod_muni.dtype
+    assert result[0] == "68"
+    assert pd.isna(result[1])
+
+
+# === municipality_code_from_dane ===
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("68001000", 68001),
+        ("68755000", 68755),
+        (" 68081000 ", 68081),
+        ("5001000", 5001),
+        ("123", 123),
+        ("", pd.NA),
+        (None, pd.NA),
+        ("ABC", pd.NA),
+    ],
+)
+def test_municipality_code_from_dane_examples(value, expected):
+    result = municipality_code_from_dane(pd.Series([value], dtype=object))
+    assert result.dtype == "Int64"
+    if expected is pd.NA:
+        assert pd.isna(result[0])
+    else:
+        assert result[0] == expected
+
+
+def test_municipality_code_from_dane_matches_row_implementation():
+    values = pd.Series(RAW_CODES * 3, dtype=object)
+    pd.testing.assert_series_equal(
+        municipality_code_from_dane(values),
+        municipality_code_from_dane_rows(values),
+    )
+
+
+def test_municipality_code_from_dane_pyarrow():
+    values = pd.Series(["68001000", " 68755000", None], dtype="string[pyarrow]")
+    result = municipality_code_from_dane(values)
+    assert result.dtype == "Int64"
+    assert result.tolist()[:2] == [68001, 68755]
+    assert pd.isna(result[2])
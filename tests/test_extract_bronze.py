@@ -0,0 +1,195 @@
+"""
+Pruebas del motor de descarga concurrente de 01_extract_bronze.py contra el
+servidor Socrata local de `socrata_server.py`: paginación, reintentos ante
+429/5xx (con `Retry-After`) y límite de conexiones por host.
+"""
+
+import gzip
+import importlib.util
+import json
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+import _http
+from conftest import SCRIPTS_DIR
+from socrata_server import FakeSocrata, make_rows
+
+spec = importlib.util.spec_from_file_location("extract_bronze", SCRIPTS_DIR / "01_extract_bronze.py")
+bronze = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(bronze)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Esperas de los reintentos (registradas en lugar de dormir)."""
+    recorded: list[float] = []
+    fake_time = types.SimpleNamespace(sleep=recorded.append, perf_counter=time.perf_counter)
+    monkeypatch.setattr(bronze, "time", fake_time)
+    return recorded
+
+
+@pytest.fixture
+def socrata(monkeypatch, tmp_path):
+    """Apunta el extractor a un servidor local vacío, sin caché HTTP y con Bronze en tmp_path."""
+    with FakeSocrata({}) as server:
+        monkeypatch.setattr(bronze, "SOCRATA_BASE_URL", server.url)
+        monkeypatch.setattr(bronze, "_HOST_LIMITS", {})
+        monkeypatch.setattr(bronze, "DATA_DIR", tmp_path)
+        monkeypatch.setattr(bronze, "WATERMARK_FILE", tmp_path / "_state" / "socrata_watermarks.json")
+        monkeypatch.setattr(bronze, "FULL_REFRESH", False)
+        monkeypatch.setattr(_http, "HTTP_CACHE_MODE", "off")
+        yield server
+
+
+def read_bronze(path) -> list[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+# === Paginación ===
+
+def test_iter_pages_returns_every_row_in_order(socrata, monkeypatch):
+    monkeypatch.setattr(bronze, "PAGE_SIZE", 10)
+    socrata.datasets["abcd-1234"] = rows = make_rows(35)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        pages = list(bronze.iter_pages("abcd-1234", "upper(departamento) = 'SANTANDER'", pool))
+
+    assert [len(page) for page in pages] == [10, 10, 10, 5]
+    assert [row for page in pages for row in page] == rows
+
+    page_requests = [params for path, params in socrata.requests if "$offset" in params]
+    assert sorted(int(params["$offset"]) for params in page_requests) == [0, 10, 20, 30]
+    assert all(params["$order"] == ":id" for params in page_requests)
+    assert all(params["$where"] == "upper(departamento) = 'SANTANDER'" for params in page_requests)
+
+
+def test_iter_pages_follows_rows_added_after_count(socrata, monkeypatch):
+    monkeypatch.setattr(bronze, "PAGE_SIZE", 10)
+    socrata.datasets["abcd-1234"] = make_rows(20)
+    monkeypatch.setattr(bronze, "count_rows", lambda dataset_id, where: 15)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        pages = list(bronze.iter_pages("abcd-1234", None, pool))
+
+    assert [len(page) for page in pages] == [10, 10, 0]
+
+
+def test_extract_socrata_writes_all_datasets(socrata, monkeypatch, sleeps):
+    monkeypatch.setattr(bronze, "PAGE_SIZE", 7)
+    socrata.datasets.update({"aaaa-0001": make_rows(30, "a"), "bbbb-0002": make_rows(3, "b")})
+    monkeypatch.setattr(bronze, "DATASETS", {"UNO": "aaaa-0001", "DOS": "bbbb-0002"})
+
+    bronze.extract_socrata()
+
+    output_dir = bronze.DATA_DIR / "socrata_api"
+    assert read_bronze(output_dir / "UNO.ndjson.gz") == socrata.datasets["aaaa-0001"]
+    assert read_bronze(output_dir / "DOS.ndjson.gz") == socrata.datasets["bbbb-0002"]
+    watermarks = json.loads(bronze.WATERMARK_FILE.read_text(encoding="utf-8"))
+    assert watermarks["UNO"]["rows"] == 30
+    assert watermarks["DOS"]["rows"] == 3
+    assert not sleeps
+
+
+def test_full_refresh_without_rows_removes_previous_file(socrata, tmp_path, sleeps):
+    output_path = tmp_path / "UNO.ndjson.gz"
+    socrata.datasets["aaaa-0001"] = make_rows(5)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        state = bronze.download_dataset("UNO", "aaaa-0001", output_path, pool, None, None, None)
+        assert state["rows"] == 5 and output_path.exists()
+
+        socrata.datasets["aaaa-0001"] = []
+        state = bronze.download_dataset("UNO", "aaaa-0001", output_path, pool, None, None, None)
+
+    assert state is None
+    assert not output_path.exists()
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_empty_dataset_removes_previous_file(socrata, monkeypatch, sleeps):
+    socrata.datasets["aaaa-0001"] = make_rows(5)
+    monkeypatch.setattr(bronze, "DATASETS", {"UNO": "aaaa-0001"})
+    bronze.extract_socrata()
+    output_path = bronze.DATA_DIR / "socrata_api" / "UNO.ndjson.gz"
+    assert output_path.exists()
+
+    socrata.datasets["aaaa-0001"] = []
+    bronze.extract_socrata()
+
+    assert not output_path.exists()
+    assert "UNO" not in json.loads(bronze.WATERMARK_FILE.read_text(encoding="utf-8"))
+
+
+# === Reintentos ===
+
+def test_retry_on_429_honors_retry_after(socrata, sleeps):
+    socrata.datasets["abcd-1234"] = make_rows(2)
+    socrata.fail_next(1, 429, retry_after="3")
+
+    assert bronze.socrata_get("abcd-1234", {"$limit": 5}) == socrata.datasets["abcd-1234"]
+    assert sleeps == [3.0]
+
+
+@pytest.mark.parametrize("status", [500, 502, 503, 504])
+def test_retry_on_5xx_with_exponential_backoff(socrata, sleeps, monkeypatch, status):
+    monkeypatch.setattr(bronze.random, "uniform", lambda a, b: 1.0)
+    socrata.datasets["abcd-1234"] = make_rows(1)
+    socrata.fail_next(2, status)
+
+    assert bronze.socrata_get("abcd-1234", {"$limit": 5}) == socrata.datasets["abcd-1234"]
+    assert sleeps == [bronze.BACKOFF_SECONDS, bronze.BACKOFF_SECONDS * 2]
+
+
+def test_retry_gives_up_after_max_retries(socrata, sleeps):
+    socrata.datasets["abcd-1234"] = make_rows(1)
+    socrata.fail_next(bronze.MAX_RETRIES, 503)
+
+    with pytest.raises(requests.HTTPError):
+        bronze.socrata_get("abcd-1234", {"$limit": 5})
+    assert len(sleeps) == bronze.MAX_RETRIES - 1
+    assert socrata.count("/resource/") == bronze.MAX_RETRIES
+
+
+def test_client_errors_are_not_retried(socrata, sleeps):
+    with pytest.raises(requests.HTTPError):
+        bronze.socrata_get("no-existe", {"$limit": 5})
+    assert not sleeps
+    assert socrata.count("/resource/") == 1
+
+
+def test_retry_after_is_capped():
+    assert bronze.retry_delay(1, "5") == 5.0
+    assert bronze.retry_delay(1, "86400") == bronze.MAX_RETRY_AFTER
+
+
+# === Concurrencia ===
+
+def test_per_host_concurrency_cap(socrata, monkeypatch):
+    monkeypatch.setattr(bronze, "MAX_CONNECTIONS_PER_HOST", 2)
+    socrata.delay = 0.05
+    socrata.datasets["abcd-1234"] = make_rows(1)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: bronze.socrata_get("abcd-1234", {"$limit": 1}), range(16)))
+
+    assert len(results) == 16
+    assert socrata.max_in_flight == 2
+
+
+def test_datasets_and_pages_download_in_parallel(socrata, monkeypatch, sleeps):
+    monkeypatch.setattr(bronze, "PAGE_SIZE", 5)
+    socrata.delay = 0.02
+    datasets = {f"DS{i}": f"ds{i:02d}-0000" for i in range(4)}
+    for name, dataset_id in datasets.items():
+        socrata.datasets[dataset_id] = make_rows(20, name)
+    monkeypatch.setattr(bronze, "DATASETS", datasets)
+
+    bronze.extract_socrata()
+
+    assert 1 < socrata.max_in_flight <= bronze.MAX_CONNECTIONS_PER_HOST
+    for name in datasets:
+        assert len(read_bronze(bronze.DATA_DIR / "socrata_api" / f"{name}.ndjson.gz")) == 20